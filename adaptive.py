@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# Número adaptativo de iterações: para um cenário quando o intervalo de
+# confiança da média já está estreito o suficiente
+import argparse
+import sys
+
+import numpy as np
+from scipy.stats import t
+
+from result_store import INDEX_KEYS, STORE_DIR, ResultStore, implementation_name
+
+DEFAULT_MIN_ITERATIONS = 2
+DEFAULT_MAX_ITERATIONS = 10
+# Meia largura do IC relativa à média (0.05 = ±5%)
+DEFAULT_PRECISION = 0.05
+DEFAULT_CONFIDENCE = 0.95
+
+EXIT_STOP = 0
+EXIT_CONTINUE = 1
+
+
+def iteration_means(records):
+    """
+    Tempo de resposta médio de cada iteração de um cenário (registros de
+    ResultStore.select). Cada iteração é uma replicação independente, então
+    o IC é calculado sobre essas médias e não sobre as sessões, que dentro
+    de uma iteração disputam os mesmos servidores.
+    """
+    iterations, codes = np.unique(records["iteration"], return_inverse=True)
+    sums = np.bincount(codes, weights=records["response_time"], minlength=len(iterations))
+    counts = np.bincount(codes, minlength=len(iterations))
+    return sums / counts
+
+
+def relative_halfwidth(means, confidence=DEFAULT_CONFIDENCE):
+    """Meia largura do IC t de Student da média das iterações, relativa à média"""
+    n = len(means)
+    if n < 2:
+        return np.inf
+    mean = np.mean(means)
+    if mean <= 0:
+        return np.inf
+    halfwidth = t.ppf((1 + confidence) / 2, n - 1) * np.std(means, ddof=1) / np.sqrt(n)
+    return halfwidth / mean
+
+
+def should_stop(
+    means,
+    min_iterations=DEFAULT_MIN_ITERATIONS,
+    max_iterations=DEFAULT_MAX_ITERATIONS,
+    precision=DEFAULT_PRECISION,
+    confidence=DEFAULT_CONFIDENCE,
+):
+    """
+    (parar?, meia largura relativa) após len(means) iterações: para ao
+    atingir max_iterations, ou a partir de min_iterations quando o IC da
+    média fica dentro de ±precision.
+    """
+    width = relative_halfwidth(means, confidence)
+    n = len(means)
+    if n >= max_iterations:
+        return True, width
+    return n >= max(min_iterations, 2) and width <= precision, width
+
+
+def _scenario_filters(args):
+    return {
+        "servers": args.servers,
+        "clients": args.clients,
+        "messages": args.messages,
+        "implementation": implementation_name(args.implementation),
+    }
+
+
+def cmd_check(args, store):
+    """Decide se o cenário já tem iterações suficientes (código de saída 0 = parar)"""
+    records = store.select(**_scenario_filters(args))
+    means = iteration_means(records) if len(records) else np.zeros(0)
+    stop, width = should_stop(means, args.min, args.max, args.precision, args.confidence)
+    status = "✅ parar" if stop else "🔁 continuar"
+    print(
+        f"{status}: {len(means)} iteração(ões), IC {args.confidence:.0%} da média "
+        f"±{width:.1%} (alvo ±{args.precision:.1%})"
+    )
+    return EXIT_STOP if stop else EXIT_CONTINUE
+
+
+def cmd_report(args, store):
+    """Iterações usadas e precisão atingida por cenário do armazenamento"""
+    index = store.scenarios()
+    if index.empty:
+        print(f"📭 Nenhum resultado em {args.store}")
+        return 0
+    rows = []
+    for keys, _ in index.groupby(INDEX_KEYS[:-1]):
+        records = store.select(**dict(zip(INDEX_KEYS[:-1], keys)))
+        means = iteration_means(records)
+        width = relative_halfwidth(means, args.confidence)
+        rows.append((*keys, len(means), np.mean(means), width))
+
+    converged = sum(width <= args.precision for *_, width in rows)
+    print(
+        f"{'servers':>7} {'clients':>7} {'messages':>8} {'impl':>6} "
+        f"{'iter':>4} {'média (s)':>10} {'IC ±':>7}"
+    )
+    for servers, clients, messages, implementation, n, mean, width in rows:
+        print(
+            f"{servers:>7} {clients:>7} {messages:>8} {implementation:>6} "
+            f"{n:>4} {mean:>10.4f} {width:>7.1%}"
+        )
+    print(
+        f"\n📊 {converged}/{len(rows)} cenários com IC {args.confidence:.0%} "
+        f"dentro de ±{args.precision:.1%}"
+    )
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Regra de parada por intervalo de confiança para as iterações do deploy.sh"
+    )
+    parser.add_argument("--store", default=STORE_DIR, help="Diretório do armazenamento")
+    parser.add_argument(
+        "--precision",
+        type=float,
+        default=DEFAULT_PRECISION,
+        help="Meia largura máxima do IC, relativa à média (padrão: 0.05)",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=DEFAULT_CONFIDENCE,
+        help="Nível de confiança (padrão: 0.95)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    check = subparsers.add_parser(
+        "check", help="Sai com 0 se o cenário pode parar, 1 se precisa de mais iterações"
+    )
+    check.add_argument("--servers", type=int, required=True)
+    check.add_argument("--clients", type=int, required=True)
+    check.add_argument("--messages", type=int, required=True)
+    check.add_argument("--implementation", required=True, help="python ou go")
+    check.add_argument(
+        "--min",
+        type=int,
+        default=DEFAULT_MIN_ITERATIONS,
+        help="Iterações mínimas (padrão: 2)",
+    )
+    check.add_argument(
+        "--max",
+        type=int,
+        default=DEFAULT_MAX_ITERATIONS,
+        help="Iterações máximas (padrão: 10)",
+    )
+    subparsers.add_parser("report", help="Precisão atingida por cenário")
+    args = parser.parse_args()
+
+    store = ResultStore(args.store)
+    if args.command == "check":
+        return cmd_check(args, store)
+    return cmd_report(args, store)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,478 @@
+# Ingestão compartilhada dos resultados - Cliente-Servidor Python vs Go
+import hashlib
+import io
+import json
+import os
+import pickle
+
+import pandas as pd
+
+from bootstrap import CI_STATISTICS, bootstrap_ci, percentile_table
+from outliers import METHOD_ZSCORE, filter_outliers
+from result_store import STORE_DIR, ResultStore
+from results_csv import read_results_csv, standardize
+from streaming_stats import DEFAULT_CHUNKSIZE, rollup, stream_results
+from timeline import RUN_KEYS, drop_unsteady_runs, run_phases, with_iterations
+
+SCENARIO_KEYS = ["servers", "clients", "messages", "implementation"]
+CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR", ".analysis_cache")
+# Armazenamentos binários gravados pelo deploy.sh, um por implementação
+STORE_DIRS = [os.path.join(STORE_DIR, "python"), os.path.join(STORE_DIR, "go")]
+# Incrementar sempre que a limpeza ou os agregados mudarem de formato
+CACHE_VERSION = 9
+# Agrupamentos com IC por bootstrap nas tabelas do relatório (rollup com
+# ci=True), calculados junto com as estatísticas e guardados no cache
+ROLLUP_CI_GROUPS = [("implementation",), ("messages", "implementation")]
+
+
+class ResultsData:
+    """Dados limpos e agregados por cenário, compartilhados pelas análises"""
+
+    def __init__(
+        self,
+        raw_counts,
+        combined_count,
+        cleaned,
+        stats,
+        sketch=None,
+        runs=None,
+        exclude_unsteady=False,
+        rollup_ci=None,
+    ):
+        # Linhas lidas de cada CSV, antes de qualquer limpeza
+        self.raw_counts = raw_counts
+        # Linhas com response_time válido (antes da remoção de outliers)
+        self.combined_count = combined_count
+        # Requisições após remoção de outliers (z-score <= 3 por padrão);
+        # None no modo streaming, em que as linhas não ficam em memória
+        self.cleaned = cleaned
+        # Estatísticas por cenário (servers, clients, messages, implementation),
+        # com percentis de cauda e intervalos de confiança por bootstrap
+        self.stats = stats
+        # Sketch de quantis por cenário (apenas no modo streaming)
+        self.sketch = sketch
+        # Fases de cada execução (ver timeline.run_phases); None no modo
+        # streaming, que não lê os horários das sessões
+        self.runs = runs
+        # Execuções sem regime estacionário foram descartadas antes da limpeza
+        self.exclude_unsteady = exclude_unsteady
+        # ICs por bootstrap já calculados para rollup, por agrupamento
+        # (ROLLUP_CI_GROUPS); os demais são calculados na hora
+        self.rollup_ci = rollup_ci or {}
+
+    @property
+    def cleaned_counts(self):
+        """Requisições após a limpeza, por implementação"""
+        return self.stats.groupby("implementation")["count"].sum()
+
+    @property
+    def unsteady_runs(self):
+        """Execuções que não atingiram regime estacionário"""
+        if self.runs is None:
+            return None
+        return self.runs[~self.runs["reached_steady"]]
+
+    @property
+    def excluded_rows(self):
+        """Linhas descartadas por pertencerem a execuções sem regime estacionário"""
+        if not self.exclude_unsteady or self.runs is None:
+            return 0
+        return int(self.unsteady_runs["sessions"].sum())
+
+    @property
+    def outliers_removed(self):
+        return self.combined_count - self.excluded_rows - int(self.stats["count"].sum())
+
+    def rollup(self, by, ci=False):
+        """
+        count, mean, median, std, min, max e percentis (p90, p95, p99, p99_9)
+        de response_time agrupados por `by` (subconjunto de SCENARIO_KEYS).
+        Exato a partir das linhas limpas; no modo streaming combina os
+        agregados por cenário e mediana/percentis vêm do sketch (erro
+        relativo de até 1%).
+        ci: acrescenta os intervalos de confiança por bootstrap de
+        CI_STATISTICS (NaN no modo streaming, sem as linhas em memória).
+        """
+        if self.cleaned is None:
+            table = rollup(self.stats, self.sketch, SCENARIO_KEYS, by)
+            return _with_ci_columns(table) if ci else table
+
+        table = self.cleaned.groupby(by)["response_time"].agg(
+            ["count", "mean", "median", "std", "min", "max"]
+        )
+        table = table.join(percentile_table(self.cleaned, by))
+        if ci:
+            intervals = self.rollup_ci.get(tuple(by))
+            if intervals is None:
+                intervals = bootstrap_ci(self.cleaned, by)
+            table = table.join(intervals)
+        return table
+
+
+def _rollup_intervals(cleaned):
+    """ICs por bootstrap dos agrupamentos de ROLLUP_CI_GROUPS"""
+    return {by: bootstrap_ci(cleaned, list(by)) for by in ROLLUP_CI_GROUPS}
+
+
+def _with_ci_columns(table):
+    """Colunas de intervalo de confiança vazias (modo streaming)"""
+    for name in CI_STATISTICS:
+        table[f"{name}_ci_low"] = float("nan")
+        table[f"{name}_ci_high"] = float("nan")
+    return table
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint(paths, cache_dir):
+    """Chave de cache a partir de tamanho, mtime e hash do conteúdo dos arquivos.
+
+    O hash só é recalculado quando tamanho ou mtime mudam; um arquivo apenas
+    "tocado" com o mesmo conteúdo continua acertando o cache.
+    """
+    manifest_path = os.path.join(cache_dir, "fingerprints.json")
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    hashes = []
+    for path in paths:
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        entry = manifest.get(key)
+        if not entry or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+            entry = manifest[key] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "sha256": _file_sha256(path),
+            }
+        hashes.append(entry["sha256"])
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for file_hash in hashes:
+        digest.update(file_hash.encode())
+    return digest.hexdigest()
+
+
+def _concat_results(frames):
+    """Concatena DataFrames padronizados mantendo os IDs como category"""
+    df = pd.concat(frames, ignore_index=True)
+    # Categorias diferentes em cada parte viram object no concat
+    for column in ("client_id", "server_id"):
+        df[column] = df[column].astype("category")
+    return df
+
+
+def _build_results(file_py, file_go, outlier_method, exclude_unsteady=False):
+    df_py = read_results_csv(file_py)
+    df_go = read_results_csv(file_go)
+    raw_counts = {"Python": len(df_py), "Go": len(df_go)}
+
+    # Padronizar colunas e descartar linhas sem response_time/chaves válidos
+    df_combined = _concat_results([standardize(df_py, "Python"), standardize(df_go, "Go")])
+
+    return _results_from_frame(raw_counts, df_combined, outlier_method, exclude_unsteady)
+
+
+def _results_from_frame(raw_counts, df_combined, outlier_method, exclude_unsteady=False):
+    # Iteração de cada linha antes de qualquer filtro, que mudaria as posições
+    # usadas para deduzi-la
+    df_combined = with_iterations(df_combined)
+    # Fases de cada execução a partir dos horários das sessões
+    runs = run_phases(df_combined)
+    df_steady = drop_unsteady_runs(df_combined, runs) if exclude_unsteady else df_combined
+
+    # Remover outliers por cenário (Z-score > 3, ou MAD/IQR)
+    df_cleaned = filter_outliers(df_steady, SCENARIO_KEYS, method=outlier_method)
+
+    # Calcular estatísticas agregadas por cenário, percentis e ICs (bootstrap)
+    stats = (
+        df_cleaned.groupby(SCENARIO_KEYS)["response_time"]
+        .agg(["mean", "std", "count", "median", "min", "max"])
+        .join(percentile_table(df_cleaned, SCENARIO_KEYS))
+        .join(bootstrap_ci(df_cleaned, SCENARIO_KEYS))
+        .reset_index()
+    )
+
+    return ResultsData(
+        raw_counts,
+        len(df_combined),
+        df_cleaned,
+        stats,
+        runs=runs,
+        exclude_unsteady=exclude_unsteady,
+    )
+
+
+def _read_appended(path, offset, prefix_sha256):
+    """
+    Confere pelo hash que os primeiros `offset` bytes do arquivo não mudaram
+    e lê as linhas completas acrescentadas depois deles (uma última linha
+    ainda sem "\\n" fica para a próxima leitura).
+    Retorna (bytes novos, hash do novo prefixo), ou None se o arquivo
+    diminuiu ou teve o trecho já processado reescrito.
+    """
+    if os.path.getsize(path) < offset:
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        remaining = offset
+        while remaining:
+            block = f.read(min(1 << 20, remaining))
+            digest.update(block)
+            remaining -= len(block)
+        if digest.hexdigest() != prefix_sha256:
+            return None
+        data = f.read()
+    data = data[: data.rfind(b"\n") + 1]
+    digest.update(data)
+    return data, digest.hexdigest()
+
+
+def _read_watermarked(paths, watermarks):
+    """
+    Linhas novas de cada arquivo desde a sua marca d'água (bytes já
+    processados, hash desse prefixo, tamanho e mtime da última leitura).
+    Retorna ({implementação: DataFrame ou None}, novas marcas), ou None se
+    algum arquivo precisar ser reprocessado do início.
+    """
+    frames = {}
+    marks = {}
+    for implementation, path in paths.items():
+        stat = os.stat(path)
+        mark = watermarks.get(implementation)
+        if mark and (mark["size"], mark["mtime"]) == (stat.st_size, stat.st_mtime):
+            # Arquivo intocado desde a última leitura: nada a reler nem hashear
+            frames[implementation] = None
+            marks[implementation] = mark
+            continue
+
+        offset = mark["offset"] if mark else 0
+        prefix = mark["sha256"] if mark else hashlib.sha256().hexdigest()
+        appended = _read_appended(path, offset, prefix)
+        if appended is None:
+            return None
+        data, digest = appended
+        frames[implementation] = (
+            read_results_csv(io.BytesIO(data), header=offset == 0) if data else None
+        )
+        marks[implementation] = {
+            "offset": offset + len(data),
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+        }
+    return frames, marks
+
+
+def _in_scenarios(df, scenarios):
+    """Máscara das linhas de df cujo cenário está em `scenarios` (MultiIndex)"""
+    return pd.MultiIndex.from_frame(df[SCENARIO_KEYS]).isin(scenarios)
+
+
+def _update_results(previous, combined, appended, raw_counts, outlier_method):
+    """
+    Incorpora linhas novas recalculando só os cenários que as receberam:
+    limpeza de outliers, estatísticas, percentis e ICs desses cenários são
+    refeitos com todas as suas linhas; os demais são reaproveitados.
+    """
+    combined = _concat_results([combined, appended])
+    affected = pd.MultiIndex.from_frame(appended[SCENARIO_KEYS]).unique()
+    partial = _results_from_frame(
+        raw_counts,
+        combined[_in_scenarios(combined, affected)],
+        outlier_method,
+        previous.exclude_unsteady,
+    )
+
+    cleaned = _concat_results(
+        [previous.cleaned[~_in_scenarios(previous.cleaned, affected)], partial.cleaned]
+    )
+    stats = (
+        pd.concat([previous.stats[~_in_scenarios(previous.stats, affected)], partial.stats])
+        .sort_values(SCENARIO_KEYS)
+        .reset_index(drop=True)
+    )
+    runs = (
+        pd.concat([previous.runs[~_in_scenarios(previous.runs, affected)], partial.runs])
+        .sort_values(RUN_KEYS)
+        .reset_index(drop=True)
+    )
+    results = ResultsData(
+        raw_counts,
+        len(combined),
+        cleaned,
+        stats,
+        runs=runs,
+        exclude_unsteady=previous.exclude_unsteady,
+    )
+    return combined, results
+
+
+def _incremental_results(file_py, file_go, cache_dir, outlier_method, exclude_unsteady):
+    """
+    load_results com estado persistente: agregados por cenário, as linhas
+    padronizadas e a marca d'água de cada CSV. Numa nova execução só as
+    linhas acrescentadas desde a marca são lidas, e só os cenários que as
+    receberam são recalculados. Se um arquivo diminuir ou o trecho já
+    processado mudar (hash do prefixo), tudo é refeito do zero.
+    """
+    paths = {"Python": file_py, "Go": file_go}
+    key = hashlib.sha256(
+        "\0".join(os.path.abspath(path) for path in paths.values()).encode()
+    ).hexdigest()[:16]
+    mode = "_steady" if exclude_unsteady else ""
+    state_file = os.path.join(cache_dir, f"incremental_{key}_{outlier_method}{mode}.pkl")
+
+    state = None
+    if os.path.exists(state_file):
+        try:
+            with open(state_file, "rb") as f:
+                state = pickle.load(f)
+        except Exception:
+            pass  # Estado corrompido: reprocessar
+    if not isinstance(state, dict) or state.get("version") != CACHE_VERSION:
+        state = None
+    state_results = state["results"] if state else None
+
+    read = _read_watermarked(paths, state["watermarks"]) if state else None
+    if read is None:
+        state = None
+        read = _read_watermarked(paths, {})
+    frames, watermarks = read
+
+    new_rows = {impl: 0 if df is None else len(df) for impl, df in frames.items()}
+    appended = [standardize(df, impl) for impl, df in frames.items() if df is not None]
+
+    if state is None:
+        combined = _concat_results(appended)
+        results = _results_from_frame(new_rows, combined, outlier_method, exclude_unsteady)
+    elif any(new_rows.values()):
+        previous_counts = state["results"].raw_counts
+        raw_counts = {impl: previous_counts[impl] + rows for impl, rows in new_rows.items()}
+        combined, results = _update_results(
+            state["results"],
+            state["combined"],
+            _concat_results(appended),
+            raw_counts,
+            outlier_method,
+        )
+    else:
+        combined, results = state["combined"], state["results"]
+        if watermarks == state["watermarks"]:
+            return results
+
+    if results is not state_results:
+        # Os ICs do rollup misturam todos os cenários: refeitos a cada mudança
+        results.rollup_ci = _rollup_intervals(results.cleaned)
+
+    state = {
+        "version": CACHE_VERSION,
+        "watermarks": watermarks,
+        "combined": combined,
+        "results": results,
+    }
+    tmp = f"{state_file}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, state_file)
+    return results
+
+
+def load_store_results(
+    store_dirs=STORE_DIRS, outlier_method=METHOD_ZSCORE, exclude_unsteady=False, **filters
+):
+    """
+    Como load_results, mas lendo dos armazenamentos binários (result_store.py,
+    um por implementação) apenas os cenários pedidos, ex.:
+    load_store_results(messages=[100, 1000]).
+    Linhas inválidas já foram descartadas na importação, então raw_counts
+    conta só as linhas armazenadas.
+    """
+    for path in store_dirs:
+        if not os.path.exists(path):
+            raise FileNotFoundError(2, "No such file or directory", path)
+    df = pd.concat(
+        [ResultStore(path).load(**filters) for path in store_dirs], ignore_index=True
+    )
+    for column in ("client_id", "server_id"):
+        df[column] = df[column].astype("category")
+    raw_counts = df["implementation"].value_counts().reindex(["Python", "Go"], fill_value=0)
+    return _results_from_frame(raw_counts.to_dict(), df, outlier_method, exclude_unsteady)
+
+
+def _stream_results(file_py, file_go, outlier_method, chunksize):
+    raw_counts, combined_count, stats, sketch = stream_results(
+        file_py, file_go, SCENARIO_KEYS, outlier_method, chunksize
+    )
+    return ResultsData(raw_counts, combined_count, None, _with_ci_columns(stats), sketch)
+
+
+def load_results(
+    file_py,
+    file_go,
+    use_cache=True,
+    cache_dir=CACHE_DIR,
+    outlier_method=METHOD_ZSCORE,
+    streaming=False,
+    chunksize=DEFAULT_CHUNKSIZE,
+    exclude_unsteady=False,
+):
+    """
+    Lê, limpa e agrega os CSVs de Python e Go uma única vez.
+    O resultado fica em cache no disco, então uma nova execução sobre os
+    mesmos dados não relê nem reprocessa os CSVs; se o deploy.sh acrescentou
+    linhas, só elas são lidas e só os cenários afetados são recalculados.
+    outlier_method: "zscore" (padrão), "mad" ou "iqr" (ver outliers.py).
+    streaming: lê os CSVs em blocos de `chunksize` linhas e mantém só os
+    agregados por cenário (ver streaming_stats.py); `cleaned` fica None.
+    exclude_unsteady: descarta as execuções que não atingiram regime
+    estacionário (ver timeline.py) antes da limpeza e das estatísticas;
+    não disponível no modo streaming.
+    Lança FileNotFoundError se algum arquivo não existir.
+    """
+    if streaming and exclude_unsteady:
+        raise ValueError("exclude_unsteady não é suportado no modo streaming")
+    for path in (file_py, file_go):
+        if not os.path.exists(path):
+            raise FileNotFoundError(2, "No such file or directory", path)
+
+    def build():
+        if streaming:
+            return _stream_results(file_py, file_go, outlier_method, chunksize)
+        return _build_results(file_py, file_go, outlier_method, exclude_unsteady)
+
+    if not use_cache:
+        return build()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    if not streaming:
+        return _incremental_results(
+            file_py, file_go, cache_dir, outlier_method, exclude_unsteady
+        )
+
+    fingerprint = _fingerprint([file_py, file_go], cache_dir)
+    cache_file = os.path.join(cache_dir, f"{fingerprint}_{outlier_method}_streaming.pkl")
+
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            pass  # Cache corrompido ou de outra versão: reprocessar
+
+    results = build()
+    with open(cache_file, "wb") as f:
+        pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return results
@@ -0,0 +1,1059 @@
+# Gráficos 3D interativos de performance - Cliente-Servidor (usados pelo analyze.py)
+import pandas as pd
+import numpy as np
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import plotly.graph_objects as go
+import plotly.subplots as sp
+from plotly.offline import get_plotlyjs, plot
+from scipy.interpolate import griddata
+
+from analysis_data import load_results
+from results_csv import read_results_csv, standardize
+from bootstrap import PERCENTILE_LABELS
+from scalability import amdahl, fit_scalability, peak_throughput, usl
+from timeline import DEFAULT_BIN_SECONDS, run_phases, run_timeline
+
+RESULTS_DIR = "analysis_results_interactive"
+# Biblioteca Plotly compartilhada por todos os HTMLs do diretório
+PLOTLY_JS = "plotly.min.js"
+# Processos para renderizar os gráficos (padrão: um por CPU; 1 = sequencial)
+DEFAULT_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "0")) or os.cpu_count() or 1
+# Hash dos dados de cada gráfico já gravado, para só refazer os que mudaram
+FIGURE_MANIFEST = ".figures.json"
+# Incrementar quando o conteúdo dos gráficos mudar sem que os dados mudem
+FIGURES_VERSION = 1
+# Percentis de response_time (por cliente) exibidos no hover dos pontos
+HOVER_PERCENTILES = ["p95", "p99", "p99_9"]
+
+
+def _render_figure(task):
+    """Constrói e grava um gráfico; executa dentro dos processos do pool"""
+    builder, args, filename = task
+    fig = builder(*args)
+    plot(fig, filename=filename, auto_open=False, include_plotlyjs=PLOTLY_JS)
+    return filename
+
+
+def _figure_digest(builder, args):
+    """Hash do builder e dos dados de um gráfico (DataFrames por conteúdo)"""
+    digest = hashlib.sha256(f"{FIGURES_VERSION}:{builder.__name__}".encode())
+    for arg in args:
+        if isinstance(arg, pd.DataFrame):
+            digest.update(repr(list(arg.columns)).encode())
+            hashes = pd.util.hash_pandas_object(arg, index=False)
+            digest.update(hashes.to_numpy().tobytes())
+        else:
+            digest.update(repr(arg).encode())
+    return digest.hexdigest()
+
+
+def render_figures(tasks, results_dir, workers=None, force=False):
+    """
+    Renderiza gráficos independentes em paralelo.
+    tasks: lista de (builder, args, filename, mensagem); builder(*args) deve
+    retornar um go.Figure e ser uma função de módulo (para ir ao pool).
+    O plotly.js é gravado uma única vez em results_dir e referenciado
+    pelos HTMLs, em vez de embutido (~3,5MB) em cada arquivo.
+    Gráficos cujo arquivo existe e cujos dados não mudaram desde a última
+    renderização (hash em FIGURE_MANIFEST) são mantidos; force=True refaz todos.
+    """
+    plotly_js = os.path.join(results_dir, PLOTLY_JS)
+    if force or not os.path.exists(plotly_js):
+        with open(plotly_js, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+
+    manifest_path = os.path.join(results_dir, FIGURE_MANIFEST)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    digests = {}
+    pending = []
+    for builder, args, filename, message in tasks:
+        digests[filename] = _figure_digest(builder, args)
+        changed = manifest.get(filename) != digests[filename]
+        if force or changed or not os.path.exists(filename):
+            pending.append((builder, args, filename, message))
+    if len(pending) < len(tasks):
+        print(f"⏭️  {len(tasks) - len(pending)} gráfico(s) sem alterações nos dados, mantidos")
+
+    jobs = [(builder, args, filename) for builder, args, filename, _ in pending]
+    messages = [message for _, _, _, message in pending]
+    workers = min(workers or DEFAULT_WORKERS, len(jobs))
+    try:
+        if workers <= 1:
+            for job, message in zip(jobs, messages):
+                manifest[_render_figure(job)] = digests[job[2]]
+                print(message)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for message, filename in zip(messages, executor.map(_render_figure, jobs)):
+                manifest[filename] = digests[filename]
+                print(message)
+    finally:
+        # Grava o que já foi renderizado, mesmo se um gráfico falhar
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+
+def _remove_stale(pattern, tasks):
+    """Apaga gráficos de um padrão que não fazem mais parte de `tasks`"""
+    current = {filename for _, _, filename, _ in tasks}
+    for filename in glob.glob(pattern):
+        if filename not in current:
+            os.remove(filename)
+
+
+def generate_performance_analysis_3d(
+    file_py, file_go, workers=None, force=False, exclude_unsteady=False
+):
+    """
+    Gera análise 3D de performance com gráficos focados nos tipos de dados.
+    Elimina duplicações e usa nomes descritivos baseados no conteúdo.
+    Os gráficos são independentes e renderizados em paralelo (workers);
+    só são refeitos os que tiveram dados alterados (force=True refaz todos).
+    """
+    print("--- Gerando Análise 3D de Performance ---")
+
+    # Carregar dados (lidos, limpos e agregados uma única vez, com cache em disco)
+    try:
+        stats = load_results(file_py, file_go, exclude_unsteady=exclude_unsteady).stats
+    except FileNotFoundError as e:
+        print(f"Erro: Arquivo não encontrado: {e.filename}")
+        return
+
+    # Criar diretório de resultados (gráficos existentes são reaproveitados)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    # 1. Gráficos por número de mensagens (clientes vs servidores)
+    unique_messages = sorted(stats["messages"].unique())
+    tasks = []
+    for msg_count in unique_messages:
+        filename = f"{RESULTS_DIR}/clientes_vs_servidores_{msg_count}msgs.html"
+        tasks.append(
+            (
+                _figure_clients_vs_servers,
+                (stats[stats["messages"] == msg_count], msg_count),
+                filename,
+                f"✓ Gráfico clientes vs servidores ({msg_count} msgs): {filename}",
+            )
+        )
+
+    # 2. Gráfico de escalabilidade: clientes vs mensagens
+    scalability_stats = (
+        stats.groupby(["clients", "messages", "implementation"])[
+            ["mean", *HOVER_PERCENTILES]
+        ]
+        .mean()
+        .reset_index()
+    )
+    filename = f"{RESULTS_DIR}/escalabilidade_clientes_vs_mensagens.html"
+    tasks.append(
+        (
+            _figure_scalability,
+            (scalability_stats,),
+            filename,
+            f"✓ Análise de escalabilidade: {filename}",
+        )
+    )
+
+    # 3. Gráfico de diferença de performance (apenas este)
+    filename = f"{RESULTS_DIR}/diferenca_performance_go_vs_python.html"
+    tasks.append(
+        (
+            _figure_performance_difference,
+            (stats,),
+            filename,
+            f"✓ Gráfico de diferença de performance: {filename}",
+        )
+    )
+
+    # 4. Vazão de pico vs réplicas com os ajustes de USL e Amdahl
+    filename = f"{RESULTS_DIR}/escalabilidade_usl_replicas.html"
+    tasks.append(
+        (
+            _figure_usl,
+            (peak_throughput(stats), fit_scalability(stats)),
+            filename,
+            f"✓ Ajustes USL/Amdahl por réplicas: {filename}",
+        )
+    )
+
+    _remove_stale(f"{RESULTS_DIR}/clientes_vs_servidores_*msgs.html", tasks)
+    render_figures(tasks, RESULTS_DIR, workers, force)
+
+    print(f"\n🎯 Análise 3D de performance salva em: {RESULTS_DIR}/")
+    print("\n� Gráficos gerados:")
+    print("   • clientes_vs_servidores_Xmsgs.html - Performance por carga de mensagens")
+    print("   • escalabilidade_clientes_vs_mensagens.html - Análise de escalabilidade")
+    print(
+        "   • diferenca_performance_go_vs_python.html - Apenas diferença de performance"
+    )
+    print("   • escalabilidade_usl_replicas.html - Vazão vs réplicas (USL e Amdahl)")
+    print("\n📋 Para visualizar:")
+    print("1. Abra o gerenciador de arquivos")
+    print(f"2. Navegue até: {os.path.abspath(RESULTS_DIR)}")
+    print("3. Clique duplo em qualquer arquivo .html")
+
+    print("\n🖱️  Controles do gráfico:")
+    print("   • Arrastar: Rotacionar")
+    print("   • Scroll: Zoom")
+    print("   • Shift+Arrastar: Pan")
+    print("   • Hover: Ver valores")
+
+
+def _figure_clients_vs_servers(msg_data, msg_count):
+    """Superfícies sobrepostas de Python e Go para uma quantidade de mensagens"""
+    # Criar figura única com superfícies sobrepostas
+    fig = go.Figure()
+
+    # Python data
+    py_data = msg_data[msg_data["implementation"] == "Python"]
+    if not py_data.empty:
+        _add_overlapped_surface_plotly(fig, py_data, "Python", "Blues", 0.7)
+
+    # Go data
+    go_data = msg_data[msg_data["implementation"] == "Go"]
+    if not go_data.empty:
+        _add_overlapped_surface_plotly(fig, go_data, "Go", "Reds", 0.7)
+
+    # Layout
+    fig.update_layout(
+        title=f"Tempo Total do Cenário - {msg_count} Mensagem(s)<br><sub>Clientes vs Servidores | Azul=Python, Vermelho=Go</sub>",
+        scene=dict(
+            xaxis_title="Número de Clientes",
+            yaxis_title="Número de Servidores",
+            zaxis_title="Tempo Total do Cenário (s)",
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
+        ),
+        width=900,
+        height=700,
+    )
+    return fig
+
+
+def _figure_scalability(scalability_stats):
+    """Superfícies de clientes vs mensagens para Python e Go"""
+    fig = go.Figure()
+
+    # Python data
+    py_scalability = scalability_stats[scalability_stats["implementation"] == "Python"]
+    if not py_scalability.empty:
+        _add_overlapped_surface_messages_plotly(
+            fig, py_scalability, "Python", "Blues", 0.7
+        )
+
+    # Go data
+    go_scalability = scalability_stats[scalability_stats["implementation"] == "Go"]
+    if not go_scalability.empty:
+        _add_overlapped_surface_messages_plotly(fig, go_scalability, "Go", "Reds", 0.7)
+
+    fig.update_layout(
+        title="Tempo Total por Cenário - Clientes vs Mensagens<br><sub>Como o tempo total varia com carga de trabalho | Azul=Python, Vermelho=Go</sub>",
+        scene=dict(
+            xaxis_title="Número de Clientes",
+            yaxis_title="Número de Mensagens",
+            zaxis_title="Tempo Total do Cenário (s)",
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
+        ),
+        width=900,
+        height=700,
+    )
+    return fig
+
+
+def _hover_tail(data):
+    """
+    Linhas extras do hover de cada ponto: percentis de response_time por
+    cliente e IC 95% (bootstrap) da média, quando presentes nos dados.
+    """
+    tail = pd.Series("", index=data.index)
+    percentiles = [name for name in HOVER_PERCENTILES if name in data]
+    if percentiles:
+        tail += "<br>" + data[percentiles[0]].map(
+            f"{PERCENTILE_LABELS[percentiles[0]]}: {{:.4f}}s".format
+        )
+        for name in percentiles[1:]:
+            tail += data[name].map(f" | {PERCENTILE_LABELS[name]}: {{:.4f}}s".format)
+    if "mean_ci_low" in data:
+        ci = data[["mean_ci_low", "mean_ci_high"]].notna().all(axis=1)
+        tail += np.where(
+            ci,
+            "<br>Média por cliente: "
+            + data["mean"].map("{:.4f}s".format)
+            + " (IC 95%: "
+            + data["mean_ci_low"].map("{:.4f}".format)
+            + "–"
+            + data["mean_ci_high"].map("{:.4f}s)".format),
+            "",
+        )
+    return tail.tolist()
+
+
+def _figure_usl(peaks, fits):
+    """Vazão de pico × réplicas, com USL (linha) e Amdahl (tracejado) por carga de mensagens"""
+    messages = sorted(peaks["messages"].unique())
+    fig = sp.make_subplots(
+        rows=1,
+        cols=len(messages),
+        subplot_titles=[f"{msg_count} Mensagem(s)" for msg_count in messages],
+    )
+    colors = {"Python": "blue", "Go": "red"}
+    n_max = peaks["servers"].max()
+    n = np.linspace(1, n_max * 1.5, 100)
+
+    for col, msg_count in enumerate(messages, start=1):
+        for impl, color in colors.items():
+            observed = peaks[
+                (peaks["messages"] == msg_count) & (peaks["implementation"] == impl)
+            ]
+            fit = fits[(fits["messages"] == msg_count) & (fits["implementation"] == impl)]
+            if observed.empty or fit.empty:
+                continue
+            fit = fit.iloc[0]
+
+            fig.add_trace(
+                go.Scatter(
+                    x=observed["servers"],
+                    y=observed["throughput"],
+                    mode="markers",
+                    marker=dict(size=8, color=color),
+                    name=f"{impl} (pico observado)",
+                    legendgroup=impl,
+                    showlegend=col == 1,
+                    hovertemplate=f"{impl}<br>Servidores: %{{x}}<br>Vazão: %{{y:,.0f}} msg/s<extra></extra>",
+                ),
+                row=1,
+                col=col,
+            )
+            if pd.notna(fit["lambda"]):
+                fig.add_trace(
+                    go.Scatter(
+                        x=n,
+                        y=usl(n, fit["lambda"], fit["sigma"], fit["kappa"]),
+                        mode="lines",
+                        line=dict(color=color),
+                        name=f"{impl} USL",
+                        legendgroup=impl,
+                        showlegend=col == 1,
+                        hovertemplate=(
+                            f"{impl} USL (σ={fit['sigma']:.3f}, κ={fit['kappa']:.4f}, "
+                            f"R²={fit['usl_r2']:.2f})<br>Servidores: %{{x:.1f}}<br>"
+                            "Vazão: %{y:,.0f} msg/s<extra></extra>"
+                        ),
+                    ),
+                    row=1,
+                    col=col,
+                )
+            if pd.notna(fit["amdahl_lambda"]):
+                fig.add_trace(
+                    go.Scatter(
+                        x=n,
+                        y=amdahl(n, fit["amdahl_lambda"], fit["amdahl_sigma"]),
+                        mode="lines",
+                        line=dict(color=color, dash="dash"),
+                        name=f"{impl} Amdahl",
+                        legendgroup=impl,
+                        showlegend=col == 1,
+                        hovertemplate=(
+                            f"{impl} Amdahl (σ={fit['amdahl_sigma']:.3f}, "
+                            f"R²={fit['amdahl_r2']:.2f})<br>Servidores: %{{x:.1f}}<br>"
+                            "Vazão: %{y:,.0f} msg/s<extra></extra>"
+                        ),
+                    ),
+                    row=1,
+                    col=col,
+                )
+
+    fig.update_xaxes(title_text="Servidores (réplicas)")
+    fig.update_yaxes(title_text="Vazão de pico (mensagens/s)", col=1)
+    fig.update_layout(
+        title="Escalabilidade com Réplicas - USL e Amdahl<br><sub>Pontos = vazão de pico observada | Linha = USL | Tracejado = Amdahl | Azul=Python, Vermelho=Go</sub>",
+        width=max(1000, 350 * len(messages)),
+        height=550,
+    )
+    return fig
+
+
+def _add_overlapped_surface_plotly(fig, data, name, colorscale, opacity):
+    """Adiciona superfície 3D sobreposta para clientes vs servidores"""
+    if data.empty:
+        return
+
+    x = data["clients"].values
+    y = data["servers"].values
+    # Calcular tempo total do cenário (tempo médio × número de clientes)
+    z = data["mean"].values * data["clients"].values
+
+    # Criar grid para interpolação
+    if len(x) > 3:
+        clients_range = np.linspace(x.min(), x.max(), 15)
+        servers_range = np.linspace(y.min(), y.max(), 10)
+        X, Y = np.meshgrid(clients_range, servers_range)
+
+        Z = griddata((x, y), z, (X, Y), method="linear", fill_value=np.nan)
+
+        fig.add_trace(
+            go.Surface(
+                x=X,
+                y=Y,
+                z=Z,
+                colorscale=colorscale,
+                name=name,
+                opacity=opacity,
+                showscale=False,
+            )
+        )
+
+    # Pontos de dados reais
+    fig.add_trace(
+        go.Scatter3d(
+            x=x,
+            y=y,
+            z=z,
+            mode="markers",
+            marker=dict(size=6, opacity=0.9),
+            name=f"{name} (Dados)",
+            text=[
+                f"{name}<br>Clientes: {c}<br>Servidores: {s}<br>Tempo Total: {t:.4f}s{tail}"
+                for c, s, t, tail in zip(x, y, z, _hover_tail(data))
+            ],
+            hovertemplate="%{text}<extra></extra>",
+        )
+    )
+
+
+def _add_overlapped_surface_messages_plotly(fig, data, name, colorscale, opacity):
+    """Adiciona superfície 3D sobreposta para clientes vs mensagens"""
+    if data.empty:
+        return
+
+    x = data["clients"].values
+    y = data["messages"].values
+    # Calcular tempo total do cenário (tempo médio × número de clientes)
+    z = data["mean"].values * data["clients"].values
+
+    # Criar grid para interpolação
+    if len(x) > 3:
+        clients_range = np.linspace(x.min(), x.max(), 15)
+        messages_range = np.linspace(y.min(), y.max(), 10)
+        X, Y = np.meshgrid(clients_range, messages_range)
+
+        Z = griddata((x, y), z, (X, Y), method="linear", fill_value=np.nan)
+
+        fig.add_trace(
+            go.Surface(
+                x=X,
+                y=Y,
+                z=Z,
+                colorscale=colorscale,
+                name=name,
+                opacity=opacity,
+                showscale=False,
+            )
+        )
+
+    # Pontos de dados reais
+    fig.add_trace(
+        go.Scatter3d(
+            x=x,
+            y=y,
+            z=z,
+            mode="markers",
+            marker=dict(size=6, opacity=0.9),
+            name=f"{name} (Dados)",
+            text=[
+                f"{name}<br>Clientes: {c}<br>Mensagens: {m}<br>Tempo Total: {t:.4f}s{tail}"
+                for c, m, t, tail in zip(x, y, z, _hover_tail(data))
+            ],
+            hovertemplate="%{text}<extra></extra>",
+        )
+    )
+
+
+def _figure_performance_difference(stats):
+    """Cria gráfico 3D focado APENAS na diferença de performance entre Python e Go"""
+    # Dados agregados para comparação
+    comparison_data = (
+        stats.groupby(["clients", "servers", "implementation"])["mean"]
+        .mean()
+        .reset_index()
+    )
+
+    py_data = comparison_data[comparison_data["implementation"] == "Python"]
+    go_data = comparison_data[comparison_data["implementation"] == "Go"]
+
+    # Criar figura única focada APENAS na diferença
+    fig = go.Figure()
+
+    # Diferença de performance (Go - Python) em tempo total do cenário
+    if not py_data.empty and not go_data.empty:
+        merged = pd.merge(
+            py_data, go_data, on=["clients", "servers"], suffixes=("_py", "_go")
+        )
+        if not merged.empty:
+            # Calcular tempo total para cada implementação
+            py_total = merged["mean_py"] * merged["clients"]
+            go_total = merged["mean_go"] * merged["clients"]
+            diff = go_total - py_total
+
+            # Adicionar APENAS pontos de diferença
+            fig.add_trace(
+                go.Scatter3d(
+                    x=merged["clients"],
+                    y=merged["servers"],
+                    z=diff,
+                    mode="markers",
+                    marker=dict(
+                        size=10,
+                        color=diff,
+                        colorscale="RdBu_r",  # Vermelho = Go mais lento, Azul = Go mais rápido
+                        opacity=0.8,
+                        showscale=True,
+                        colorbar=dict(
+                            title="Diferença Total (s)<br>Vermelho: Go mais lento<br>Azul: Go mais rápido",
+                        ),
+                        cmin=diff.min(),
+                        cmax=diff.max(),
+                    ),
+                    name="Diferença de Performance",
+                    text=[
+                        f"<b>Diferença Total: {d:.4f}s</b><br>"
+                        f"Clientes: {c}<br>"
+                        f"Servidores: {s}<br>"
+                        f"Python Total: {py:.4f}s<br>"
+                        f"Go Total: {go:.4f}s<br>"
+                        f"<span style='color:{'blue' if d < 0 else 'red'}'>Go é {'mais rápido' if d < 0 else 'mais lento'}</span>"
+                        for c, s, d, py, go in zip(
+                            merged["clients"],
+                            merged["servers"],
+                            diff,
+                            py_total,
+                            go_total,
+                        )
+                    ],
+                    hovertemplate="%{text}<extra></extra>",
+                )
+            )
+
+            # Adicionar superfície de diferença se temos dados suficientes
+            if len(merged) > 5:
+                clients_range = np.linspace(
+                    merged["clients"].min(), merged["clients"].max(), 15
+                )
+                servers_range = np.linspace(
+                    merged["servers"].min(), merged["servers"].max(), 10
+                )
+                clients_grid, servers_grid = np.meshgrid(clients_range, servers_range)
+
+                # Interpolar diferenças
+                diff_surface = griddata(
+                    (merged["clients"], merged["servers"]),
+                    diff,
+                    (clients_grid, servers_grid),
+                    method="linear",
+                    fill_value=np.nan,
+                )
+
+                # Adicionar superfície de diferença
+                fig.add_trace(
+                    go.Surface(
+                        x=clients_grid,
+                        y=servers_grid,
+                        z=diff_surface,
+                        colorscale="RdBu_r",
+                        name="Superfície de Diferença",
+                        opacity=0.6,
+                        showscale=False,
+                    )
+                )
+
+    # Layout otimizado para diferença de performance
+    fig.update_layout(
+        title="Diferença de Tempo Total do Cenário: Go vs Python<br><sub>Valores negativos = Go mais rápido | Valores positivos = Go mais lento</sub>",
+        scene=dict(
+            xaxis_title="Número de Clientes",
+            yaxis_title="Número de Servidores",
+            zaxis_title="Diferença de Tempo Total (s)<br>Go - Python",
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
+            bgcolor="rgba(240,240,240,0.8)",
+        ),
+        width=1000,
+        height=700,
+        showlegend=True,
+        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    )
+    return fig
+
+
+def generate_server_load_analysis(
+    file_py, file_go, workers=None, force=False, exclude_unsteady=False
+):
+    """
+    Gera análise específica de carga por servidor.
+    Foca na relação clientes vs servidores para análise de infraestrutura.
+    """
+    print("--- Gerando Análise de Carga por Servidor ---")
+
+    # Carregar dados (lidos, limpos e agregados uma única vez, com cache em disco)
+    try:
+        stats = load_results(file_py, file_go, exclude_unsteady=exclude_unsteady).stats
+    except FileNotFoundError as e:
+        print(f"Erro: Arquivo não encontrado: {e.filename}")
+        return
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    # Análise geral de infraestrutura: clientes vs servidores
+    infrastructure_stats = (
+        stats.groupby(["clients", "servers", "implementation"])[
+            ["mean", *HOVER_PERCENTILES]
+        ]
+        .mean()
+        .reset_index()
+    )
+
+    filename = f"{RESULTS_DIR}/infraestrutura_clientes_vs_servidores.html"
+    render_figures(
+        [
+            (
+                _figure_infrastructure,
+                (infrastructure_stats,),
+                filename,
+                f"✓ Análise de infraestrutura: {filename}",
+            )
+        ],
+        RESULTS_DIR,
+        workers,
+        force,
+    )
+
+    print(f"\n🎯 Análise de carga por servidor salva em: {RESULTS_DIR}/")
+    print("🔍 Este gráfico mostra:")
+    print("   • Como a performance varia com número de servidores")
+    print("   • Otimização de recursos de infraestrutura")
+    print("   • Ponto ideal de servidores vs clientes")
+
+
+def _figure_infrastructure(infrastructure_stats):
+    """Superfícies de clientes vs servidores (média de todas as cargas)"""
+    fig = go.Figure()
+
+    py_infra = infrastructure_stats[infrastructure_stats["implementation"] == "Python"]
+    go_infra = infrastructure_stats[infrastructure_stats["implementation"] == "Go"]
+
+    if not py_infra.empty:
+        _add_overlapped_surface(fig, py_infra, "Python", "Blues", 0.6)
+
+    if not go_infra.empty:
+        _add_overlapped_surface(fig, go_infra, "Go", "Reds", 0.6)
+
+    fig.update_layout(
+        title="Tempo Total por Infraestrutura - Clientes vs Servidores<br><sub>Otimização de recursos | Azul=Python, Vermelho=Go</sub>",
+        scene=dict(
+            xaxis_title="Número de Clientes",
+            yaxis_title="Número de Servidores",
+            zaxis_title="Tempo Total do Cenário (s)",
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
+        ),
+        width=1000,
+        height=700,
+        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    )
+    return fig
+
+
+def generate_overlapped_comparison(
+    file_py, file_go, workers=None, force=False, exclude_unsteady=False
+):
+    """
+    Gera gráficos 3D com superfícies sobrepostas de Python e Go
+    para comparação direta no mesmo espaço.
+    """
+    print("--- Gerando Gráficos 3D Sobrepostos Python vs Go ---")
+
+    # Carregar dados (lidos, limpos e agregados uma única vez, com cache em disco)
+    try:
+        stats = load_results(file_py, file_go, exclude_unsteady=exclude_unsteady).stats
+    except FileNotFoundError as e:
+        print(f"Erro: Arquivo não encontrado: {e.filename}")
+        return
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    # 1. Gráficos sobrepostos por número de mensagens
+    unique_messages = sorted(stats["messages"].unique())
+    tasks = []
+    for msg_count in unique_messages:
+        tasks.append(
+            (
+                _figure_overlapped_messages,
+                (stats[stats["messages"] == msg_count], msg_count),
+                f"{RESULTS_DIR}/overlapped_3d_messages_{msg_count}.html",
+                f"✓ Gráfico sobreposto salvo: overlapped_3d_messages_{msg_count}.html",
+            )
+        )
+
+    # 2. Gráfico sobreposto final: clientes vs mensagens
+    final_stats = (
+        stats.groupby(["clients", "messages", "implementation"])[
+            ["mean", *HOVER_PERCENTILES]
+        ]
+        .mean()
+        .reset_index()
+    )
+    tasks.append(
+        (
+            _figure_overlapped_final,
+            (final_stats,),
+            f"{RESULTS_DIR}/overlapped_3d_final.html",
+            "✓ Gráfico sobreposto final salvo: overlapped_3d_final.html",
+        )
+    )
+
+    # 3. Gráfico comparativo geral sobreposto
+    comparison_data = (
+        stats.groupby(["clients", "servers", "implementation"])[
+            ["mean", *HOVER_PERCENTILES]
+        ]
+        .mean()
+        .reset_index()
+    )
+    tasks.append(
+        (
+            _figure_overlapped_general,
+            (comparison_data,),
+            f"{RESULTS_DIR}/overlapped_3d_general.html",
+            "✓ Gráfico sobreposto geral salvo: overlapped_3d_general.html",
+        )
+    )
+
+    _remove_stale(f"{RESULTS_DIR}/overlapped_3d_messages_*.html", tasks)
+    render_figures(tasks, RESULTS_DIR, workers, force)
+
+    print(f"\n🎯 Gráficos sobrepostos salvos em: {RESULTS_DIR}/")
+    print("🔍 Nos gráficos sobrepostos, você pode:")
+    print("   • Ver diretamente qual implementação é mais rápida")
+    print("   • A superfície mais baixa representa melhor performance")
+    print("   • Azul = Python, Vermelho = Go")
+
+
+def _figure_overlapped_messages(msg_data, msg_count):
+    """Comparação sobreposta de clientes vs servidores para uma carga de mensagens"""
+    fig = go.Figure()
+
+    # Dados Python e Go
+    py_data = msg_data[msg_data["implementation"] == "Python"]
+    go_data = msg_data[msg_data["implementation"] == "Go"]
+
+    # Adicionar superfícies sobrepostas
+    if not py_data.empty:
+        _add_overlapped_surface(fig, py_data, "Python", "Blues", 0.6)
+
+    if not go_data.empty:
+        _add_overlapped_surface(fig, go_data, "Go", "Reds", 0.6)
+
+    # Layout
+    fig.update_layout(
+        title=f"Comparação Sobreposta 3D - {msg_count} Mensagem(s)<br><sub>Azul = Python | Vermelho = Go | Superfícies mais baixas = melhor performance</sub>",
+        scene=dict(
+            xaxis_title="Número de Clientes",
+            yaxis_title="Número de Servidores",
+            zaxis_title="Tempo Médio (s)",
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
+        ),
+        width=1000,
+        height=700,
+        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    )
+    return fig
+
+
+def _figure_overlapped_final(final_stats):
+    """Comparação sobreposta de clientes vs mensagens"""
+    fig = go.Figure()
+
+    py_final = final_stats[final_stats["implementation"] == "Python"]
+    go_final = final_stats[final_stats["implementation"] == "Go"]
+
+    if not py_final.empty:
+        _add_overlapped_surface_messages(fig, py_final, "Python", "Blues", 0.6)
+
+    if not go_final.empty:
+        _add_overlapped_surface_messages(fig, go_final, "Go", "Reds", 0.6)
+
+    fig.update_layout(
+        title="Comparação Sobreposta 3D - Clientes vs Mensagens<br><sub>Azul = Python | Vermelho = Go | Superfícies mais baixas = melhor performance</sub>",
+        scene=dict(
+            xaxis_title="Número de Clientes",
+            yaxis_title="Número de Mensagens",
+            zaxis_title="Tempo Médio (s)",
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
+        ),
+        width=1000,
+        height=700,
+        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    )
+    return fig
+
+
+def _figure_overlapped_general(comparison_data):
+    """Comparação sobreposta geral de clientes vs servidores"""
+    fig = go.Figure()
+
+    py_comp = comparison_data[comparison_data["implementation"] == "Python"]
+    go_comp = comparison_data[comparison_data["implementation"] == "Go"]
+
+    if not py_comp.empty:
+        _add_overlapped_surface(fig, py_comp, "Python", "Blues", 0.6)
+
+    if not go_comp.empty:
+        _add_overlapped_surface(fig, go_comp, "Go", "Reds", 0.6)
+
+    fig.update_layout(
+        title="Comparação Sobreposta Geral - Clientes vs Servidores<br><sub>Azul = Python | Vermelho = Go | Superfícies mais baixas = melhor performance</sub>",
+        scene=dict(
+            xaxis_title="Número de Clientes",
+            yaxis_title="Número de Servidores",
+            zaxis_title="Tempo Médio (s)",
+            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
+        ),
+        width=1000,
+        height=700,
+        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    )
+    return fig
+
+
+def _add_overlapped_surface(fig, data, name, colorscale, opacity):
+    """Adiciona superfície 3D sobreposta para clientes vs servidores"""
+    if data.empty:
+        return
+
+    x = data["clients"].values
+    y = data["servers"].values
+    # Calcular tempo total do cenário (tempo médio × número de clientes)
+    z = data["mean"].values * data["clients"].values
+
+    # Criar grid para interpolação
+    if len(x) > 3:
+        clients_range = np.linspace(x.min(), x.max(), 25)
+        servers_range = np.linspace(y.min(), y.max(), 25)
+        X, Y = np.meshgrid(clients_range, servers_range)
+
+        # Interpolar dados
+        Z = griddata((x, y), z, (X, Y), method="linear", fill_value=np.nan)
+
+        # Adicionar superfície
+        fig.add_trace(
+            go.Surface(
+                x=X,
+                y=Y,
+                z=Z,
+                colorscale=colorscale,
+                name=name,
+                opacity=opacity,
+                showscale=True,
+                colorbar=dict(
+                    title=f"{name}<br>Tempo (s)", x=0.9 if name == "Go" else 0.02
+                ),
+            )
+        )
+
+    # Adicionar pontos de dados reais
+    fig.add_trace(
+        go.Scatter3d(
+            x=x,
+            y=y,
+            z=z,
+            mode="markers",
+            marker=dict(
+                size=6, opacity=0.9, color="darkblue" if name == "Python" else "darkred"
+            ),
+            name=f"{name} (Dados)",
+            text=[
+                f"{name}<br>Clientes: {c}<br>Servidores: {s}<br>Tempo Total: {t:.4f}s{tail}"
+                for c, s, t, tail in zip(x, y, z, _hover_tail(data))
+            ],
+            hovertemplate="%{text}<extra></extra>",
+        )
+    )
+
+
+def _add_overlapped_surface_messages(fig, data, name, colorscale, opacity):
+    """Adiciona superfície 3D sobreposta para clientes vs mensagens"""
+    if data.empty:
+        return
+
+    x = data["clients"].values
+    y = data["messages"].values
+    # Calcular tempo total do cenário (tempo médio × número de clientes)
+    z = data["mean"].values * data["clients"].values
+
+    # Criar grid para interpolação
+    if len(x) > 3:
+        clients_range = np.linspace(x.min(), x.max(), 25)
+        messages_range = np.linspace(y.min(), y.max(), 25)
+        X, Y = np.meshgrid(clients_range, messages_range)
+
+        Z = griddata((x, y), z, (X, Y), method="linear", fill_value=np.nan)
+
+        fig.add_trace(
+            go.Surface(
+                x=X,
+                y=Y,
+                z=Z,
+                colorscale=colorscale,
+                name=name,
+                opacity=opacity,
+                showscale=True,
+                colorbar=dict(
+                    title=f"{name}<br>Tempo (s)", x=0.9 if name == "Go" else 0.02
+                ),
+            )
+        )
+
+    # Pontos de dados reais
+    fig.add_trace(
+        go.Scatter3d(
+            x=x,
+            y=y,
+            z=z,
+            mode="markers",
+            marker=dict(
+                size=6, opacity=0.9, color="darkblue" if name == "Python" else "darkred"
+            ),
+            name=f"{name} (Dados)",
+            text=[
+                f"{name}<br>Clientes: {c}<br>Mensagens: {m}<br>Tempo Total: {t:.4f}s{tail}"
+                for c, m, t, tail in zip(x, y, z, _hover_tail(data))
+            ],
+            hovertemplate="%{text}<extra></extra>",
+        )
+    )
+
+
+def generate_timeline_analysis(
+    file_py, file_go, scenario=None, bin_seconds=DEFAULT_BIN_SECONDS, workers=None, force=False
+):
+    """
+    Fases (aquecimento, regime estacionário, drenagem) de cada execução, a
+    partir dos horários das sessões, e as execuções que não estabilizaram.
+    scenario: (servers, clients, messages) para gravar a linha do tempo das
+    execuções desse cenário em HTML.
+    """
+    print("--- Gerando Linha do Tempo das Execuções ---")
+
+    try:
+        df = pd.concat(
+            [
+                standardize(read_results_csv(file_py), "Python"),
+                standardize(read_results_csv(file_go), "Go"),
+            ],
+            ignore_index=True,
+        )
+    except FileNotFoundError as e:
+        print(f"Erro: Arquivo não encontrado: {e.filename}")
+        return
+
+    phases = run_phases(df, bin_seconds)
+    unsteady = phases[~phases["reached_steady"]]
+    summary = phases.groupby("implementation").agg(
+        execucoes=("reached_steady", "size"),
+        sem_regime=("reached_steady", lambda reached: int((~reached).sum())),
+        aquecimento_s=("warmup_seconds", "mean"),
+        regime_s=("steady_seconds", "mean"),
+        drenagem_s=("drain_seconds", "mean"),
+    )
+    print(summary.round(2).to_string())
+    print(f"\n⚠️  {len(unsteady)} de {len(phases)} execuções sem regime estacionário")
+    if not unsteady.empty:
+        columns = ["implementation", "servers", "clients", "messages", "iteration"]
+        print(
+            unsteady[columns + ["duration", "steady_share"]]
+            .sort_values("steady_share")
+            .head(20)
+            .round(2)
+            .to_string(index=False)
+        )
+
+    if scenario is None:
+        return
+
+    servers, clients, messages = scenario
+    rows = df[
+        (df["servers"] == servers) & (df["clients"] == clients) & (df["messages"] == messages)
+    ]
+    if rows.empty:
+        print(f"❌ Sem dados para o cenário {servers} serv, {clients} cli, {messages} msg")
+        return
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    filename = f"{RESULTS_DIR}/timeline_{servers}s_{clients}c_{messages}m.html"
+    render_figures(
+        [
+            (
+                _figure_timeline,
+                (run_timeline(rows, bin_seconds), run_phases(rows, bin_seconds), scenario),
+                filename,
+                f"✓ Linha do tempo do cenário: {filename}",
+            )
+        ],
+        RESULTS_DIR,
+        workers,
+        force,
+    )
+
+
+def _figure_timeline(timeline, phases, scenario):
+    """Sessões simultâneas e mensagens/s de cada execução de um cenário"""
+    fig = sp.make_subplots(
+        rows=2,
+        cols=1,
+        shared_xaxes=True,
+        subplot_titles=["Sessões simultâneas", "Mensagens concluídas por segundo"],
+    )
+    colors = {"Python": "blue", "Go": "red"}
+    run_keys = ["implementation", "iteration"]
+    reached = phases.set_index(run_keys)["reached_steady"]
+
+    for (impl, iteration), run in timeline.groupby(run_keys, sort=True):
+        steady = bool(reached.loc[(impl, iteration)])
+        # Execuções que não estabilizaram ficam pontilhadas
+        line = dict(color=colors.get(impl, "gray"), dash="solid" if steady else "dot")
+        name = f"{impl} #{iteration}" + ("" if steady else " (sem regime)")
+        hover = (
+            f"{name}<br>t = %{{x:.1f}}s<br>%{{y:,.1f}}<br>Fase: %{{text}}<extra></extra>"
+        )
+        for row, column in ((1, "sessions"), (2, "messages_per_second")):
+            fig.add_trace(
+                go.Scatter(
+                    x=run["time"],
+                    y=run[column],
+                    text=run["phase"],
+                    mode="lines",
+                    line=line,
+                    name=name,
+                    legendgroup=name,
+                    showlegend=row == 1,
+                    hovertemplate=hover,
+                ),
+                row=row,
+                col=1,
+            )
+
+    servers, clients, messages = scenario
+    fig.update_xaxes(title_text="Tempo desde o início da execução (s)", row=2, col=1)
+    fig.update_layout(
+        title=f"Linha do Tempo - {servers} Servidores, {clients} Clientes, {messages} Mensagem(s)<br><sub>Azul=Python, Vermelho=Go | Pontilhado = execução sem regime estacionário</sub>",
+        width=1000,
+        height=750,
+    )
+    return fig
@@ -1,792 +1,328 @@
-# Análise 3D Interativa de Performance - Cliente-Servidor
-import pandas as pd
-import numpy as np
+#!/usr/bin/env python3
+# Análise de Performance - Cliente-Servidor (CLI)
+# As bibliotecas pesadas (pandas, numpy, plotly, scipy) só são importadas
+# pelos subcomandos que precisam delas; "check" roda só com a stdlib.
+import argparse
+import importlib
 import os
-import shutil
 import sys
-import plotly.graph_objects as go
-import plotly.subplots as sp
-from plotly.offline import plot
-from scipy.interpolate import griddata
-
-
-def generate_performance_analysis_3d(file_py, file_go):
-    """
-    Gera análise 3D de performance com gráficos focados nos tipos de dados.
-    Elimina duplicações e usa nomes descritivos baseados no conteúdo.
-    """
-    print("--- Gerando Análise 3D de Performance ---")
-
-    # Carregar dados
-    try:
-        df_py = pd.read_csv(file_py)
-        df_go = pd.read_csv(file_go)
-    except FileNotFoundError as e:
-        print(f"Erro: Arquivo não encontrado: {e.filename}")
-        return
-
-    # Preparar dados
-    df_py["implementation"] = "Python"
-    df_go["implementation"] = "Go"
-    df_combined = pd.concat([df_py, df_go], ignore_index=True)
-
-    # Renomear colunas para padronização
-    df_combined.rename(
-        columns={
-            "num_servers": "servers",
-            "num_clients": "clients",
-            "num_messages": "messages",
-        },
-        inplace=True,
+import time
+
+DEFAULT_FILE_PY = "requests_python.csv"
+DEFAULT_FILE_GO = "requests_go.csv"
+# Mesmo padrão de regression.BASELINE_DIR
+DEFAULT_BASELINE_DIR = os.getenv("BASELINE_DIR", "baselines")
+# Mesmo cabeçalho de results_csv.COLUMNS (repetido para não importar pandas)
+CSV_HEADER = (
+    "client_id,message_id,server_id,client_send_time,server_processing_time,"
+    "client_receive_time,response_time,num_servers,num_clients,num_messages"
+)
+
+# Tempo gasto em importações adiadas, para --timing
+_import_seconds = 0.0
+
+
+def _lazy_import(name):
+    """Importa um módulo no momento do uso, contabilizando o tempo gasto"""
+    global _import_seconds
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_seconds += time.perf_counter() - start
+    return module
+
+
+def _require_files(args):
+    missing = [path for path in (args.python, args.go) if not os.path.exists(path)]
+    for path in missing:
+        print(f"❌ Erro: Arquivo {path} não encontrado!")
+    if missing:
+        print("Execute primeiro o deploy.sh para gerar os dados.")
+        sys.exit(1)
+
+
+def cmd_check(args):
+    """Verifica os arquivos de resultados sem carregar as bibliotecas de análise"""
+    ok = True
+    for label, path in (("Python", args.python), ("Go", args.go)):
+        if not os.path.exists(path):
+            print(f"❌ {label}: {path} não encontrado")
+            ok = False
+            continue
+
+        lines = 0
+        with open(path, "rb") as f:
+            header = f.readline().decode("utf-8", "replace").strip()
+            for block in iter(lambda: f.read(1 << 20), b""):
+                lines += block.count(b"\n")
+
+        size = os.path.getsize(path) / 1e6
+        status = "✅" if header == CSV_HEADER else "⚠️  cabeçalho inesperado,"
+        print(f"{status} {label}: {path} | {lines:,} linhas | {size:.1f}MB")
+        ok = ok and header == CSV_HEADER
+    return 0 if ok else 1
+
+
+def cmd_summary(args):
+    _require_files(args)
+    summary_analysis = _lazy_import("summary_analysis")
+    report_file = summary_analysis.analyze_performance(
+        args.python, args.go, args.output, args.exclude_unsteady
     )
+    if report_file:
+        print(f"\n🎉 Análise concluída! Relatório disponível em: {report_file}")
+    return 0 if report_file else 1
 
-    # Limpeza de dados
-    df_combined["response_time"] = pd.to_numeric(
-        df_combined["response_time"], errors="coerce"
-    )
-    df_combined.dropna(subset=["response_time"], inplace=True)
 
-    # Remover outliers (Z-score > 3)
-    grouped = df_combined.groupby(["servers", "clients", "messages", "implementation"])
-    df_combined["z_score"] = grouped["response_time"].transform(
-        lambda x: np.abs((x - x.mean()) / x.std()) if x.std() > 0 else 0
-    )
-    df_cleaned = df_combined[df_combined["z_score"] <= 3]
-
-    # Calcular estatísticas agregadas
-    stats = (
-        df_cleaned.groupby(["servers", "clients", "messages", "implementation"])[
-            "response_time"
-        ]
-        .agg(["mean", "std"])
-        .reset_index()
+def cmd_3d(args):
+    _require_files(args)
+    plots = _lazy_import("analysis_plots")
+    plots.generate_performance_analysis_3d(
+        args.python, args.go, args.workers, args.force, args.exclude_unsteady
     )
+    return 0
 
-    # Criar diretório de resultados
-    RESULTS_DIR = "analysis_results_interactive"
-    if os.path.exists(RESULTS_DIR):
-        shutil.rmtree(RESULTS_DIR)
-    os.makedirs(RESULTS_DIR)
-
-    # 1. Gráficos por número de mensagens (clientes vs servidores)
-    unique_messages = sorted(stats["messages"].unique())
-
-    for msg_count in unique_messages:
-        msg_data = stats[stats["messages"] == msg_count]
-
-        # Criar figura única com superfícies sobrepostas
-        fig = go.Figure()
-
-        # Python data
-        py_data = msg_data[msg_data["implementation"] == "Python"]
-        if not py_data.empty:
-            _add_overlapped_surface_plotly(fig, py_data, "Python", "Blues", 0.7)
-
-        # Go data
-        go_data = msg_data[msg_data["implementation"] == "Go"]
-        if not go_data.empty:
-            _add_overlapped_surface_plotly(fig, go_data, "Go", "Reds", 0.7)
-
-        # Layout
-        fig.update_layout(
-            title=f"Tempo Total do Cenário - {msg_count} Mensagem(s)<br><sub>Clientes vs Servidores | Azul=Python, Vermelho=Go</sub>",
-            scene=dict(
-                xaxis_title="Número de Clientes",
-                yaxis_title="Número de Servidores",
-                zaxis_title="Tempo Total do Cenário (s)",
-                camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
-            ),
-            width=900,
-            height=700,
-        )
 
-        # Salvar arquivo HTML com nome descritivo
-        filename = f"{RESULTS_DIR}/clientes_vs_servidores_{msg_count}msgs.html"
-        plot(fig, filename=filename, auto_open=False)
-        print(f"✓ Gráfico clientes vs servidores ({msg_count} msgs): {filename}")
-
-    # 2. Gráfico de escalabilidade: clientes vs mensagens
-    scalability_stats = (
-        stats.groupby(["clients", "messages", "implementation"])["mean"]
-        .mean()
-        .reset_index()
+def cmd_server_load(args):
+    _require_files(args)
+    plots = _lazy_import("analysis_plots")
+    plots.generate_server_load_analysis(
+        args.python, args.go, args.workers, args.force, args.exclude_unsteady
     )
+    return 0
 
-    fig = go.Figure()
-
-    # Python data
-    py_scalability = scalability_stats[scalability_stats["implementation"] == "Python"]
-    if not py_scalability.empty:
-        _add_overlapped_surface_messages_plotly(
-            fig, py_scalability, "Python", "Blues", 0.7
-        )
 
-    # Go data
-    go_scalability = scalability_stats[scalability_stats["implementation"] == "Go"]
-    if not go_scalability.empty:
-        _add_overlapped_surface_messages_plotly(fig, go_scalability, "Go", "Reds", 0.7)
-
-    fig.update_layout(
-        title="Tempo Total por Cenário - Clientes vs Mensagens<br><sub>Como o tempo total varia com carga de trabalho | Azul=Python, Vermelho=Go</sub>",
-        scene=dict(
-            xaxis_title="Número de Clientes",
-            yaxis_title="Número de Mensagens",
-            zaxis_title="Tempo Total do Cenário (s)",
-            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
-        ),
-        width=900,
-        height=700,
+def cmd_compare(args):
+    _require_files(args)
+    plots = _lazy_import("analysis_plots")
+    plots.generate_overlapped_comparison(
+        args.python, args.go, args.workers, args.force, args.exclude_unsteady
     )
+    return 0
 
-    filename = f"{RESULTS_DIR}/escalabilidade_clientes_vs_mensagens.html"
-    plot(fig, filename=filename, auto_open=False)
-    print(f"✓ Análise de escalabilidade: {filename}")
-
-    # 3. Gráfico de diferença de performance (apenas este)
-    _create_performance_difference_chart(stats, RESULTS_DIR)
 
-    print(f"\n🎯 Análise 3D de performance salva em: {RESULTS_DIR}/")
-    print("\n� Gráficos gerados:")
-    print("   • clientes_vs_servidores_Xmsgs.html - Performance por carga de mensagens")
-    print("   • escalabilidade_clientes_vs_mensagens.html - Análise de escalabilidade")
-    print(
-        "   • diferenca_performance_go_vs_python.html - Apenas diferença de performance"
+def cmd_timeline(args):
+    _require_files(args)
+    plots = _lazy_import("analysis_plots")
+    plots.generate_timeline_analysis(
+        args.python, args.go, args.scenario, args.bin, args.workers, args.force
     )
-    print("\n📋 Para visualizar:")
-    print("1. Abra o gerenciador de arquivos")
-    print(f"2. Navegue até: {os.path.abspath(RESULTS_DIR)}")
-    print("3. Clique duplo em qualquer arquivo .html")
-
-    print("\n🖱️  Controles do gráfico:")
-    print("   • Arrastar: Rotacionar")
-    print("   • Scroll: Zoom")
-    print("   • Shift+Arrastar: Pan")
-    print("   • Hover: Ver valores")
-
-
-def _add_overlapped_surface_plotly(fig, data, name, colorscale, opacity):
-    """Adiciona superfície 3D sobreposta para clientes vs servidores"""
-    if data.empty:
-        return
-
-    x = data["clients"].values
-    y = data["servers"].values
-    # Calcular tempo total do cenário (tempo médio × número de clientes)
-    z = data["mean"].values * data["clients"].values
-
-    # Criar grid para interpolação
-    if len(x) > 3:
-        clients_range = np.linspace(x.min(), x.max(), 15)
-        servers_range = np.linspace(y.min(), y.max(), 10)
-        X, Y = np.meshgrid(clients_range, servers_range)
-
-        Z = griddata((x, y), z, (X, Y), method="linear", fill_value=np.nan)
-
-        fig.add_trace(
-            go.Surface(
-                x=X,
-                y=Y,
-                z=Z,
-                colorscale=colorscale,
-                name=name,
-                opacity=opacity,
-                showscale=False,
-            )
+    return 0
+
+
+def cmd_baseline(args):
+    regression = _lazy_import("regression")
+    if args.action == "list":
+        baselines = regression.list_baselines(args.dir)
+        if baselines.empty:
+            print(f"📭 Nenhuma linha de base em {args.dir}")
+        else:
+            print(baselines.to_string(index=False))
+        return 0
+
+    if not args.name:
+        print("❌ Informe o nome da linha de base: analyze.py baseline save <nome>")
+        return 1
+    _require_files(args)
+    try:
+        path = regression.save_baseline(
+            args.name, args.python, args.go, args.dir, overwrite=args.overwrite
         )
-
-    # Pontos de dados reais
-    fig.add_trace(
-        go.Scatter3d(
-            x=x,
-            y=y,
-            z=z,
-            mode="markers",
-            marker=dict(size=6, opacity=0.9),
-            name=f"{name} (Dados)",
-            text=[
-                f"{name}<br>Clientes: {c}<br>Servidores: {s}<br>Tempo Total: {t:.4f}s"
-                for c, s, t in zip(x, y, z)
-            ],
-            hovertemplate="%{text}<extra></extra>",
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    except FileExistsError:
+        print(f"❌ A linha de base '{args.name}' já existe (use --overwrite para substituir)")
+        return 1
+    print(f"💾 Linha de base '{args.name}' salva em {path}")
+    return 0
+
+
+def cmd_regression(args):
+    regression = _lazy_import("regression")
+    try:
+        for name in (args.baseline, args.candidate):
+            if name is not None:
+                regression.baseline_path(name, args.dir)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if args.candidate is None:
+        _require_files(args)
+    try:
+        comparison = regression.check_regressions(
+            args.python,
+            args.go,
+            args.baseline,
+            args.candidate,
+            args.alpha,
+            args.threshold,
+            args.correction,
+            args.dir,
+            args.exclude_unsteady,
+            args.csv,
         )
-    )
+    except FileNotFoundError as e:
+        print(f"❌ Erro: {e.strerror}: {e.filename}")
+        return 1
+    # Código de saída 1 com regressões, para uso em scripts/CI
+    return int((comparison["status"] == regression.STATUS_REGRESSED).any())
 
 
-def _add_overlapped_surface_messages_plotly(fig, data, name, colorscale, opacity):
-    """Adiciona superfície 3D sobreposta para clientes vs mensagens"""
-    if data.empty:
-        return
-
-    x = data["clients"].values
-    y = data["messages"].values
-    # Calcular tempo total do cenário (tempo médio × número de clientes)
-    z = data["mean"].values * data["clients"].values
-
-    # Criar grid para interpolação
-    if len(x) > 3:
-        clients_range = np.linspace(x.min(), x.max(), 15)
-        messages_range = np.linspace(y.min(), y.max(), 10)
-        X, Y = np.meshgrid(clients_range, messages_range)
-
-        Z = griddata((x, y), z, (X, Y), method="linear", fill_value=np.nan)
-
-        fig.add_trace(
-            go.Surface(
-                x=X,
-                y=Y,
-                z=Z,
-                colorscale=colorscale,
-                name=name,
-                opacity=opacity,
-                showscale=False,
-            )
-        )
+def cmd_all(args):
+    """Comportamento padrão (sem subcomando): análise 3D + infraestrutura"""
+    print("🚀 Gerando análise 3D de performance...")
+    print("📊 Gráficos otimizados com nomes descritivos")
+    print("")
+    _require_files(args)
+    plots = _lazy_import("analysis_plots")
 
-    # Pontos de dados reais
-    fig.add_trace(
-        go.Scatter3d(
-            x=x,
-            y=y,
-            z=z,
-            mode="markers",
-            marker=dict(size=6, opacity=0.9),
-            name=f"{name} (Dados)",
-            text=[
-                f"{name}<br>Clientes: {c}<br>Mensagens: {m}<br>Tempo Total: {t:.4f}s"
-                for c, m, t in zip(x, y, z)
-            ],
-            hovertemplate="%{text}<extra></extra>",
-        )
+    # Gerar análise completa de performance
+    print("1️⃣ Gerando análise de performance por carga de mensagens...")
+    plots.generate_performance_analysis_3d(
+        args.python, args.go, args.workers, args.force, args.exclude_unsteady
     )
 
-
-def _create_performance_difference_chart(stats, results_dir):
-    """Cria gráfico 3D focado APENAS na diferença de performance entre Python e Go"""
-    print("Criando gráfico de diferença de performance...")
-
-    # Dados agregados para comparação
-    comparison_data = (
-        stats.groupby(["clients", "servers", "implementation"])["mean"]
-        .mean()
-        .reset_index()
+    print("\n2️⃣ Gerando análise de infraestrutura...")
+    plots.generate_server_load_analysis(
+        args.python, args.go, args.workers, args.force, args.exclude_unsteady
     )
 
-    py_data = comparison_data[comparison_data["implementation"] == "Python"]
-    go_data = comparison_data[comparison_data["implementation"] == "Go"]
-
-    # Criar figura única focada APENAS na diferença
-    fig = go.Figure()
-
-    # Diferença de performance (Go - Python) em tempo total do cenário
-    if not py_data.empty and not go_data.empty:
-        merged = pd.merge(
-            py_data, go_data, on=["clients", "servers"], suffixes=("_py", "_go")
-        )
-        if not merged.empty:
-            # Calcular tempo total para cada implementação
-            py_total = merged["mean_py"] * merged["clients"]
-            go_total = merged["mean_go"] * merged["clients"]
-            diff = go_total - py_total
-
-            # Adicionar APENAS pontos de diferença
-            fig.add_trace(
-                go.Scatter3d(
-                    x=merged["clients"],
-                    y=merged["servers"],
-                    z=diff,
-                    mode="markers",
-                    marker=dict(
-                        size=10,
-                        color=diff,
-                        colorscale="RdBu_r",  # Vermelho = Go mais lento, Azul = Go mais rápido
-                        opacity=0.8,
-                        showscale=True,
-                        colorbar=dict(
-                            title="Diferença Total (s)<br>Vermelho: Go mais lento<br>Azul: Go mais rápido",
-                        ),
-                        cmin=diff.min(),
-                        cmax=diff.max(),
-                    ),
-                    name="Diferença de Performance",
-                    text=[
-                        f"<b>Diferença Total: {d:.4f}s</b><br>"
-                        f"Clientes: {c}<br>"
-                        f"Servidores: {s}<br>"
-                        f"Python Total: {py:.4f}s<br>"
-                        f"Go Total: {go:.4f}s<br>"
-                        f"<span style='color:{'blue' if d < 0 else 'red'}'>Go é {'mais rápido' if d < 0 else 'mais lento'}</span>"
-                        for c, s, d, py, go in zip(
-                            merged["clients"],
-                            merged["servers"],
-                            diff,
-                            py_total,
-                            go_total,
-                        )
-                    ],
-                    hovertemplate="%{text}<extra></extra>",
-                )
-            )
-
-            # Adicionar superfície de diferença se temos dados suficientes
-            if len(merged) > 5:
-                clients_range = np.linspace(
-                    merged["clients"].min(), merged["clients"].max(), 15
-                )
-                servers_range = np.linspace(
-                    merged["servers"].min(), merged["servers"].max(), 10
-                )
-                clients_grid, servers_grid = np.meshgrid(clients_range, servers_range)
-
-                # Interpolar diferenças
-                diff_surface = griddata(
-                    (merged["clients"], merged["servers"]),
-                    diff,
-                    (clients_grid, servers_grid),
-                    method="linear",
-                    fill_value=np.nan,
-                )
-
-                # Adicionar superfície de diferença
-                fig.add_trace(
-                    go.Surface(
-                        x=clients_grid,
-                        y=servers_grid,
-                        z=diff_surface,
-                        colorscale="RdBu_r",
-                        name="Superfície de Diferença",
-                        opacity=0.6,
-                        showscale=False,
-                    )
-                )
-
-    # Layout otimizado para diferença de performance
-    fig.update_layout(
-        title="Diferença de Tempo Total do Cenário: Go vs Python<br><sub>Valores negativos = Go mais rápido | Valores positivos = Go mais lento</sub>",
-        scene=dict(
-            xaxis_title="Número de Clientes",
-            yaxis_title="Número de Servidores",
-            zaxis_title="Diferença de Tempo Total (s)<br>Go - Python",
-            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
-            bgcolor="rgba(240,240,240,0.8)",
-        ),
-        width=1000,
-        height=700,
-        showlegend=True,
-        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    print("\n🎉 Análise 3D completa gerada com sucesso!")
+    print("📁 Verifique a pasta: analysis_results_interactive/")
+    print("\n📊 Gráficos gerados:")
+    print(
+        "   🔹 clientes_vs_servidores_Xmsgs.html - Performance por carga de mensagens"
     )
+    print("   🔹 escalabilidade_clientes_vs_mensagens.html - Análise de escalabilidade")
+    print(
+        "   🔹 diferenca_performance_go_vs_python.html - APENAS diferença de performance"
+    )
+    print("   🔹 escalabilidade_usl_replicas.html - Vazão vs réplicas (USL e Amdahl)")
+    print(
+        "   🔹 infraestrutura_clientes_vs_servidores.html - Otimização de infraestrutura"
+    )
+    print("\n🌐 Abra qualquer arquivo .html no navegador para visualizar")
+    return 0
 
-    filename = f"{results_dir}/diferenca_performance_go_vs_python.html"
-    plot(fig, filename=filename, auto_open=False)
-    print(f"✓ Gráfico de diferença de performance: {filename}")
-
-
-def generate_server_load_analysis(file_py, file_go):
-    """
-    Gera análise específica de carga por servidor.
-    Foca na relação clientes vs servidores para análise de infraestrutura.
-    """
-    print("--- Gerando Análise de Carga por Servidor ---")
 
-    # Carregar dados
-    try:
-        df_py = pd.read_csv(file_py)
-        df_go = pd.read_csv(file_go)
-    except FileNotFoundError as e:
-        print(f"Erro: Arquivo não encontrado: {e.filename}")
-        return
-
-    # Preparar dados
-    df_py["implementation"] = "Python"
-    df_go["implementation"] = "Go"
-    df_combined = pd.concat([df_py, df_go], ignore_index=True)
-
-    # Renomear colunas
-    df_combined.rename(
-        columns={
-            "num_servers": "servers",
-            "num_clients": "clients",
-            "num_messages": "messages",
-        },
-        inplace=True,
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Análise dos resultados Python vs Go (sem subcomando: 3d + server-load)"
     )
-
-    # Limpeza de dados
-    df_combined["response_time"] = pd.to_numeric(
-        df_combined["response_time"], errors="coerce"
+    parser.add_argument("--python", default=DEFAULT_FILE_PY, help="CSV do servidor Python")
+    parser.add_argument("--go", default=DEFAULT_FILE_GO, help="CSV do servidor Go")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processos para renderizar gráficos (padrão: ANALYSIS_WORKERS ou nº de CPUs)",
     )
-    df_combined.dropna(subset=["response_time"], inplace=True)
-
-    # Remover outliers
-    grouped = df_combined.groupby(["servers", "clients", "messages", "implementation"])
-    df_combined["z_score"] = grouped["response_time"].transform(
-        lambda x: np.abs((x - x.mean()) / x.std()) if x.std() > 0 else 0
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Refaz todos os gráficos, mesmo os que não tiveram dados alterados",
     )
-    df_cleaned = df_combined[df_combined["z_score"] <= 3]
-
-    # Calcular estatísticas agregadas
-    stats = (
-        df_cleaned.groupby(["servers", "clients", "messages", "implementation"])[
-            "response_time"
-        ]
-        .agg(["mean", "std"])
-        .reset_index()
+    parser.add_argument(
+        "--exclude-unsteady",
+        action="store_true",
+        help="Descarta as execuções que não atingiram regime estacionário (ver timeline)",
     )
-
-    RESULTS_DIR = "analysis_results_interactive"
-    if not os.path.exists(RESULTS_DIR):
-        os.makedirs(RESULTS_DIR)
-
-    # Análise geral de infraestrutura: clientes vs servidores
-    infrastructure_stats = (
-        stats.groupby(["clients", "servers", "implementation"])["mean"]
-        .mean()
-        .reset_index()
+    parser.add_argument(
+        "--timing", action="store_true", help="Mostra o tempo de importação e de execução"
     )
+    parser.set_defaults(func=cmd_all)
 
-    fig = go.Figure()
-
-    py_infra = infrastructure_stats[infrastructure_stats["implementation"] == "Python"]
-    go_infra = infrastructure_stats[infrastructure_stats["implementation"] == "Go"]
-
-    if not py_infra.empty:
-        _add_overlapped_surface(fig, py_infra, "Python", "Blues", 0.6)
-
-    if not go_infra.empty:
-        _add_overlapped_surface(fig, go_infra, "Go", "Reds", 0.6)
-
-    fig.update_layout(
-        title="Tempo Total por Infraestrutura - Clientes vs Servidores<br><sub>Otimização de recursos | Azul=Python, Vermelho=Go</sub>",
-        scene=dict(
-            xaxis_title="Número de Clientes",
-            yaxis_title="Número de Servidores",
-            zaxis_title="Tempo Total do Cenário (s)",
-            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
-        ),
-        width=1000,
-        height=700,
-        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    subparsers = parser.add_subparsers(dest="command")
+    summary = subparsers.add_parser("summary", help="Relatório estatístico em Markdown")
+    summary.add_argument(
+        "--output", default="performance_analysis_report.md", help="Arquivo do relatório"
     )
-
-    filename = f"{RESULTS_DIR}/infraestrutura_clientes_vs_servidores.html"
-    plot(fig, filename=filename, auto_open=False)
-    print(f"✓ Análise de infraestrutura: {filename}")
-
-    print(f"\n🎯 Análise de carga por servidor salva em: {RESULTS_DIR}/")
-    print("🔍 Este gráfico mostra:")
-    print("   • Como a performance varia com número de servidores")
-    print("   • Otimização de recursos de infraestrutura")
-    print("   • Ponto ideal de servidores vs clientes")
-
-
-def generate_overlapped_comparison(file_py, file_go):
-    """
-    Gera gráficos 3D com superfícies sobrepostas de Python e Go
-    para comparação direta no mesmo espaço.
-    """
-    print("--- Gerando Gráficos 3D Sobrepostos Python vs Go ---")
-
-    # Carregar dados
-    try:
-        df_py = pd.read_csv(file_py)
-        df_go = pd.read_csv(file_go)
-    except FileNotFoundError as e:
-        print(f"Erro: Arquivo não encontrado: {e.filename}")
-        return
-
-    # Preparar dados
-    df_py["implementation"] = "Python"
-    df_go["implementation"] = "Go"
-    df_combined = pd.concat([df_py, df_go], ignore_index=True)
-
-    # Renomear colunas
-    df_combined.rename(
-        columns={
-            "num_servers": "servers",
-            "num_clients": "clients",
-            "num_messages": "messages",
-        },
-        inplace=True,
+    summary.set_defaults(func=cmd_summary)
+    subparsers.add_parser("3d", help="Gráficos 3D por carga de mensagens").set_defaults(
+        func=cmd_3d
     )
-
-    # Limpeza de dados
-    df_combined["response_time"] = pd.to_numeric(
-        df_combined["response_time"], errors="coerce"
+    subparsers.add_parser(
+        "server-load", help="Gráfico de infraestrutura (clientes vs servidores)"
+    ).set_defaults(func=cmd_server_load)
+    subparsers.add_parser(
+        "compare", help="Gráficos 3D sobrepostos Python vs Go"
+    ).set_defaults(func=cmd_compare)
+    timeline = subparsers.add_parser(
+        "timeline", help="Fases de cada execução e execuções sem regime estacionário"
     )
-    df_combined.dropna(subset=["response_time"], inplace=True)
-
-    # Remover outliers
-    grouped = df_combined.groupby(["servers", "clients", "messages", "implementation"])
-    df_combined["z_score"] = grouped["response_time"].transform(
-        lambda x: np.abs((x - x.mean()) / x.std()) if x.std() > 0 else 0
+    timeline.add_argument(
+        "--scenario",
+        type=int,
+        nargs=3,
+        metavar=("SERVERS", "CLIENTS", "MESSAGES"),
+        help="Grava a linha do tempo das execuções deste cenário em HTML",
     )
-    df_cleaned = df_combined[df_combined["z_score"] <= 3]
-
-    # Calcular estatísticas agregadas
-    stats = (
-        df_cleaned.groupby(["servers", "clients", "messages", "implementation"])[
-            "response_time"
-        ]
-        .agg(["mean", "std"])
-        .reset_index()
+    timeline.add_argument(
+        "--bin", type=float, default=0.1, help="Largura dos bins em segundos (padrão: 0.1)"
     )
-
-    RESULTS_DIR = "analysis_results_interactive"
-    if not os.path.exists(RESULTS_DIR):
-        os.makedirs(RESULTS_DIR)
-
-    # 1. Gráficos sobrepostos por número de mensagens
-    unique_messages = sorted(stats["messages"].unique())
-
-    for msg_count in unique_messages:
-        msg_data = stats[stats["messages"] == msg_count]
-
-        fig = go.Figure()
-
-        # Dados Python e Go
-        py_data = msg_data[msg_data["implementation"] == "Python"]
-        go_data = msg_data[msg_data["implementation"] == "Go"]
-
-        # Adicionar superfícies sobrepostas
-        if not py_data.empty:
-            _add_overlapped_surface(fig, py_data, "Python", "Blues", 0.6)
-
-        if not go_data.empty:
-            _add_overlapped_surface(fig, go_data, "Go", "Reds", 0.6)
-
-        # Layout
-        fig.update_layout(
-            title=f"Comparação Sobreposta 3D - {msg_count} Mensagem(s)<br><sub>Azul = Python | Vermelho = Go | Superfícies mais baixas = melhor performance</sub>",
-            scene=dict(
-                xaxis_title="Número de Clientes",
-                yaxis_title="Número de Servidores",
-                zaxis_title="Tempo Médio (s)",
-                camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
-            ),
-            width=1000,
-            height=700,
-            legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
-        )
-
-        filename = f"{RESULTS_DIR}/overlapped_3d_messages_{msg_count}.html"
-        plot(fig, filename=filename, auto_open=False)
-        print(f"✓ Gráfico sobreposto salvo: overlapped_3d_messages_{msg_count}.html")
-
-    # 2. Gráfico sobreposto final: clientes vs mensagens
-    final_stats = (
-        stats.groupby(["clients", "messages", "implementation"])["mean"]
-        .mean()
-        .reset_index()
+    timeline.set_defaults(func=cmd_timeline)
+    baseline = subparsers.add_parser(
+        "baseline", help="Salva os CSVs atuais como linha de base ou lista as salvas"
     )
-
-    fig = go.Figure()
-
-    py_final = final_stats[final_stats["implementation"] == "Python"]
-    go_final = final_stats[final_stats["implementation"] == "Go"]
-
-    if not py_final.empty:
-        _add_overlapped_surface_messages(fig, py_final, "Python", "Blues", 0.6)
-
-    if not go_final.empty:
-        _add_overlapped_surface_messages(fig, go_final, "Go", "Reds", 0.6)
-
-    fig.update_layout(
-        title="Comparação Sobreposta 3D - Clientes vs Mensagens<br><sub>Azul = Python | Vermelho = Go | Superfícies mais baixas = melhor performance</sub>",
-        scene=dict(
-            xaxis_title="Número de Clientes",
-            yaxis_title="Número de Mensagens",
-            zaxis_title="Tempo Médio (s)",
-            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
-        ),
-        width=1000,
-        height=700,
-        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    baseline.add_argument("action", choices=["save", "list"])
+    baseline.add_argument("name", nargs="?", help="Nome da linha de base (para save)")
+    baseline.add_argument(
+        "--dir",
+        default=DEFAULT_BASELINE_DIR,
+        help="Diretório das linhas de base (padrão: BASELINE_DIR ou baselines)",
     )
-
-    filename = f"{RESULTS_DIR}/overlapped_3d_final.html"
-    plot(fig, filename=filename, auto_open=False)
-    print(f"✓ Gráfico sobreposto final salvo: overlapped_3d_final.html")
-
-    # 3. Gráfico comparativo geral sobreposto
-    comparison_data = (
-        stats.groupby(["clients", "servers", "implementation"])["mean"]
-        .mean()
-        .reset_index()
+    baseline.add_argument(
+        "--overwrite", action="store_true", help="Substitui uma linha de base existente"
     )
-
-    fig = go.Figure()
-
-    py_comp = comparison_data[comparison_data["implementation"] == "Python"]
-    go_comp = comparison_data[comparison_data["implementation"] == "Go"]
-
-    if not py_comp.empty:
-        _add_overlapped_surface(fig, py_comp, "Python", "Blues", 0.6)
-
-    if not go_comp.empty:
-        _add_overlapped_surface(fig, go_comp, "Go", "Reds", 0.6)
-
-    fig.update_layout(
-        title="Comparação Sobreposta Geral - Clientes vs Servidores<br><sub>Azul = Python | Vermelho = Go | Superfícies mais baixas = melhor performance</sub>",
-        scene=dict(
-            xaxis_title="Número de Clientes",
-            yaxis_title="Número de Servidores",
-            zaxis_title="Tempo Médio (s)",
-            camera=dict(eye=dict(x=1.5, y=1.5, z=1.5)),
-        ),
-        width=1000,
-        height=700,
-        legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+    baseline.set_defaults(func=cmd_baseline)
+    regression = subparsers.add_parser(
+        "regression", help="Testa regressões por cenário contra uma linha de base"
     )
-
-    filename = f"{RESULTS_DIR}/overlapped_3d_general.html"
-    plot(fig, filename=filename, auto_open=False)
-    print(f"✓ Gráfico sobreposto geral salvo: overlapped_3d_general.html")
-
-    print(f"\n🎯 Gráficos sobrepostos salvos em: {RESULTS_DIR}/")
-    print("🔍 Nos gráficos sobrepostos, você pode:")
-    print("   • Ver diretamente qual implementação é mais rápida")
-    print("   • A superfície mais baixa representa melhor performance")
-    print("   • Azul = Python, Vermelho = Go")
-
-
-def _add_overlapped_surface(fig, data, name, colorscale, opacity):
-    """Adiciona superfície 3D sobreposta para clientes vs servidores"""
-    if data.empty:
-        return
-
-    x = data["clients"].values
-    y = data["servers"].values
-    # Calcular tempo total do cenário (tempo médio × número de clientes)
-    z = data["mean"].values * data["clients"].values
-
-    # Criar grid para interpolação
-    if len(x) > 3:
-        clients_range = np.linspace(x.min(), x.max(), 25)
-        servers_range = np.linspace(y.min(), y.max(), 25)
-        X, Y = np.meshgrid(clients_range, servers_range)
-
-        # Interpolar dados
-        Z = griddata((x, y), z, (X, Y), method="linear", fill_value=np.nan)
-
-        # Adicionar superfície
-        fig.add_trace(
-            go.Surface(
-                x=X,
-                y=Y,
-                z=Z,
-                colorscale=colorscale,
-                name=name,
-                opacity=opacity,
-                showscale=True,
-                colorbar=dict(
-                    title=f"{name}<br>Tempo (s)", x=0.9 if name == "Go" else 0.02
-                ),
-            )
-        )
-
-    # Adicionar pontos de dados reais
-    fig.add_trace(
-        go.Scatter3d(
-            x=x,
-            y=y,
-            z=z,
-            mode="markers",
-            marker=dict(
-                size=6, opacity=0.9, color="darkblue" if name == "Python" else "darkred"
-            ),
-            name=f"{name} (Dados)",
-            text=[
-                f"{name}<br>Clientes: {c}<br>Servidores: {s}<br>Tempo Total: {t:.4f}s"
-                for c, s, t in zip(x, y, z)
-            ],
-            hovertemplate="%{text}<extra></extra>",
-        )
+    regression.add_argument("baseline", help="Nome da linha de base de referência")
+    regression.add_argument(
+        "--candidate",
+        help="Compara outra linha de base em vez dos CSVs atuais",
     )
-
-
-def _add_overlapped_surface_messages(fig, data, name, colorscale, opacity):
-    """Adiciona superfície 3D sobreposta para clientes vs mensagens"""
-    if data.empty:
-        return
-
-    x = data["clients"].values
-    y = data["messages"].values
-    # Calcular tempo total do cenário (tempo médio × número de clientes)
-    z = data["mean"].values * data["clients"].values
-
-    # Criar grid para interpolação
-    if len(x) > 3:
-        clients_range = np.linspace(x.min(), x.max(), 25)
-        messages_range = np.linspace(y.min(), y.max(), 25)
-        X, Y = np.meshgrid(clients_range, messages_range)
-
-        Z = griddata((x, y), z, (X, Y), method="linear", fill_value=np.nan)
-
-        fig.add_trace(
-            go.Surface(
-                x=X,
-                y=Y,
-                z=Z,
-                colorscale=colorscale,
-                name=name,
-                opacity=opacity,
-                showscale=True,
-                colorbar=dict(
-                    title=f"{name}<br>Tempo (s)", x=0.9 if name == "Go" else 0.02
-                ),
-            )
-        )
-
-    # Pontos de dados reais
-    fig.add_trace(
-        go.Scatter3d(
-            x=x,
-            y=y,
-            z=z,
-            mode="markers",
-            marker=dict(
-                size=6, opacity=0.9, color="darkblue" if name == "Python" else "darkred"
-            ),
-            name=f"{name} (Dados)",
-            text=[
-                f"{name}<br>Clientes: {c}<br>Mensagens: {m}<br>Tempo Total: {t:.4f}s"
-                for c, m, t in zip(x, y, z)
-            ],
-            hovertemplate="%{text}<extra></extra>",
-        )
+    regression.add_argument(
+        "--alpha", type=float, default=0.05, help="Nível de significância (padrão: 0.05)"
     )
-
-
-if __name__ == "__main__":
-    print("🚀 Gerando análise 3D de performance...")
-    print("📊 Gráficos otimizados com nomes descritivos")
-    print("")
-
-    # Verificar se os arquivos existem
-    files = ["requests_python.csv", "requests_go.csv"]
-    for file in files:
-        if not os.path.exists(file):
-            print(f"❌ Erro: Arquivo {file} não encontrado!")
-            print("Execute primeiro o deploy.sh para gerar os dados.")
-            sys.exit(1)
-
-    # Gerar análise completa de performance
-    print("1️⃣ Gerando análise de performance por carga de mensagens...")
-    generate_performance_analysis_3d("requests_python.csv", "requests_go.csv")
-
-    print("\n2️⃣ Gerando análise de infraestrutura...")
-    generate_server_load_analysis("requests_python.csv", "requests_go.csv")
-
-    print("\n🎉 Análise 3D completa gerada com sucesso!")
-    print("📁 Verifique a pasta: analysis_results_interactive/")
-    print("\n📊 Gráficos gerados:")
-    print(
-        "   🔹 clientes_vs_servidores_Xmsgs.html - Performance por carga de mensagens"
+    regression.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="Variação mínima da mediana, em fração (padrão: 0.05 = 5%%)",
     )
-    print("   🔹 escalabilidade_clientes_vs_mensagens.html - Análise de escalabilidade")
-    print(
-        "   🔹 diferenca_performance_go_vs_python.html - APENAS diferença de performance"
+    regression.add_argument(
+        "--correction",
+        choices=["holm", "bh"],
+        default="holm",
+        help="Correção para comparações múltiplas: Holm ou Benjamini-Hochberg",
     )
-    print(
-        "   🔹 infraestrutura_clientes_vs_servidores.html - Otimização de infraestrutura"
+    regression.add_argument(
+        "--dir",
+        default=DEFAULT_BASELINE_DIR,
+        help="Diretório das linhas de base (padrão: BASELINE_DIR ou baselines)",
     )
-    print("\n🌐 Abra qualquer arquivo .html no navegador para visualizar")
+    regression.add_argument("--csv", help="Grava a comparação de todos os cenários em CSV")
+    regression.set_defaults(func=cmd_regression)
+    subparsers.add_parser(
+        "check", help="Verifica os CSVs (existência, linhas, cabeçalho) sem pandas"
+    ).set_defaults(func=cmd_check)
+    return parser
+
+
+def main(argv=None):
+    start = time.perf_counter()
+    args = build_parser().parse_args(argv)
+    status = args.func(args)
+    if args.timing:
+        total = time.perf_counter() - start
+        print(
+            f"\n⏱️  Importações: {_import_seconds * 1000:.0f}ms | "
+            f"execução: {(total - _import_seconds) * 1000:.0f}ms | "
+            f"total: {total * 1000:.0f}ms"
+        )
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
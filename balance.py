@@ -0,0 +1,112 @@
+# Balanceamento de carga entre as réplicas: sessões e mensagens por servidor
+import numpy as np
+
+from timeline import RUN_KEYS, with_iterations
+
+
+def server_load(df):
+    """
+    Sessões e mensagens atendidas por cada servidor (server_id, o hostname do
+    pod) em cada execução. Cada sessão leva `messages` mensagens.
+    """
+    df = with_iterations(df)
+    load = (
+        df.groupby(RUN_KEYS + ["server_id"], observed=True)
+        .size()
+        .rename("sessions")
+        .reset_index()
+    )
+    load["messages_served"] = load["sessions"] * load["messages"]
+    return load
+
+
+def _padded_counts(load):
+    """
+    Matriz execuções × réplicas com as sessões de cada servidor, completada
+    com zeros até o número de réplicas do cenário (servidores que não
+    receberam nenhuma sessão não aparecem no CSV).
+    """
+    runs = load.groupby(RUN_KEYS, observed=True, sort=True)
+    keys = runs.size().index.to_frame(index=False)
+    observed = runs.size().to_numpy()
+    replicas = np.maximum(keys["servers"].to_numpy(), observed)
+
+    codes = runs.ngroup().to_numpy()
+    position = runs.cumcount().to_numpy()
+    counts = np.zeros((len(keys), replicas.max()))
+    counts[codes, position] = load["sessions"].to_numpy()
+    valid = np.arange(counts.shape[1]) < replicas[:, None]
+    return keys, counts, valid, replicas, observed
+
+
+def _gini(counts, valid, replicas):
+    """Gini de cada linha considerando só as colunas válidas (vetorizado)"""
+    ordered = np.sort(np.where(valid, counts, np.inf), axis=1)
+    ordered = np.where(np.isinf(ordered), 0.0, ordered)
+    rank = np.arange(1, counts.shape[1] + 1)
+    weights = np.where(valid, 2 * rank - replicas[:, None] - 1, 0)
+    total = ordered.sum(axis=1)
+    gini = (weights * ordered).sum(axis=1) / (replicas * total)
+    return np.where(total > 0, gini, np.nan)
+
+
+def imbalance_metrics(df):
+    """
+    Uma linha por execução: RUN_KEYS, replicas, idle_servers (réplicas sem
+    sessões), sessions, max_mean (sessões do servidor mais carregado / média
+    por réplica; 1 = perfeito), gini, cv e a latência média (latency).
+    """
+    load = server_load(df)
+    keys, counts, valid, replicas, observed = _padded_counts(load)
+
+    total = counts.sum(axis=1)
+    mean = total / replicas
+    deviation = np.where(valid, counts - mean[:, None], 0.0)
+    variance = (deviation**2).sum(axis=1) / replicas
+    latency = (
+        with_iterations(df)
+        .groupby(RUN_KEYS, observed=True, sort=True)["response_time"]
+        .mean()
+        .to_numpy()
+    )
+    return keys.assign(
+        replicas=replicas,
+        idle_servers=replicas - observed,
+        sessions=total.astype("int64"),
+        max_mean=counts.max(axis=1) / mean,
+        gini=_gini(counts, valid, replicas),
+        cv=np.sqrt(variance) / mean,
+        latency=latency,
+    )
+
+
+def latency_correlation(metrics, by=("implementation", "servers")):
+    """
+    Correlação de Spearman entre desbalanceamento (max/mean) e latência por
+    grupo. A latência de cada execução é dividida pela média das execuções do
+    mesmo cenário, para comparar iterações com a mesma carga: uma correlação
+    positiva indica que as execuções mais desbalanceadas foram as mais lentas.
+    """
+    by = list(by)
+    scenario = ["servers", "clients", "messages", "implementation"]
+    relative = metrics["latency"] / metrics.groupby(scenario, observed=True)[
+        "latency"
+    ].transform("mean")
+    frame = metrics.assign(relative_latency=relative)
+
+    ranked = frame.groupby(by, observed=True)[["max_mean", "relative_latency"]].rank()
+    ranked[by] = frame[by]
+    grouped = ranked.groupby(by, observed=True)
+    correlation = grouped[["max_mean", "relative_latency"]].corr().xs(
+        "max_mean", level=-1
+    )["relative_latency"]
+
+    summary = frame.groupby(by, observed=True).agg(
+        runs=("max_mean", "size"),
+        max_mean=("max_mean", "mean"),
+        gini=("gini", "mean"),
+        cv=("cv", "mean"),
+        idle_servers=("idle_servers", "mean"),
+    )
+    summary["spearman"] = correlation
+    return summary.reset_index()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# Benchmark: leitura do CSV de resultados com inferência de tipos vs tipos explícitos
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from results_csv import COLUMNS, read_results_csv
+
+# Varredura completa do deploy.sh / afazeres.txt
+SERVERS = [2, 4, 6, 8, 10]
+CLIENTS = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+MESSAGES = [1, 10, 100, 500, 1000, 10000]
+
+
+def synthetic_csv(path, iterations, unknown_fraction, seed=0):
+    """CSV no formato do servidor: uma linha por sessão, para cada cenário e iteração"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for s in SERVERS:
+        # Nomes de pod como os do Kubernetes, um conjunto por deployment
+        pods = [
+            f"server-deployment-python-{rng.integers(16**9):09x}-{rng.integers(36**5):05x}"
+            for _ in range(s)
+        ]
+        for c in CLIENTS:
+            for m in MESSAGES:
+                rows = c * iterations
+                start = 1752850485.0 + rng.uniform(0, 3600, rows)
+                response = 0.002 * m * rng.lognormal(0.0, 0.3, rows)
+                frames.append(
+                    pd.DataFrame(
+                        {
+                            # PID 1 no container + sufixo aleatório, como o cliente gera
+                            "client_id": [
+                                f"client_1_{n}" for n in rng.integers(1000, 10000, rows)
+                            ],
+                            "message_id": np.full(rows, m),
+                            "server_id": np.asarray(pods)[rng.integers(0, s, rows)],
+                            "client_send_time": start,
+                            "server_processing_time": rng.uniform(0.001, 0.03, rows).round(6),
+                            "client_receive_time": start + response,
+                            "response_time": response.round(6),
+                            "num_servers": s,
+                            "num_clients": c,
+                            "num_messages": m,
+                        }
+                    )
+                )
+    df = pd.concat(frames, ignore_index=True)[COLUMNS].astype(object)
+
+    # Campos preenchidos com "unknown" pelo awk do deploy.sh
+    for column in ("server_processing_time", "response_time", "num_messages"):
+        mask = rng.random(len(df)) < unknown_fraction
+        df.loc[mask, column] = "unknown"
+    df.to_csv(path, index=False)
+    return len(df)
+
+
+def read_inferred(path):
+    """Leitura original das análises: tipos inferidos + to_numeric(errors="coerce")"""
+    df = pd.read_csv(path)
+    df["response_time"] = pd.to_numeric(df["response_time"], errors="coerce")
+    return df
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara tempo de parse e memória da leitura inferida e tipada"
+    )
+    parser.add_argument("--iterations", type=int, default=10, help="Execuções por cenário")
+    parser.add_argument(
+        "--unknown", type=float, default=0.001, help="Fração de células \"unknown\""
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições de cada medição")
+    parser.add_argument("--csv", help="Usar um CSV existente em vez do sintético")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.csv
+        if not path:
+            path = os.path.join(tmp, "requests.csv")
+            synthetic_csv(path, args.iterations, args.unknown)
+        size = os.path.getsize(path) / 1e6
+
+        before_time, before = best_of(lambda: read_inferred(path), args.repeat)
+        after_time, after = best_of(lambda: read_results_csv(path), args.repeat)
+
+    before_mem = before.memory_usage(deep=True).sum() / 1e6
+    after_mem = after.memory_usage(deep=True).sum() / 1e6
+    print(f"📊 CSV: {len(before):,} linhas, {size:.1f}MB")
+    print(f"🐌 Tipos inferidos: {before_time * 1000:.0f}ms | {before_mem:.1f}MB em memória")
+    print(
+        f"⚡ Tipos explícitos: {after_time * 1000:.0f}ms | {after_mem:.1f}MB em memória "
+        f"({before_time / after_time:.1f}x mais rápido, {before_mem / after_mem:.1f}x menos memória)"
+    )
+    print("\nMemória por coluna (MB):")
+    print(
+        pd.DataFrame(
+            {
+                "inferido": before.memory_usage(deep=True, index=False) / 1e6,
+                "tipado": after.memory_usage(deep=True, index=False) / 1e6,
+            }
+        ).round(2)
+    )
+
+
+if __name__ == "__main__":
+    main()
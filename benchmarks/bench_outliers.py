@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# Benchmark: filtragem de outliers com lambda vs reduções vetorizadas
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_data import SCENARIO_KEYS
+from outliers import METHODS, outlier_scores
+
+# Varredura completa do deploy.sh / afazeres.txt
+SERVERS = [2, 4, 6, 8, 10]
+CLIENTS = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+MESSAGES = [1, 10, 100, 500, 1000, 10000]
+IMPLEMENTATIONS = ["Python", "Go"]
+
+
+def synthetic_sweep(iterations, seed=0):
+    """Uma linha por cliente, para cada cenário e iteração da varredura completa"""
+    rng = np.random.default_rng(seed)
+    servers, clients, messages, implementation = [], [], [], []
+    for impl in IMPLEMENTATIONS:
+        for s in SERVERS:
+            for c in CLIENTS:
+                for m in MESSAGES:
+                    rows = c * iterations
+                    servers.append(np.full(rows, s))
+                    clients.append(np.full(rows, c))
+                    messages.append(np.full(rows, m))
+                    implementation.extend([impl] * rows)
+    df = pd.DataFrame(
+        {
+            "servers": np.concatenate(servers),
+            "clients": np.concatenate(clients),
+            "messages": np.concatenate(messages),
+            "implementation": implementation,
+        }
+    )
+    # Tempo ~ log-normal proporcional à carga, com 0,5% de picos
+    base = 0.002 * df["messages"].to_numpy() * df["clients"].to_numpy() / df["servers"].to_numpy()
+    response = base * rng.lognormal(0.0, 0.3, len(df))
+    spikes = rng.random(len(df)) < 0.005
+    response[spikes] *= rng.uniform(5, 20, spikes.sum())
+    df["response_time"] = response
+    return df
+
+
+def lambda_zscore(df):
+    """Implementação original (uma chamada Python por cenário)"""
+    grouped = df.groupby(SCENARIO_KEYS)
+    return grouped["response_time"].transform(
+        lambda x: np.abs((x - x.mean()) / x.std()) if x.std() > 0 else 0
+    )
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara a filtragem de outliers com lambda e vetorizada"
+    )
+    parser.add_argument("--iterations", type=int, default=10, help="Execuções por cenário")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições de cada medição")
+    args = parser.parse_args()
+
+    df = synthetic_sweep(args.iterations)
+    scenarios = df.groupby(SCENARIO_KEYS).ngroups
+    print(f"📊 Dataset sintético: {len(df):,} linhas, {scenarios} cenários")
+
+    baseline, expected = best_of(lambda: lambda_zscore(df), args.repeat)
+    print(f"🐌 z-score com transform(lambda): {baseline * 1000:.1f}ms")
+
+    for method in METHODS:
+        elapsed, scores = best_of(
+            lambda: outlier_scores(df, SCENARIO_KEYS, method=method), args.repeat
+        )
+        line = f"⚡ {method:<6} vetorizado: {elapsed * 1000:.1f}ms ({baseline / elapsed:.1f}x)"
+        if method == "zscore":
+            same = np.array_equal(
+                np.asarray(expected, dtype=float) <= 3, np.asarray(scores) <= 3
+            )
+            line += " | mesmas linhas removidas" if same else " | ⚠️ resultado diferente"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# Benchmark: caminho quente do protocolo (codificação, enquadramento e o laço do
+# handle_client) em socketpair e TCP local, com resultados salvos em JSON
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# client/app.py importa os módulos vizinhos (report, timing, workload...)
+sys.path.insert(0, os.path.join(ROOT, "client"))
+
+
+def _load(name, path):
+    """Os dois lados se chamam app.py: carregados com nomes distintos"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+server_app = _load("server_app", os.path.join(ROOT, "server-python", "app.py"))
+client_app = _load("client_app", os.path.join(ROOT, "client", "app.py"))
+
+TRANSPORTS = ["socketpair", "tcp"]
+PAYLOAD_SIZES = [0, 64, 1024, 16384]
+DEPTHS = [1, 8, 64]
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+# Chave que identifica uma medição entre execuções (para --compare)
+RESULT_KEYS = ["benchmark", "transport", "payload_size", "depth"]
+
+
+def connected_pair(transport):
+    """(lado do cliente, lado do servidor) conectados pelo transporte pedido"""
+    if transport == "socketpair":
+        return socket.socketpair()
+    listener = socket.create_server(("127.0.0.1", 0))
+    client = socket.create_connection(listener.getsockname())
+    server, _ = listener.accept()
+    listener.close()
+    # Como o CustomProtocolClient; o servidor não altera o Nagle
+    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return client, server
+
+
+def request(payload_size, message_id=1):
+    return client_app.ClientRequest(
+        "client_1_1234", message_id, time.time(), "x" * payload_size
+    )
+
+
+def measure(function, ops_per_call, min_time, repeat):
+    """
+    Operações por segundo: calibra o número de chamadas para durar min_time
+    e fica com a melhor de repeat medições (como best_of nos outros
+    benchmarks).
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        calls *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return calls * ops_per_call / best
+
+
+def allocation(function, samples=20):
+    """
+    Pico de memória alocada (tracemalloc) durante uma chamada, mediana de
+    samples chamadas: por operação nos codecs, por lote de depth mensagens
+    nos demais. Inclui as threads do outro lado da conexão.
+    """
+    function()  # aquecimento: caches e buffers fora da medição
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            function()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks)
+
+
+def _result(benchmark, ops_per_sec, peak, transport=None, payload_size=None, depth=None):
+    return {
+        "benchmark": benchmark,
+        "transport": transport,
+        "payload_size": payload_size,
+        "depth": depth,
+        "ops_per_sec": ops_per_sec,
+        "ns_per_op": 1e9 / ops_per_sec,
+        "peak_alloc_bytes": peak,
+    }
+
+
+def bench_codec(payload_size, args):
+    """Serialização e desserialização, sem socket"""
+    message = request(payload_size)
+    payload = message.serialize().payload
+    response = server_app.ServerResponse(
+        "server-1", 0.001, f"Processed message 1 from client_1_1234 {'x' * payload_size}"
+    )
+    response_payload = response.serialize().payload
+    functions = {
+        "ClientRequest.serialize": message.serialize,
+        "ClientRequest.deserialize": lambda: server_app.ClientRequest.deserialize(payload),
+        "ServerResponse.serialize": response.serialize,
+        "ServerResponse.deserialize": lambda: client_app.ServerResponse.deserialize(
+            response_payload
+        ),
+    }
+    return [
+        _result(
+            name,
+            measure(function, 1, args.min_time, args.repeat),
+            allocation(function),
+            payload_size=payload_size,
+        )
+        for name, function in functions.items()
+    ]
+
+
+class _Sink:
+    """
+    Outro lado do enquadramento: lê mensagens com receive_message e, a cada
+    depth mensagens, devolve um byte de confirmação. Os dados só andam num
+    sentido, então lotes maiores que o buffer do socket não travam.
+    """
+
+    def __init__(self, sock, depth):
+        self.sock = sock
+        self.depth = depth
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        received = 0
+        while server_app.receive_message(self.sock) is not None:
+            received += 1
+            if received % self.depth == 0:
+                self.sock.sendall(b"\x01")
+
+
+def bench_framing(transport, payload_size, depth, args):
+    """send_message + receive_message de depth mensagens por lote"""
+    client, server = connected_pair(transport)
+    sink = _Sink(server, depth)
+    message = request(payload_size).serialize()
+
+    def batch():
+        for _ in range(depth):
+            client_app.send_message(client, message)
+        client.recv(1)
+
+    try:
+        ops = measure(batch, depth, args.min_time, args.repeat)
+        peak = allocation(batch)
+    finally:
+        client.close()
+        sink.thread.join()
+        server.close()
+    return _result("send/receive_message", ops, peak, transport, payload_size, depth)
+
+
+class _NoSleepTime:
+    """Módulo time do servidor sem o sleep de 1ms que simula processamento"""
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    @staticmethod
+    def sleep(seconds):
+        pass
+
+
+def bench_handle_client(transport, payload_size, depth, server, args):
+    """
+    Laço do handle_client numa única sessão: o cliente envia depth requisições
+    (pipelining, como o CustomProtocolClient) e depois lê as depth respostas.
+    """
+    client, server_side = connected_pair(transport)
+    thread = threading.Thread(
+        target=server.handle_client, args=(server_side, ("bench", 0)), daemon=True
+    )
+    thread.start()
+    message = request(payload_size).serialize()
+
+    def batch():
+        for _ in range(depth):
+            client_app.send_message(client, message)
+        for _ in range(depth):
+            client_app.receive_message(client)
+
+    try:
+        ops = measure(batch, depth, args.min_time, args.repeat)
+        peak = allocation(batch)
+    finally:
+        client_app.send_message(
+            client, client_app.ProtocolMessage(client_app.MSG_CLOSE_CONNECTION, b"")
+        )
+        thread.join()
+        client.close()
+    return _result("handle_client", ops, peak, transport, payload_size, depth)
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _label(result):
+    parts = [result["benchmark"]]
+    if result["transport"]:
+        parts.append(result["transport"])
+    parts.append(f"{result['payload_size']}B")
+    if result["depth"]:
+        parts.append(f"depth={result['depth']}")
+    return " ".join(parts)
+
+
+def _key(result):
+    return tuple(result[key] for key in RESULT_KEYS)
+
+
+def print_results(results, previous=None):
+    previous = {_key(result): result for result in previous or []}
+    for result in results:
+        line = (
+            f"{_label(result):<52} {result['ops_per_sec']:>12,.0f} ops/s "
+            f"{result['peak_alloc_bytes']:>10,.0f} B pico"
+        )
+        before = previous.get(_key(result))
+        if before:
+            ratio = result["ops_per_sec"] / before["ops_per_sec"]
+            icon = "⚡" if ratio >= 1.05 else "🐌" if ratio <= 0.95 else "  "
+            line += f" {icon} {ratio:.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede ops/s e alocações do caminho quente do protocolo"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=PAYLOAD_SIZES, help="Bytes no campo data"
+    )
+    parser.add_argument(
+        "--depths", type=int, nargs="+", default=DEPTHS, help="Mensagens por lote"
+    )
+    parser.add_argument(
+        "--transports", nargs="+", choices=TRANSPORTS, default=TRANSPORTS
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.1, help="Duração mínima de cada medição (s)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições de cada medição")
+    parser.add_argument(
+        "--simulated-work",
+        action="store_true",
+        help="Mantém o sleep de 1ms por mensagem do handle_client",
+    )
+    parser.add_argument("--output", help="Arquivo JSON (padrão: benchmarks/results/)")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        results.extend(bench_codec(size, args))
+    for transport in args.transports:
+        for size in args.sizes:
+            for depth in args.depths:
+                results.append(bench_framing(transport, size, depth, args))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CSV_FILE"] = os.path.join(tmp, "requests.csv")
+        server = server_app.CustomProtocolServer()
+        server.running = True
+        if not args.simulated_work:
+            server_app.time = _NoSleepTime()
+        # O print por mensagem do servidor é custo real do laço, mas vai
+        # para /dev/null em vez de poluir a saída
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for transport in args.transports:
+                for size in args.sizes:
+                    for depth in args.depths:
+                        results.append(
+                            bench_handle_client(transport, size, depth, server, args)
+                        )
+        server_app.time = time
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)["results"]
+    print_results(results, previous)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, time.strftime("protocol-%Y%m%d-%H%M%S.json")
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "timestamp": time.time(),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "simulated_work": args.simulated_work,
+                "min_time": args.min_time,
+                "repeat": args.repeat,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"\n💾 Resultados salvos em {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# Percentis de cauda e intervalos de confiança por bootstrap, por grupo
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# Percentis reportados (nome da coluna -> quantil)
+PERCENTILES = {"p90": 0.90, "p95": 0.95, "p99": 0.99, "p99_9": 0.999}
+PERCENTILE_LABELS = {"p90": "p90", "p95": "p95", "p99": "p99", "p99_9": "p99.9"}
+
+# Estatísticas com intervalo de confiança nas tabelas de cenário
+CI_STATISTICS = ("mean", "p95", "p99")
+DEFAULT_RESAMPLES = 1000
+DEFAULT_CONFIDENCE = 0.95
+# Limite de amostras reamostradas em memória por lote (grupos × reamostras × n)
+MAX_BATCH = 4_000_000
+
+
+def percentile_table(df, by, column="response_time"):
+    """p90/p95/p99/p99.9 de cada grupo (uma única chamada de quantile no groupby)"""
+    quantiles = df.groupby(by, observed=True)[column].quantile(list(PERCENTILES.values()))
+    table = quantiles.unstack()
+    table.columns = list(PERCENTILES)
+    return table
+
+
+def _statistics(samples, names):
+    """Estatísticas ao longo do último eixo (amostras de cada reamostragem)"""
+    result = {}
+    if "mean" in names:
+        result["mean"] = samples.mean(axis=-1)
+    percentiles = [name for name in names if name != "mean"]
+    if percentiles:
+        # Um único np.quantile: a partição é feita uma vez para todos os percentis
+        values = np.quantile(samples, [PERCENTILES[name] for name in percentiles], axis=-1)
+        result.update(zip(percentiles, values))
+    return result
+
+
+def _group_rng(seed, key):
+    """
+    Gerador próprio de um grupo, semeado pela chave: o IC de um cenário não
+    depende de quais outros grupos estão no mesmo DataFrame (atualização
+    incremental vs. recálculo completo)
+    """
+    key = key if isinstance(key, tuple) else (key,)
+    text = "\0".join(str(value) for value in key).encode("utf-8")
+    entropy = int.from_bytes(hashlib.sha256(text).digest()[:8], "little")
+    return np.random.default_rng([seed, entropy])
+
+
+def bootstrap_ci(
+    df,
+    by,
+    column="response_time",
+    statistics=CI_STATISTICS,
+    resamples=DEFAULT_RESAMPLES,
+    confidence=DEFAULT_CONFIDENCE,
+    seed=0,
+):
+    """
+    Intervalo de confiança (bootstrap percentil) de cada estatística por grupo.
+    Grupos com o mesmo número de amostras são reamostrados juntos num único
+    tensor (grupos, reamostras, n) de índices aleatórios, em lotes de até
+    MAX_BATCH valores; não há laço Python por reamostragem. Os índices de
+    cada grupo vêm do seu próprio gerador (_group_rng), então o resultado
+    de um grupo é o mesmo com quaisquer outros grupos em df.
+    Retorna colunas "<estatística>_ci_low" e "<estatística>_ci_high".
+    """
+    grouped = df.groupby(by, observed=True, sort=True)[column]
+    codes = grouped.ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+    values = df[column].to_numpy(dtype="float64")[order]
+    sizes = np.bincount(codes)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    keys = grouped.size().index
+    alpha = (1 - confidence) / 2
+    bounds = {name: np.full((len(sizes), 2), np.nan) for name in statistics}
+
+    for n in np.unique(sizes):
+        if n < 2:
+            continue  # Sem variação possível: IC indefinido
+        groups = np.flatnonzero(sizes == n)
+        matrix = values[starts[groups][:, None] + np.arange(n)]
+        generators = [_group_rng(seed, keys[group]) for group in groups]
+
+        # Lotes de grupos e de reamostras que caibam em MAX_BATCH valores
+        resample_batch = int(min(resamples, max(1, MAX_BATCH // n)))
+        group_batch = int(max(1, MAX_BATCH // (resample_batch * n)))
+        for g0 in range(0, len(groups), group_batch):
+            block = matrix[g0 : g0 + group_batch]
+            rows = np.arange(len(block))[:, None, None]
+            block_generators = generators[g0 : g0 + group_batch]
+            estimates = {name: [] for name in statistics}
+            for r0 in range(0, resamples, resample_batch):
+                count = min(resample_batch, resamples - r0)
+                indices = np.stack(
+                    [rng.integers(0, n, size=(count, n)) for rng in block_generators]
+                )
+                samples = block[rows, indices]
+                for name, estimate in _statistics(samples, statistics).items():
+                    estimates[name].append(estimate)
+            for name in statistics:
+                estimate = np.concatenate(estimates[name], axis=1)
+                bounds[name][groups[g0 : g0 + group_batch]] = np.quantile(
+                    estimate, [alpha, 1 - alpha], axis=1
+                ).T
+
+    columns = {}
+    for name in statistics:
+        columns[f"{name}_ci_low"] = bounds[name][:, 0]
+        columns[f"{name}_ci_high"] = bounds[name][:, 1]
+    return pd.DataFrame(columns, index=keys)
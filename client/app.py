@@ -5,13 +5,42 @@ import random
 import struct
 import json
 import sys
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from report import build_report, emit_report
+from timing import (
+    PHASE_MESSAGE,
+    PHASE_TTFB,
+    WINDOW_COOLDOWN,
+    WINDOW_LABELS,
+    WINDOW_MEASURED,
+    WINDOW_WARMUP,
+    MeasurementWindow,
+    Sample,
+    TimingRecorder,
+    summarize,
+    tag_connection_timings,
+)
+from tracefile import TraceRecorder, read_trace
+from workload import PayloadBuffer, load_workload_spec, workload_from_env
+
 # Protocol constants
 MAGIC_NUMBER = 0x12345678
 MSG_CLIENT_REQUEST = 1
 MSG_SERVER_RESPONSE = 2
 MSG_CLOSE_CONNECTION = 4
+MSG_SESSION_OPEN = 5
+
+# Scenario tags sent in-band at the start of every connection, so servers can
+# log them without reading (and being restarted for) environment variables
+SESSION_TAG_ENV = {
+    "servers": "NUM_SERVERS",
+    "clients": "NUM_CLIENTES",
+    "messages": "NUM_MENSAGENS",
+    "iteration": "ITERATION",
+    "run_id": "RUN_ID",
+}
 
 
 class ProtocolMessage:
@@ -51,12 +80,31 @@ class ServerResponse:
         return cls(data["server_id"], data["processing_time"], data.get("data", ""))
 
 
-def send_message(sock, message):
+def session_tags_from_env():
+    """Scenario tags available in the environment, or None if there are none"""
+    tags = {}
+    for name, variable in SESSION_TAG_ENV.items():
+        value = os.getenv(variable)
+        if value:
+            tags[name] = value if name == "run_id" else int(value)
+    return tags or None
+
+
+def session_open_message(tags):
+    return ProtocolMessage(MSG_SESSION_OPEN, json.dumps(tags).encode("utf-8"))
+
+
+def encode_message(message):
     # Pack header: magic (4 bytes), type (4 bytes), length (4 bytes)
     header = struct.pack(
         "!III", message.magic, message.msg_type, message.payload_length
     )
-    sock.sendall(header + message.payload)
+    return header + message.payload
+
+
+def send_message(sock, message, prefix=b""):
+    # prefix: frames already encoded that must go out in the same write
+    sock.sendall(prefix + encode_message(message))
 
 
 def receive_message(sock):
@@ -88,39 +136,95 @@ def receive_message(sock):
 
 
 class CustomProtocolClient:
-    def __init__(self, server_host, server_port=5000):
+    def __init__(
+        self, server_host, server_port=5000, trace_recorder=None, session_tags=None
+    ):
         self.server_host = server_host
         self.server_port = server_port
         self.client_id = self.generate_client_id()
+        self.trace_recorder = trace_recorder
+        self.session_tags = session_tags
 
     def generate_client_id(self, suffix=""):
         """Generate unique client ID"""
         base_id = f"client_{os.getpid()}_{random.randint(1000, 9999)}"
         return f"{base_id}_{suffix}" if suffix else base_id
 
+    def open_connection(self, timeout, nodelay=False):
+        """Resolve the server name and connect, timing each step separately"""
+        dns_start = time.perf_counter()
+        family, socktype, proto, _, sockaddr = socket.getaddrinfo(
+            self.server_host, self.server_port, socket.AF_INET, socket.SOCK_STREAM
+        )[0]
+        dns_end = time.perf_counter()
+
+        client_socket = socket.socket(family, socktype, proto)
+        client_socket.settimeout(timeout)
+        if nodelay:
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        try:
+            client_socket.connect(sockaddr)
+            connect_end = time.perf_counter()
+        except Exception:
+            client_socket.close()
+            raise
+
+        return client_socket, {
+            "dns": dns_end - dns_start,
+            "connect": connect_end - dns_end,
+        }
+
+    def session_prefix(self):
+        """
+        Encoded SESSION_OPEN frame, sent in the same write as the first request:
+        on its own it would be a small segment that Nagle's algorithm and
+        delayed ACKs can hold the request behind (traditional mode keeps Nagle)
+        """
+        if not self.session_tags:
+            return b""
+        return encode_message(session_open_message(self.session_tags))
+
+    def new_trace_connection(self):
+        """Allocate a trace connection id when recording is enabled"""
+        if self.trace_recorder:
+            return self.trace_recorder.new_connection()
+        return None
+
+    def trace_send(self, client_id, request, connection):
+        """Record a request in the trace when recording is enabled"""
+        if self.trace_recorder:
+            self.trace_recorder.record(client_id, len(request.data), connection)
+
+    @staticmethod
+    def wait_first_byte(client_socket):
+        """Block until the first response byte is available, without consuming it"""
+        client_socket.recv(1, socket.MSG_PEEK)
+        return time.perf_counter()
+
     def send_messages_with_pipelining(
-        self, message_ids, message_contents, custom_client_id=None
+        self, message_ids, message_contents, custom_client_id=None, think_times=None
     ):
         """Send multiple messages using TCP pipelining"""
+        client_socket = None
         try:
             # Use custom client_id if provided, otherwise use default
             client_id = custom_client_id if custom_client_id else self.client_id
-            # Create single TCP connection
-            client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            client_socket.settimeout(60)  # Longer timeout for pipelining
-
-            # Enable TCP_NODELAY to reduce latency in pipelining
-            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
             start_time = time.time()
 
-            # Connect to server
-            client_socket.connect((self.server_host, self.server_port))
+            # Resolve and connect (longer timeout and TCP_NODELAY for pipelining)
+            client_socket, timings = self.open_connection(60, nodelay=True)
+            connection = self.new_trace_connection()
 
             # Phase 1: Send all requests without waiting for responses (PIPELINING)
             print(f"📤 Enviando {len(message_ids)} mensagens via TCP pipelining...")
 
+            send_times = []
+            prefix = self.session_prefix()
             for i, message_id in enumerate(message_ids):
+                if think_times and think_times[i]:
+                    time.sleep(think_times[i])
                 request = ClientRequest(
                     client_id,
                     message_id,
@@ -131,7 +235,10 @@ class CustomProtocolClient:
                         else f"Message {message_id}"
                     ),
                 )
-                send_message(client_socket, request.serialize())
+                self.trace_send(client_id, request, connection)
+                send_times.append(time.perf_counter())
+                send_message(client_socket, request.serialize(), prefix)
+                prefix = b""
 
             pipeline_send_time = time.time()
             print(
@@ -141,9 +248,30 @@ class CustomProtocolClient:
             # Phase 2: Receive all responses
             print(f"📥 Recebendo respostas...")
             results = []
+            message_latencies = []
+
+            # A stalled connection fails the messages still unanswered; the
+            # batch keeps its connection timings instead of being dropped
+            stalled = False
+            try:
+                first_byte_time = self.wait_first_byte(client_socket)
+                timings[PHASE_TTFB] = first_byte_time - send_times[0]
+            except socket.timeout:
+                print("⏰ Timeout aguardando a primeira resposta")
+                stalled = True
 
-            for message_id in message_ids:
-                response_msg = receive_message(client_socket)
+            for i, message_id in enumerate(message_ids):
+                response_msg = None if stalled else receive_message(client_socket)
+                receive_time = time.perf_counter()
+                # Past a failed read the stream is closed or out of sync
+                stalled = response_msg is None
+
+                # The first response is already accounted for as TTFB, unless
+                # it is the only one (as in replay and request/response)
+                if (i > 0 or len(message_ids) == 1) and response_msg:
+                    message_latencies.append(
+                        Sample(receive_time - send_times[i], message_id, send_times[i])
+                    )
 
                 if response_msg and response_msg.msg_type == MSG_SERVER_RESPONSE:
                     response = ServerResponse.deserialize(response_msg.payload)
@@ -165,6 +293,8 @@ class CustomProtocolClient:
                     )
 
             end_time = time.time()
+            timings[PHASE_MESSAGE] = message_latencies
+            tag_connection_timings(timings, message_ids[0], send_times[0])
 
             # Send close connection message
             close_msg = ProtocolMessage(MSG_CLOSE_CONNECTION, b"")
@@ -183,30 +313,30 @@ class CustomProtocolClient:
                 "total_time": total_time,
                 "pipeline_send_time": pipeline_advantage,
                 "successful_count": len([r for r in results if "error" not in r]),
+                "timings": timings,
             }
 
         except Exception as e:
             print(f"❌ Erro no TCP pipelining: {e}")
             return None
         finally:
-            try:
+            if client_socket:
                 client_socket.close()
-            except:
-                pass
 
     def send_message_to_server(
-        self, message_id, message_content="Hello from custom protocol"
+        self, message_id, message_content="Hello from custom protocol", think_time=0
     ):
         """Send a single message to server using custom protocol (fallback method)"""
+        client_socket = None
         try:
-            # Create TCP connection
-            client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            client_socket.settimeout(30)  # 30 second timeout
+            if think_time:
+                time.sleep(think_time)
 
             start_time = time.time()
 
-            # Connect to server
-            client_socket.connect((self.server_host, self.server_port))
+            # Resolve and connect (30 second timeout)
+            client_socket, timings = self.open_connection(30)
+            connection = self.new_trace_connection()
 
             # Create client request
             request = ClientRequest(
@@ -214,14 +344,24 @@ class CustomProtocolClient:
             )
 
             # Send request
-            send_message(client_socket, request.serialize())
+            self.trace_send(self.client_id, request, connection)
+            send_time = time.perf_counter()
+            send_message(client_socket, request.serialize(), self.session_prefix())
 
             # Receive response
+            first_byte_time = self.wait_first_byte(client_socket)
             response_msg = receive_message(client_socket)
+            receive_time = time.perf_counter()
 
             end_time = time.time()
 
             if response_msg:
+                timings[PHASE_TTFB] = first_byte_time - send_time
+                timings[PHASE_MESSAGE] = Sample(
+                    receive_time - send_time, message_id, send_time
+                )
+                tag_connection_timings(timings, message_id, send_time)
+
                 response = ServerResponse.deserialize(response_msg.payload)
 
                 # Send close connection message
@@ -234,6 +374,7 @@ class CustomProtocolClient:
                     "server_id": response.server_id,
                     "server_processing_time": response.processing_time,
                     "response_data": response.data,
+                    "timings": timings,
                 }
             else:
                 return None
@@ -242,134 +383,423 @@ class CustomProtocolClient:
             print(f"❌ Erro enviando mensagem {message_id}: {e}")
             return None
         finally:
-            try:
+            if client_socket:
                 client_socket.close()
-            except:
-                pass
+
+
+def run_pipelined_phase(client, messages, timing_recorder):
+    """Send a phase's pipelined messages over a single connection"""
+    print(f"🔄 Usando TCP Pipelining simples para {len(messages)} mensagens")
+
+    message_ids = [message_id for message_id, _, _ in messages]
+    message_contents = [payload for _, payload, _ in messages]
+    think_times = [think_time for _, _, think_time in messages]
+
+    result = client.send_messages_with_pipelining(
+        message_ids, message_contents, think_times=think_times
+    )
+
+    if not result:
+        print("❌ Falha no TCP Pipelining")
+        return {"successful": 0, "failed": len(messages), "send_time": 0.0}
+
+    timing_recorder.add_timings(result["timings"])
+    return {
+        "successful": result["successful_count"],
+        "failed": len(messages) - result["successful_count"],
+        "send_time": result["pipeline_send_time"],
+    }
+
+
+def run_request_response_phase(client, messages, max_workers, timing_recorder):
+    """Send a phase's request/response messages, one connection per message"""
+    print(f"🔄 Usando abordagem tradicional (uma conexão por mensagem)")
+
+    successful_requests = 0
+    failed_requests = 0
+    response_times = []
+
+    # Send messages using thread pool
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Submit all tasks
+        future_to_message = {
+            executor.submit(
+                client.send_message_to_server, message_id, payload, think_time
+            ): message_id
+            for message_id, payload, think_time in messages
+        }
+
+        # Process completed tasks
+        for future in as_completed(future_to_message):
+            message_id = future_to_message[future]
+
+            try:
+                result = future.result()
+                if result:
+                    successful_requests += 1
+                    response_time = result["response_time"]
+                    response_times.append(
+                        result["timings"][PHASE_MESSAGE]._replace(value=response_time)
+                    )
+                    timing_recorder.add_timings(result["timings"])
+
+                    print(
+                        f"✅ Mensagem {message_id}: {response_time:.3f}s "
+                        f"(Server: {result['server_id']}, "
+                        f"Processing: {result['server_processing_time']:.3f}s)"
+                    )
+                else:
+                    failed_requests += 1
+                    print(f"❌ Mensagem {message_id}: Falhou")
+
+            except Exception as e:
+                failed_requests += 1
+                print(f"❌ Mensagem {message_id}: Exceção - {e}")
+
+    return {
+        "successful": successful_requests,
+        "failed": failed_requests,
+        "response_times": response_times,
+    }
+
+
+def print_window_summaries(recorders, window):
+    """Print measured timings, then the excluded warm-up/cool-down windows"""
+    recorders[WINDOW_MEASURED].print_summary()
+    if window.enabled:
+        for name in (WINDOW_WARMUP, WINDOW_COOLDOWN):
+            recorders[name].print_summary(f"⏱️  {WINDOW_LABELS[name]}:")
+
+
+def replay_connection(client, events, payloads, message_ids, replay_start, speed):
+    """
+    Replay one recorded connection, keeping the original send schedule.
+    message_ids: position of each event in the whole trace, so message-count
+    warm-up/cool-down windows apply as in a live run
+    """
+    client_socket = None
+    send_times = []
+    lags = []
+    result = {
+        "timings": {},
+        "lags": lags,
+        "server_ids": [],
+        "successful": 0,
+        "failed": len(events),
+    }
+
+    def scheduled_time(event):
+        return replay_start + event.send_time / speed
+
+    def send_all():
+        try:
+            prefix = client.session_prefix()
+            for event, payload in zip(events, payloads):
+                delay = scheduled_time(event) - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                request = ClientRequest(
+                    event.client_id, len(send_times) + 1, time.time(), payload
+                )
+                send_times.append(time.perf_counter())
+                lags.append(send_times[-1] - scheduled_time(event))
+                send_message(client_socket, request.serialize(), prefix)
+                prefix = b""
+        except OSError as e:
+            print(f"❌ Erro enviando mensagens do trace: {e}")
+            # Unblock the receiving side
+            client_socket.shutdown(socket.SHUT_RDWR)
+
+    try:
+        delay = scheduled_time(events[0]) - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        client_socket, timings = client.open_connection(60, nodelay=True)
+        result["timings"] = timings
+
+        # Multi-message connections send and receive concurrently, like pipelining
+        sender = threading.Thread(target=send_all, daemon=True)
+        sender.start()
+
+        message_latencies = []
+        failed = 0
+        for i in range(len(events)):
+            if i == 0:
+                first_byte_time = client.wait_first_byte(client_socket)
+            response_msg = receive_message(client_socket)
+            receive_time = time.perf_counter()
+
+            if not response_msg or response_msg.msg_type != MSG_SERVER_RESPONSE:
+                # Past a failed read the stream is closed or out of sync: the
+                # remaining messages fail at once instead of each timing out
+                failed += len(events) - i
+                break
+
+            if i == 0:
+                timings[PHASE_TTFB] = first_byte_time - send_times[0]
+            if i > 0 or len(events) == 1:
+                message_latencies.append(
+                    Sample(receive_time - send_times[i], message_ids[i], send_times[i])
+                )
+            response = ServerResponse.deserialize(response_msg.payload)
+            result["server_ids"].append(response.server_id)
+
+        sender.join()
+        timings[PHASE_MESSAGE] = message_latencies
+        tag_connection_timings(timings, message_ids[0], send_times[0])
+        result["successful"] = len(events) - failed
+        result["failed"] = failed
+
+        send_message(client_socket, ProtocolMessage(MSG_CLOSE_CONNECTION, b""))
+    except Exception as e:
+        print(f"❌ Erro no replay da conexão: {e}")
+    finally:
+        if client_socket:
+            client_socket.close()
+
+    return result
+
+
+def run_replay(client, trace_path, speed, max_workers):
+    """Replay a recorded trace at its original pace, scaled by `speed`"""
+    events = read_trace(trace_path)
+    if not events:
+        print(f"❌ Trace vazio: {trace_path}")
+        return
+
+    connections = {}
+    message_ids = {}
+    for position, event in enumerate(events, start=1):
+        connections.setdefault(event.connection, []).append(event)
+        message_ids.setdefault(event.connection, []).append(position)
+
+    # Same filler for every run, so both servers receive identical bytes
+    payload_buffer = PayloadBuffer(random.Random(0))
+    payloads = {
+        connection: [payload_buffer.get(event.payload_size) for event in conn_events]
+        for connection, conn_events in connections.items()
+    }
+
+    duration = events[-1].send_time / speed
+    print(f"🔁 Reproduzindo trace: {trace_path}")
+    print(
+        f"📊 {len(events)} mensagens em {len(connections)} conexões | "
+        f"velocidade {speed:g}x | duração prevista {duration:.3f}s"
+    )
+
+    timing_recorder = TimingRecorder()
+    lags = []
+    server_counts = {}
+    successful_requests = 0
+    failed_requests = 0
+
+    window = MeasurementWindow.from_env()
+    replay_start = time.perf_counter() + 0.1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                replay_connection,
+                client,
+                conn_events,
+                payloads[connection],
+                message_ids[connection],
+                replay_start,
+                speed,
+            )
+            for connection, conn_events in sorted(
+                connections.items(), key=lambda item: item[1][0].send_time
+            )
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            timing_recorder.add_timings(result["timings"])
+            lags.extend(result["lags"])
+            successful_requests += result["successful"]
+            failed_requests += result["failed"]
+            for server_id in result["server_ids"]:
+                server_counts[server_id] = server_counts.get(server_id, 0) + 1
+
+    replay_end = time.perf_counter()
+    total_time = replay_end - replay_start
+    recorders = timing_recorder.split(window, len(events), replay_start, replay_end)
+
+    print("\n" + "=" * 60)
+    print("📊 RELATÓRIO FINAL - REPLAY DE TRACE")
+    print("=" * 60)
+    print(f"⏱️  Tempo total de execução: {total_time:.3f} segundos")
+    print(f"✅ Requisições bem-sucedidas: {successful_requests}")
+    print(f"❌ Requisições falharam: {failed_requests}")
+    print(f"📊 Throughput: {successful_requests/total_time:.2f} mensagens/segundo")
+    lag_stats = summarize(lags)
+    if lag_stats["count"]:
+        print(
+            f"🕒 Atraso em relação ao agendamento: média {lag_stats['mean'] * 1000:.3f}ms | "
+            f"max {lag_stats['max'] * 1000:.3f}ms"
+        )
+    for server_id, count in sorted(server_counts.items()):
+        print(f"🖥️  {server_id}: {count} mensagens")
+    print_window_summaries(recorders, window)
+
+    emit_report(
+        build_report(
+            client.client_id,
+            {
+                "sent": len(events),
+                "successful": successful_requests,
+                "failed": failed_requests,
+            },
+            {"total_time": total_time, "speed": speed},
+            recorders,
+            window,
+        )
+    )
 
 
 def run_client():
     # Get environment variables
     server_host = os.getenv("SERVER_HOST", "server-python-service")
-    num_messages = int(os.getenv("NUM_MENSAGENS", "5"))
-    use_pipelining = os.getenv("USE_PIPELINING", "true").lower() == "true"
-    max_workers = int(os.getenv("MAX_WORKERS", "10"))
-    pipeline_batch_size = int(
-        os.getenv("PIPELINE_BATCH_SIZE", "10")
-    )  # Mensagens por thread
+    server_port = int(os.getenv("SERVER_PORT", "5000"))
+    workload_spec_path = os.getenv("WORKLOAD_SPEC")
+    trace_record_path = os.getenv("TRACE_RECORD")
+    trace_replay_path = os.getenv("TRACE_REPLAY")
+
+    if trace_replay_path:
+        client = CustomProtocolClient(
+            server_host, server_port, session_tags=session_tags_from_env()
+        )
+        run_replay(
+            client,
+            trace_replay_path,
+            float(os.getenv("TRACE_SPEED", "1.0")),
+            int(os.getenv("REPLAY_MAX_WORKERS", "100")),
+        )
+        print(f"🏁 Cliente finalizado com sucesso!")
+        return
+
+    try:
+        if workload_spec_path:
+            workload = load_workload_spec(workload_spec_path)
+        else:
+            workload = workload_from_env()
+    except (OSError, ValueError) as e:
+        print(f"❌ Especificação de carga inválida: {e}")
+        sys.exit(1)
 
     print(f"🚀 Iniciando cliente de protocolo customizado")
-    print(f"📡 Servidor: {server_host}:5000")
-    print(f"📊 Número de mensagens: {num_messages}")
-    print(f"⚡ TCP Pipelining: {'ATIVADO' if use_pipelining else 'DESATIVADO'}")
-    print(f"🧵 Workers: {max_workers}")
-    if use_pipelining:
-        print(f"📦 Batch size por thread: {pipeline_batch_size}")
+    print(f"📡 Servidor: {server_host}:{server_port}")
+    if workload_spec_path:
+        print(f"📋 Especificação de carga: {workload_spec_path}")
+    print(f"📊 Número de mensagens: {workload.total_messages}")
+    window = workload.window or MeasurementWindow.from_env()
+    print(f"🌡️  Janelas de aquecimento/encerramento: {window.describe()}")
+    for phase in workload.phases:
+        print(
+            f"   • Fase '{phase.name}': {phase.messages} mensagens | "
+            f"pipelining {phase.pipelined_fraction * 100:.0f}% | "
+            f"🧵 Workers: {phase.max_workers}"
+        )
     print("-" * 60)
 
-    client = CustomProtocolClient(server_host)
+    # Generate every payload before sending any traffic
+    workload.prepare()
 
-    # Track timing
-    overall_start = time.time()
+    trace_recorder = TraceRecorder(trace_record_path) if trace_record_path else None
+    if trace_recorder:
+        print(f"🎙️  Gravando trace em: {trace_record_path}")
 
-    if use_pipelining and num_messages > 1:
-        # Always use simple TCP Pipelining for all messages in a single connection
-        print(f"🔄 Usando TCP Pipelining simples para {num_messages} mensagens")
+    client = CustomProtocolClient(
+        server_host,
+        server_port,
+        trace_recorder=trace_recorder,
+        session_tags=session_tags_from_env(),
+    )
+    timing_recorder = TimingRecorder()
 
-        message_ids = list(range(1, num_messages + 1))
-        message_contents = [f"Message {i}" for i in message_ids]
+    successful_requests = 0
+    failed_requests = 0
+    pipeline_send_time = 0.0
+    response_times = []
 
-        result = client.send_messages_with_pipelining(message_ids, message_contents)
+    # Track timing
+    overall_start = time.time()
+    run_start = time.perf_counter()
 
-        overall_end = time.time()
-        total_time = overall_end - overall_start
+    for phase in workload.phases:
+        print(f"▶️  Fase '{phase.name}'")
+        pipelined, request_response = phase.split()
 
-        if result:
-            successful_requests = result["successful_count"]
-            failed_requests = num_messages - successful_requests
+        if pipelined:
+            phase_result = run_pipelined_phase(client, pipelined, timing_recorder)
+            successful_requests += phase_result["successful"]
+            failed_requests += phase_result["failed"]
+            pipeline_send_time += phase_result["send_time"]
 
-            print("\n" + "=" * 60)
-            print("📊 RELATÓRIO FINAL - TCP PIPELINING SIMPLES")
-            print("=" * 60)
-            print(f"⏱️  Tempo total de execução: {total_time:.3f} segundos")
-            print(
-                f"📤 Tempo para enviar todas as mensagens: {result['pipeline_send_time']:.3f}s"
+        if request_response:
+            phase_result = run_request_response_phase(
+                client, request_response, phase.max_workers, timing_recorder
             )
-            print(f"✅ Requisições bem-sucedidas: {successful_requests}")
-            print(f"❌ Requisições falharam: {failed_requests}")
-            print(f"📈 Taxa de sucesso: {successful_requests/num_messages*100:.1f}%")
-            print(
-                f"📊 Throughput: {successful_requests/total_time:.2f} mensagens/segundo"
-            )
-            print(
-                f"⚡ Taxa de envio: {successful_requests/result['pipeline_send_time']:.2f} msg/s"
-            )
-        else:
-            print("❌ Falha no TCP Pipelining")
-
-    else:
-        # Use traditional approach or single message
-        print(f"🔄 Usando abordagem tradicional (uma conexão por mensagem)")
-
-        successful_requests = 0
-        failed_requests = 0
-        response_times = []
-
-        # Send messages using thread pool
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_message = {
-                executor.submit(client.send_message_to_server, i, f"Message {i}"): i
-                for i in range(1, num_messages + 1)
-            }
-
-            # Process completed tasks
-            for future in as_completed(future_to_message):
-                message_id = future_to_message[future]
-
-                try:
-                    result = future.result()
-                    if result:
-                        successful_requests += 1
-                        response_time = result["response_time"]
-                        response_times.append(response_time)
-
-                        print(
-                            f"✅ Mensagem {message_id}: {response_time:.3f}s "
-                            f"(Server: {result['server_id']}, "
-                            f"Processing: {result['server_processing_time']:.3f}s)"
-                        )
-                    else:
-                        failed_requests += 1
-                        print(f"❌ Mensagem {message_id}: Falhou")
-
-                except Exception as e:
-                    failed_requests += 1
-                    print(f"❌ Mensagem {message_id}: Exceção - {e}")
-
-        overall_end = time.time()
-        total_time = overall_end - overall_start
-
-        print("\n" + "=" * 60)
-        print("📊 RELATÓRIO FINAL - ABORDAGEM TRADICIONAL")
-        print("=" * 60)
-        print(f"⏱️  Tempo total de execução: {total_time:.3f} segundos")
-        print(f"🧵 Threads utilizadas: {max_workers}")
-        print(f"✅ Requisições bem-sucedidas: {successful_requests}")
-        print(f"❌ Requisições falharam: {failed_requests}")
+            successful_requests += phase_result["successful"]
+            failed_requests += phase_result["failed"]
+            response_times.extend(phase_result["response_times"])
+
+    overall_end = time.time()
+    run_end = time.perf_counter()
+    total_time = overall_end - overall_start
+    total_requests = successful_requests + failed_requests
+
+    # Warm-up and cool-down traffic is sent but kept out of the statistics
+    recorders = timing_recorder.split(
+        window, workload.total_messages, run_start, run_end
+    )
+    measured_response_times = [
+        sample.value
+        for sample in response_times
+        if window.classify(sample, workload.total_messages, run_start, run_end)
+        == WINDOW_MEASURED
+    ]
+
+    if trace_recorder:
+        trace_recorder.close()
+
+    print("\n" + "=" * 60)
+    print("📊 RELATÓRIO FINAL")
+    print("=" * 60)
+    print(f"⏱️  Tempo total de execução: {total_time:.3f} segundos")
+    if pipeline_send_time > 0:
+        print(f"📤 Tempo para enviar todas as mensagens: {pipeline_send_time:.3f}s")
+    print(f"✅ Requisições bem-sucedidas: {successful_requests}")
+    print(f"❌ Requisições falharam: {failed_requests}")
+    if total_requests:
+        print(f"📈 Taxa de sucesso: {successful_requests/total_requests*100:.1f}%")
+
+    if measured_response_times:
         print(
-            f"📈 Taxa de sucesso: {successful_requests/(successful_requests+failed_requests)*100:.1f}%"
+            f"⚡ Tempo médio de resposta: "
+            f"{sum(measured_response_times)/len(measured_response_times):.3f}s"
         )
-
-        if response_times:
-            print(
-                f"⚡ Tempo médio de resposta: {sum(response_times)/len(response_times):.3f}s"
-            )
-            print(f"🚀 Menor tempo de resposta: {min(response_times):.3f}s")
-            print(f"🐌 Maior tempo de resposta: {max(response_times):.3f}s")
-            print(
-                f"📊 Throughput: {successful_requests/total_time:.2f} mensagens/segundo"
-            )
+        print(f"🚀 Menor tempo de resposta: {min(measured_response_times):.3f}s")
+        print(f"🐌 Maior tempo de resposta: {max(measured_response_times):.3f}s")
+
+    if successful_requests:
+        print(f"📊 Throughput: {successful_requests/total_time:.2f} mensagens/segundo")
+    if pipeline_send_time > 0:
+        print(f"⚡ Taxa de envio: {successful_requests/pipeline_send_time:.2f} msg/s")
+    print_window_summaries(recorders, window)
+
+    emit_report(
+        build_report(
+            client.client_id,
+            {
+                "sent": total_requests,
+                "successful": successful_requests,
+                "failed": failed_requests,
+            },
+            {"total_time": total_time, "pipeline_send_time": pipeline_send_time},
+            recorders,
+            window,
+        )
+    )
 
     print(f"🏁 Cliente finalizado com sucesso!")
 
@@ -0,0 +1,281 @@
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+
+from timing import (
+    PHASES,
+    WINDOW_COOLDOWN,
+    WINDOW_MEASURED,
+    WINDOW_WARMUP,
+    summarize,
+)
+
+REPORT_VERSION = 1
+# Prefix of the stdout line carrying the JSON report (collected via kubectl logs)
+REPORT_LINE_PREFIX = "RUN_REPORT_JSON "
+SCENARIO_KEYS = ("implementation", "servers", "clients", "messages")
+MERGED_PERCENTILES = (50, 90, 95, 99, 99.9)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with bounded relative error.
+
+    Bucket i holds values in (min_value * growth**(i-1), min_value * growth**i],
+    so any percentile read back is within `growth - 1` of the true sample.
+    Histograms with the same parameters merge by adding bucket counts.
+    """
+
+    def __init__(self, growth=1.01, min_value=1e-6):
+        self.growth = growth
+        self.min_value = min_value
+        self.log_growth = math.log(growth)
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def from_values(cls, values, **kwargs):
+        histogram = cls(**kwargs)
+        for value in values:
+            histogram.record(value)
+        return histogram
+
+    def bucket(self, value):
+        if value <= self.min_value:
+            return 0
+        return math.ceil(math.log(value / self.min_value) / self.log_growth)
+
+    def record(self, value):
+        index = self.bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        if (other.growth, other.min_value) != (self.growth, self.min_value):
+            raise ValueError("Histogramas com parâmetros diferentes")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, q):
+        """Value at percentile q (0-100), clamped to the observed min/max"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100.0 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                # Geometric midpoint of the bucket
+                value = self.min_value * self.growth ** (index - 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        stats = {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+        for q in MERGED_PERCENTILES:
+            stats[f"p{q:g}"] = self.percentile(q)
+        return stats
+
+    def to_dict(self):
+        return {
+            "growth": self.growth,
+            "min_value": self.min_value,
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {str(index): count for index, count in sorted(self.counts.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(growth=data["growth"], min_value=data["min_value"])
+        histogram.counts = {int(index): count for index, count in data["buckets"].items()}
+        histogram.count = data["count"]
+        histogram.total = data["sum"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+
+def scenario_from_env():
+    """Scenario tags passed to the client pod by deploy.sh"""
+
+    def as_int(name):
+        value = os.getenv(name, "")
+        return int(value) if value.isdigit() else None
+
+    return {
+        "implementation": os.getenv("IMPLEMENTATION") or None,
+        "servers": as_int("NUM_SERVERS"),
+        "clients": as_int("NUM_CLIENTES"),
+        "messages": as_int("NUM_MENSAGENS"),
+        "iteration": as_int("ITERATION"),
+        "pod_index": as_int("JOB_COMPLETION_INDEX"),
+    }
+
+
+def phase_report(timing_recorder):
+    """Summary and serialized histogram of every phase of a recorder"""
+    values = timing_recorder.values()
+    return {
+        phase: {
+            "summary": summarize(values[phase]),
+            "histogram": LatencyHistogram.from_values(values[phase]).to_dict(),
+        }
+        for phase in PHASES
+    }
+
+
+def build_report(client_id, counters, timings, recorders, window):
+    """Build the machine-readable report of one client run.
+
+    `recorders` maps each measurement window to its TimingRecorder; only the
+    measured window feeds "phases", warm-up/cool-down are reported apart.
+    """
+    return {
+        "version": REPORT_VERSION,
+        "client_id": client_id,
+        "scenario": scenario_from_env(),
+        "counters": counters,
+        "timings": timings,
+        "measurement_window": window.to_dict(),
+        "phases": phase_report(recorders[WINDOW_MEASURED]),
+        "excluded_windows": {
+            name: phase_report(recorders[name])
+            for name in (WINDOW_WARMUP, WINDOW_COOLDOWN)
+        },
+    }
+
+
+def emit_report(report):
+    """Print the report as a single tagged line and write it to REPORT_FILE if set"""
+    line = json.dumps(report, separators=(",", ":"))
+    print(REPORT_LINE_PREFIX + line)
+
+    report_file = os.getenv("REPORT_FILE")
+    if report_file:
+        try:
+            with open(report_file, "w", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            print(f"❌ Erro ao salvar relatório JSON: {e}")
+
+
+def iter_reports(paths):
+    """Yield reports from JSON files, JSON-lines files or captured pod logs"""
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith(REPORT_LINE_PREFIX):
+                    line = line[len(REPORT_LINE_PREFIX) :]
+                if line.startswith("{"):
+                    yield json.loads(line)
+
+
+def merge_reports(reports):
+    """Merge client reports into scenario-level counters and percentiles"""
+    scenarios = {}
+    for report in reports:
+        key = tuple(report["scenario"].get(k) for k in SCENARIO_KEYS)
+        merged = scenarios.get(key)
+        if merged is None:
+            merged = scenarios[key] = {
+                "scenario": dict(zip(SCENARIO_KEYS, key)),
+                "reports": 0,
+                "iterations": set(),
+                "counters": {},
+                "histograms": {},
+            }
+
+        merged["reports"] += 1
+        merged["iterations"].add(report["scenario"].get("iteration"))
+        for name, value in report["counters"].items():
+            merged["counters"][name] = merged["counters"].get(name, 0) + value
+        for phase, data in report["phases"].items():
+            histogram = LatencyHistogram.from_dict(data["histogram"])
+            if phase in merged["histograms"]:
+                merged["histograms"][phase].merge(histogram)
+            else:
+                merged["histograms"][phase] = histogram
+
+    return [
+        {
+            "scenario": merged["scenario"],
+            "reports": merged["reports"],
+            "iterations": len(merged["iterations"]),
+            "counters": merged["counters"],
+            "phases": {
+                phase: histogram.summary()
+                for phase, histogram in merged["histograms"].items()
+            },
+        }
+        for _, merged in sorted(
+            scenarios.items(), key=lambda item: tuple(str(v) for v in item[0])
+        )
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Combina os relatórios JSON dos clientes em percentis por cenário"
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="Arquivos de relatório (JSON, JSON lines ou logs)"
+    )
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args()
+
+    paths = []
+    for pattern in args.inputs:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+
+    merged = merge_reports(iter_reports(paths))
+    if not merged:
+        print("❌ Nenhum relatório encontrado")
+        sys.exit(1)
+
+    for scenario in merged:
+        tags = scenario["scenario"]
+        message_stats = scenario["phases"].get("message", {"count": 0})
+        line = (
+            f"{tags['implementation']} | {tags['servers']} serv, {tags['clients']} cli, "
+            f"{tags['messages']} msg | {scenario['reports']} relatórios"
+        )
+        if message_stats["count"]:
+            line += (
+                f" | p50 {message_stats['p50'] * 1000:.3f}ms"
+                f" | p99 {message_stats['p99'] * 1000:.3f}ms"
+            )
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(merged, f, indent=2)
+        print(f"\n💾 Relatório combinado salvo em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
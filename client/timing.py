@@ -0,0 +1,206 @@
+import os
+import statistics
+import threading
+from collections import namedtuple
+
+# Connection phases measured by the client
+PHASE_DNS = "dns"
+PHASE_CONNECT = "connect"
+PHASE_TTFB = "ttfb"
+PHASE_MESSAGE = "message"
+PHASES = (PHASE_DNS, PHASE_CONNECT, PHASE_TTFB, PHASE_MESSAGE)
+
+PHASE_LABELS = {
+    PHASE_DNS: "Resolução de nome (DNS)",
+    PHASE_CONNECT: "Conexão TCP (connect)",
+    PHASE_TTFB: "Tempo até o primeiro byte",
+    PHASE_MESSAGE: "Latência por mensagem",
+}
+
+# Measurement windows of a run
+WINDOW_WARMUP = "warmup"
+WINDOW_MEASURED = "measured"
+WINDOW_COOLDOWN = "cooldown"
+WINDOWS = (WINDOW_WARMUP, WINDOW_MEASURED, WINDOW_COOLDOWN)
+
+WINDOW_LABELS = {
+    WINDOW_WARMUP: "Aquecimento (excluído)",
+    WINDOW_MEASURED: "Medição",
+    WINDOW_COOLDOWN: "Encerramento (excluído)",
+}
+
+# A duration sample tagged with the message it belongs to and its send instant
+# (time.perf_counter); either tag may be None when unknown
+Sample = namedtuple("Sample", ["value", "message_id", "at"])
+
+
+def summarize(values):
+    """Return count, mean, median, std, min and max of a list of durations"""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values),
+        "median": statistics.median(values),
+        "std": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+def tag_connection_timings(timings, message_id, at):
+    """Tag a connection's DNS/connect/TTFB durations with its first message"""
+    for phase in (PHASE_DNS, PHASE_CONNECT, PHASE_TTFB):
+        value = timings.get(phase)
+        if value is not None and not isinstance(value, Sample):
+            timings[phase] = Sample(value, message_id, at)
+    return timings
+
+
+class MeasurementWindow:
+    """Warm-up and cool-down windows, by message count and/or elapsed time.
+
+    Traffic is still sent during both windows; their samples are only kept
+    out of the measured statistics.
+    """
+
+    def __init__(
+        self,
+        warmup_messages=0,
+        cooldown_messages=0,
+        warmup_seconds=0.0,
+        cooldown_seconds=0.0,
+    ):
+        self.warmup_messages = warmup_messages
+        self.cooldown_messages = cooldown_messages
+        self.warmup_seconds = warmup_seconds
+        self.cooldown_seconds = cooldown_seconds
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            warmup_messages=int(os.getenv("WARMUP_MESSAGES", "0")),
+            cooldown_messages=int(os.getenv("COOLDOWN_MESSAGES", "0")),
+            warmup_seconds=float(os.getenv("WARMUP_SECONDS", "0")),
+            cooldown_seconds=float(os.getenv("COOLDOWN_SECONDS", "0")),
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from {"warmup": {"messages"|"seconds": ...}, "cooldown": {...}}"""
+        warmup = data.get("warmup") or {}
+        cooldown = data.get("cooldown") or {}
+        return cls(
+            warmup_messages=int(warmup.get("messages", 0)),
+            cooldown_messages=int(cooldown.get("messages", 0)),
+            warmup_seconds=float(warmup.get("seconds", 0)),
+            cooldown_seconds=float(cooldown.get("seconds", 0)),
+        )
+
+    @property
+    def enabled(self):
+        return any(
+            (
+                self.warmup_messages,
+                self.cooldown_messages,
+                self.warmup_seconds,
+                self.cooldown_seconds,
+            )
+        )
+
+    def classify(self, sample, total_messages, run_start, run_end):
+        """Return the window a sample falls into"""
+        if sample.message_id is not None:
+            if sample.message_id <= self.warmup_messages:
+                return WINDOW_WARMUP
+            if sample.message_id > total_messages - self.cooldown_messages:
+                return WINDOW_COOLDOWN
+        if sample.at is not None:
+            if sample.at - run_start < self.warmup_seconds:
+                return WINDOW_WARMUP
+            if run_end - sample.at < self.cooldown_seconds:
+                return WINDOW_COOLDOWN
+        return WINDOW_MEASURED
+
+    def to_dict(self):
+        return {
+            "warmup": {
+                "messages": self.warmup_messages,
+                "seconds": self.warmup_seconds,
+            },
+            "cooldown": {
+                "messages": self.cooldown_messages,
+                "seconds": self.cooldown_seconds,
+            },
+        }
+
+    def describe(self):
+        parts = []
+        for label, messages, seconds in (
+            ("aquecimento", self.warmup_messages, self.warmup_seconds),
+            ("encerramento", self.cooldown_messages, self.cooldown_seconds),
+        ):
+            if messages:
+                parts.append(f"{label}: {messages} mensagens")
+            if seconds:
+                parts.append(f"{label}: {seconds:g}s")
+        return ", ".join(parts) if parts else "desativadas"
+
+
+class TimingRecorder:
+    """Thread-safe collector of per-phase duration samples (in seconds)"""
+
+    def __init__(self):
+        self.samples = {phase: [] for phase in PHASES}
+        self.lock = threading.Lock()
+
+    def add(self, phase, value):
+        if not isinstance(value, Sample):
+            value = Sample(value, None, None)
+        with self.lock:
+            self.samples[phase].append(value)
+
+    def add_timings(self, timings):
+        """Add a timings dict as returned by CustomProtocolClient"""
+        for phase in PHASES:
+            value = timings.get(phase)
+            if value is None:
+                continue
+            for sample in value if isinstance(value, list) else [value]:
+                self.add(phase, sample)
+
+    def values(self):
+        """Plain duration values per phase"""
+        with self.lock:
+            return {
+                phase: [sample.value for sample in self.samples[phase]]
+                for phase in PHASES
+            }
+
+    def split(self, window, total_messages, run_start, run_end):
+        """Split the samples into warm-up, measured and cool-down recorders"""
+        recorders = {name: TimingRecorder() for name in WINDOWS}
+        with self.lock:
+            for phase in PHASES:
+                for sample in self.samples[phase]:
+                    name = window.classify(sample, total_messages, run_start, run_end)
+                    recorders[name].samples[phase].append(sample)
+        return recorders
+
+    def summary(self):
+        return {phase: summarize(values) for phase, values in self.values().items()}
+
+    def print_summary(self, title="⏱️  Tempos por fase da conexão:"):
+        print(title)
+        for phase, stats in self.summary().items():
+            if stats["count"] == 0:
+                print(f"   • {PHASE_LABELS[phase]}: sem amostras")
+                continue
+            print(
+                f"   • {PHASE_LABELS[phase]} (n={stats['count']}): "
+                f"média {stats['mean'] * 1000:.3f}ms | "
+                f"mediana {stats['median'] * 1000:.3f}ms | "
+                f"desvio {stats['std'] * 1000:.3f}ms | "
+                f"min {stats['min'] * 1000:.3f}ms | "
+                f"max {stats['max'] * 1000:.3f}ms"
+            )
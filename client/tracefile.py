@@ -0,0 +1,98 @@
+import struct
+import threading
+import time
+from collections import namedtuple
+
+# Trace file layout (little endian):
+#   header:  magic "CSTR" (4s), version (H), recording wall-clock start (d)
+#   records: tag (B) followed by
+#     TAG_CLIENT: client index (H), name length (H), UTF-8 name
+#     TAG_SEND:   relative send time in seconds (d), client index (H),
+#                 payload size (I), connection id (I)
+TRACE_MAGIC = b"CSTR"
+TRACE_VERSION = 1
+HEADER_FORMAT = struct.Struct("<4sHd")
+TAG_CLIENT = 0
+TAG_SEND = 1
+CLIENT_FORMAT = struct.Struct("<BHH")
+SEND_FORMAT = struct.Struct("<BdHII")
+
+TraceEvent = namedtuple(
+    "TraceEvent", ["send_time", "client_id", "payload_size", "connection"]
+)
+
+
+class TraceRecorder:
+    """Records (relative send time, client_id, payload size, connection) to a binary file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.lock = threading.Lock()
+        self.client_index = {}
+        self.next_connection = 0
+        self.start = time.perf_counter()
+        self.file.write(HEADER_FORMAT.pack(TRACE_MAGIC, TRACE_VERSION, time.time()))
+
+    def new_connection(self):
+        """Allocate an id for a newly opened connection"""
+        with self.lock:
+            connection = self.next_connection
+            self.next_connection += 1
+            return connection
+
+    def record(self, client_id, payload_size, connection):
+        send_time = time.perf_counter() - self.start
+        with self.lock:
+            index = self.client_index.get(client_id)
+            if index is None:
+                index = self.client_index[client_id] = len(self.client_index)
+                name = client_id.encode("utf-8")
+                self.file.write(CLIENT_FORMAT.pack(TAG_CLIENT, index, len(name)) + name)
+            self.file.write(
+                SEND_FORMAT.pack(TAG_SEND, send_time, index, payload_size, connection)
+            )
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+def read_trace(path):
+    """Read a trace file and return its events sorted by send time"""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < HEADER_FORMAT.size:
+        raise ValueError(f"Arquivo de trace truncado: {path}")
+    magic, version, _ = HEADER_FORMAT.unpack_from(data, 0)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        raise ValueError(f"Arquivo de trace inválido: {path}")
+
+    clients = {}
+    events = []
+    offset = HEADER_FORMAT.size
+    while offset < len(data):
+        tag = data[offset]
+        if tag == TAG_CLIENT:
+            if offset + CLIENT_FORMAT.size > len(data):
+                break  # Partial record from an interrupted recording
+            _, index, length = CLIENT_FORMAT.unpack_from(data, offset)
+            offset += CLIENT_FORMAT.size
+            if offset + length > len(data):
+                break
+            clients[index] = data[offset : offset + length].decode("utf-8")
+            offset += length
+        elif tag == TAG_SEND:
+            if offset + SEND_FORMAT.size > len(data):
+                break  # Partial record from an interrupted recording
+            _, send_time, index, payload_size, connection = SEND_FORMAT.unpack_from(
+                data, offset
+            )
+            offset += SEND_FORMAT.size
+            events.append(TraceEvent(send_time, clients[index], payload_size, connection))
+        else:
+            raise ValueError(f"Registro desconhecido no trace na posição {offset}")
+
+    events.sort(key=lambda event: event.send_time)
+    return events
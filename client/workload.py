@@ -0,0 +1,242 @@
+import json
+import os
+import random
+import string
+
+from timing import MeasurementWindow
+
+# Supported payload size / think time distributions
+DIST_FIXED = "fixed"
+DIST_UNIFORM = "uniform"
+DIST_NORMAL = "normal"
+DIST_LOGNORMAL = "lognormal"
+DIST_EXPONENTIAL = "exponential"
+DIST_CHOICE = "choice"
+
+
+class WorkloadError(ValueError):
+    """Raised when a workload spec is malformed"""
+
+
+def sample_distribution(spec, rng, count):
+    """Draw `count` non-negative samples from a distribution spec.
+
+    A spec is either a plain number (fixed value) or a dict such as
+    {"distribution": "uniform", "min": 16, "max": 1024}.
+    """
+    if spec is None:
+        return [0] * count
+    if isinstance(spec, (int, float)):
+        return [spec] * count
+    if not isinstance(spec, dict):
+        raise WorkloadError(f"Distribuição inválida: {spec!r}")
+
+    kind = spec.get("distribution", DIST_FIXED)
+    try:
+        if kind == DIST_FIXED:
+            values = [spec["value"]] * count
+        elif kind == DIST_UNIFORM:
+            values = [rng.uniform(spec["min"], spec["max"]) for _ in range(count)]
+        elif kind == DIST_NORMAL:
+            values = [rng.gauss(spec["mean"], spec["std"]) for _ in range(count)]
+        elif kind == DIST_LOGNORMAL:
+            values = [
+                rng.lognormvariate(spec["mu"], spec["sigma"]) for _ in range(count)
+            ]
+        elif kind == DIST_EXPONENTIAL:
+            values = [rng.expovariate(1.0 / spec["mean"]) for _ in range(count)]
+        elif kind == DIST_CHOICE:
+            values = rng.choices(spec["values"], weights=spec.get("weights"), k=count)
+        else:
+            raise WorkloadError(f"Distribuição desconhecida: {kind}")
+    except KeyError as e:
+        raise WorkloadError(f"Distribuição '{kind}' sem o parâmetro {e}")
+
+    low = spec.get("min", 0)
+    high = spec.get("max")
+    values = [max(low, v) for v in values]
+    if high is not None:
+        values = [min(high, v) for v in values]
+    return values
+
+
+class WorkloadPhase:
+    """One phase of a workload: message count, payload sizes, traffic mix and think times"""
+
+    def __init__(
+        self,
+        name,
+        messages,
+        payload_size=None,
+        pipelined_fraction=1.0,
+        think_time_ms=None,
+        max_workers=10,
+    ):
+        if messages < 0:
+            raise WorkloadError(f"Fase '{name}': número de mensagens negativo")
+        if not 0.0 <= pipelined_fraction <= 1.0:
+            raise WorkloadError(
+                f"Fase '{name}': pipelined_fraction deve estar entre 0 e 1"
+            )
+        self.name = name
+        self.messages = messages
+        self.payload_size = payload_size
+        self.pipelined_fraction = pipelined_fraction
+        self.think_time_ms = think_time_ms
+        self.max_workers = max_workers
+
+        # Filled in by prepare()
+        self.message_ids = []
+        self.payloads = []
+        self.think_times = []
+        self.pipelined = []
+
+    @classmethod
+    def from_dict(cls, data, index=0):
+        if not isinstance(data, dict):
+            raise WorkloadError(f"Fase {index} deve ser um objeto")
+        if "messages" not in data:
+            raise WorkloadError(f"Fase {index} sem o campo 'messages'")
+        return cls(
+            name=data.get("name", f"phase_{index + 1}"),
+            messages=int(data["messages"]),
+            payload_size=data.get("payload_size"),
+            pipelined_fraction=float(data.get("pipelined_fraction", 1.0)),
+            think_time_ms=data.get("think_time_ms"),
+            max_workers=int(data.get("max_workers", 10)),
+        )
+
+    def prepare(self, first_message_id, rng, payload_buffer):
+        """Generate message ids, payloads, think times and traffic mix up front"""
+        self.message_ids = list(
+            range(first_message_id, first_message_id + self.messages)
+        )
+
+        if self.payload_size is None:
+            # Legacy payload, kept for comparability with older results
+            self.payloads = [f"Message {i}" for i in self.message_ids]
+        else:
+            sizes = sample_distribution(self.payload_size, rng, self.messages)
+            self.payloads = [payload_buffer.get(int(size)) for size in sizes]
+
+        self.think_times = [
+            t / 1000.0 for t in sample_distribution(self.think_time_ms, rng, self.messages)
+        ]
+
+        pipelined_count = round(self.messages * self.pipelined_fraction)
+        self.pipelined = [True] * pipelined_count + [False] * (
+            self.messages - pipelined_count
+        )
+        rng.shuffle(self.pipelined)
+
+    def split(self):
+        """Return (pipelined, request_response) lists of (id, payload, think_time)"""
+        pipelined, request_response = [], []
+        for message in zip(
+            self.message_ids, self.payloads, self.think_times, self.pipelined
+        ):
+            (pipelined if message[3] else request_response).append(message[:3])
+        return pipelined, request_response
+
+
+class PayloadBuffer:
+    """Pre-generated payload text; payloads of the same size share one string"""
+
+    def __init__(self, rng, size=0):
+        self.rng = rng
+        self.base = ""
+        self.cache = {}
+        self.reserve(size)
+
+    def reserve(self, size):
+        if size > len(self.base):
+            self.base += "".join(
+                self.rng.choices(string.ascii_letters, k=size - len(self.base))
+            )
+
+    def get(self, size):
+        payload = self.cache.get(size)
+        if payload is None:
+            self.reserve(size)
+            payload = self.cache[size] = self.base[:size]
+        return payload
+
+
+class WorkloadSpec:
+    """Ordered list of workload phases loaded from a JSON/YAML spec"""
+
+    def __init__(self, phases, seed=None, window=None):
+        if not phases:
+            raise WorkloadError("A especificação de carga não possui fases")
+        self.phases = phases
+        self.seed = seed
+        # Warm-up/cool-down windows; None falls back to the env vars
+        self.window = window
+
+    @property
+    def total_messages(self):
+        return sum(phase.messages for phase in self.phases)
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data.get("phases", []), list):
+            raise WorkloadError("O campo 'phases' deve ser uma lista")
+        phases = [
+            WorkloadPhase.from_dict(phase, i)
+            for i, phase in enumerate(data.get("phases", []))
+        ]
+        window = None
+        if "warmup" in data or "cooldown" in data:
+            window = MeasurementWindow.from_dict(data)
+        return cls(phases, seed=data.get("seed"), window=window)
+
+    def prepare(self):
+        """Generate every payload before any traffic is sent"""
+        rng = random.Random(self.seed)
+        payload_buffer = PayloadBuffer(rng)
+        next_id = 1
+        for phase in self.phases:
+            phase.prepare(next_id, rng, payload_buffer)
+            next_id += phase.messages
+        return self
+
+
+def load_workload_spec(path):
+    """Load a workload spec from a .json, .yaml or .yml file"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise WorkloadError(
+                    "PyYAML não está instalado; use uma especificação JSON"
+                )
+            try:
+                data = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise WorkloadError(f"YAML inválido em {path}: {e}")
+        else:
+            data = json.load(f)
+    data = data or {}
+    if not isinstance(data, dict):
+        raise WorkloadError(
+            f"A especificação de carga deve ser um objeto, não {type(data).__name__}"
+        )
+    return WorkloadSpec.from_dict(data)
+
+
+def workload_from_env():
+    """Build the single-phase workload described by the legacy env vars"""
+    num_messages = int(os.getenv("NUM_MENSAGENS", "5"))
+    use_pipelining = os.getenv("USE_PIPELINING", "true").lower() == "true"
+    max_workers = int(os.getenv("MAX_WORKERS", "10"))
+    return WorkloadSpec(
+        [
+            WorkloadPhase(
+                "default",
+                num_messages,
+                pipelined_fraction=1.0 if use_pipelining and num_messages > 1 else 0.0,
+                max_workers=max_workers,
+            )
+        ]
+    )
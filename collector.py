@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# Coleta dos logs de sessão pelas mensagens administrativas do protocolo, na
+# mesma porta dos clientes: sem kubectl exec/cp por pod
+import argparse
+import json
+import socket
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Mesmo enquadramento dos servidores: magic, tipo e tamanho (12 bytes) + payload
+MAGIC_NUMBER = 0x12345678
+HEADER = struct.Struct("!III")
+MSG_ADMIN_RESET = 6
+MSG_ADMIN_FETCH = 7
+MSG_ADMIN_DATA = 8
+MSG_ADMIN_DONE = 9
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_PARALLEL = 16
+
+
+def _send(sock, msg_type, payload):
+    sock.sendall(HEADER.pack(MAGIC_NUMBER, msg_type, len(payload)) + payload)
+
+
+def _receive_exact(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Conexão encerrada pelo servidor")
+        received += count
+    return bytes(buffer)
+
+
+def _receive(sock):
+    magic, msg_type, length = HEADER.unpack(_receive_exact(sock, HEADER.size))
+    if magic != MAGIC_NUMBER:
+        raise ConnectionError(f"Magic number inválido: 0x{magic:x}")
+    return msg_type, _receive_exact(sock, length)
+
+
+def _request(endpoint, msg_type, request, timeout):
+    """
+    Envia uma requisição administrativa e lê a resposta: blocos
+    MSG_ADMIN_DATA (bytes do log) até o MSG_ADMIN_DONE com o resumo JSON.
+    Retorna (bytes, resumo).
+    """
+    host, port = endpoint
+    chunks = []
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        _send(sock, msg_type, json.dumps(request).encode("utf-8"))
+        while True:
+            reply_type, payload = _receive(sock)
+            if reply_type == MSG_ADMIN_DATA:
+                chunks.append(payload)
+            elif reply_type == MSG_ADMIN_DONE:
+                summary = json.loads(payload.decode("utf-8"))
+                if summary.get("status") != "ok":
+                    raise ConnectionError(f"{host}:{port}: {summary.get('status')}")
+                return b"".join(chunks), summary
+            else:
+                raise ConnectionError(f"Resposta inesperada do tipo {reply_type}")
+
+
+def reset_log(endpoint, rotate=False, timeout=DEFAULT_TIMEOUT):
+    """
+    Recomeça o log de sessões do servidor só com o cabeçalho (troca atômica).
+    Com rotate=True o log anterior é mantido num arquivo com sufixo.
+    """
+    _, summary = _request(endpoint, MSG_ADMIN_RESET, {"rotate": rotate}, timeout)
+    return summary
+
+
+def fetch_log(
+    endpoint, offset=0, run_id=None, epoch=None, timeout=DEFAULT_TIMEOUT
+):
+    """
+    Linhas do log a partir de um offset em bytes, ou só as sessões de um
+    run_id. O resumo traz o offset do fim do log e a epoch (para a próxima
+    coleta incremental), rows e truncated. epoch é a do resumo que deu o
+    offset: se o log foi reiniciado desde então, o offset é de outro arquivo
+    e o servidor devolve o log desde o início, com truncated.
+    """
+    request = {"offset": offset}
+    if run_id is not None:
+        request["run_id"] = run_id
+    if epoch is not None:
+        request["epoch"] = epoch
+    return _request(endpoint, MSG_ADMIN_FETCH, request, timeout)
+
+
+def _run_all(function, arguments, parallel):
+    """function(*args) para cada item de arguments, em paralelo e na ordem"""
+    with ThreadPoolExecutor(max_workers=max(min(parallel, len(arguments)), 1)) as pool:
+        futures = [pool.submit(function, *args) for args in arguments]
+        return [future.result() for future in futures]
+
+
+def reset_all(
+    endpoints, rotate=False, parallel=DEFAULT_PARALLEL, timeout=DEFAULT_TIMEOUT
+):
+    """reset_log em todos os servidores ao mesmo tempo"""
+    return _run_all(
+        reset_log, [(endpoint, rotate, timeout) for endpoint in endpoints], parallel
+    )
+
+
+def fetch_all(
+    endpoints,
+    offsets=None,
+    run_id=None,
+    parallel=DEFAULT_PARALLEL,
+    timeout=DEFAULT_TIMEOUT,
+    epochs=None,
+):
+    """
+    fetch_log em todos os servidores ao mesmo tempo, numa única passada.
+    offsets/epochs: um por endpoint (padrão: 0/None). Retorna [(bytes, resumo)].
+    """
+    offsets = offsets or [0] * len(endpoints)
+    epochs = epochs or [None] * len(endpoints)
+    arguments = [
+        (endpoint, offset, run_id, epoch, timeout)
+        for endpoint, offset, epoch in zip(endpoints, offsets, epochs)
+    ]
+    return _run_all(fetch_log, arguments, parallel)
+
+
+def parse_endpoint(value):
+    """"host:porta" -> (host, porta)"""
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reinicia ou coleta os logs de sessão dos servidores pelo protocolo"
+    )
+    parser.add_argument("endpoints", nargs="+", help="Servidores, como host:porta")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fetch = subparsers.add_parser("fetch", help="Baixa os logs (em paralelo)")
+    fetch.add_argument("--offset", type=int, default=0, help="Offset em bytes")
+    fetch.add_argument("--run-id", help="Só as sessões deste run_id")
+    fetch.add_argument("--output", help="Arquivo de saída (padrão: stdout)")
+
+    reset = subparsers.add_parser("reset", help="Recomeça os logs só com o cabeçalho")
+    reset.add_argument(
+        "--rotate", action="store_true", help="Mantém o log anterior com um sufixo"
+    )
+    args = parser.parse_args()
+    endpoints = [parse_endpoint(value) for value in args.endpoints]
+
+    if args.command == "reset":
+        summaries = reset_all(endpoints, args.rotate, args.parallel)
+        for value, summary in zip(args.endpoints, summaries):
+            rotated = summary.get("rotated")
+            note = f" (anterior em {rotated})" if rotated else ""
+            print(f"🧹 {value}: log reiniciado{note}")
+        return 0
+
+    results = fetch_all(
+        endpoints, [args.offset] * len(endpoints), args.run_id, args.parallel
+    )
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for value, (data, summary) in zip(args.endpoints, results):
+            output.write(data)
+            print(
+                f"📥 {value}: {summary['rows']} linhas, offset {summary['offset']}",
+                file=sys.stderr,
+            )
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
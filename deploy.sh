@@ -10,6 +10,8 @@ fi
 SERVER_TYPE=$1
 SERVER_DIR="server-$SERVER_TYPE"
 RESULTS_FILE="requests_$SERVER_TYPE.csv"
+REPORTS_DIR="client_reports/$SERVER_TYPE"
+RESULT_STORE="results_store/$SERVER_TYPE"
 DEPLOYMENT_NAME="server-deployment-$SERVER_TYPE"
 SERVICE_NAME="server-service-$SERVER_TYPE"
 
@@ -28,6 +30,30 @@ else
   ITERATIONS=5
 fi
 
+# Adaptive mode: ITERATIONS becomes the maximum; each scenario stops as soon as
+# the confidence interval of its mean is within ±CI_PRECISION (see adaptive.py)
+if [ "$ADAPTIVE" = "true" ]; then
+  MIN_ITERATIONS=${MIN_ITERATIONS:-2}
+  CI_PRECISION=${CI_PRECISION:-0.05}
+  CI_CONFIDENCE=${CI_CONFIDENCE:-0.95}
+  echo "Modo ADAPTATIVO: $MIN_ITERATIONS a $ITERATIONS iterações por cenário (IC ${CI_CONFIDENCE} com precisão ±${CI_PRECISION})"
+fi
+
+# Delegate the sweep to the Python orchestrator (parallel per-pod operations,
+# progress with per-step timing and resumable checkpoints)
+if [ "$USE_ORCHESTRATOR" = "true" ]; then
+  ORCHESTRATOR_ARGS=(--build --servers "${SERVERS[@]}" --clients "${CLIENTS[@]}"
+    --messages "${MESSAGES[@]}" --iterations "$ITERATIONS")
+  if [ "$ADAPTIVE" = "true" ]; then
+    ORCHESTRATOR_ARGS+=(--adaptive --min-iterations "$MIN_ITERATIONS"
+      --precision "$CI_PRECISION" --confidence "$CI_CONFIDENCE")
+  fi
+  if [ "$RESUME" = "true" ]; then
+    ORCHESTRATOR_ARGS+=(--resume)
+  fi
+  exec python3 orchestrator.py "$SERVER_TYPE" "${ORCHESTRATOR_ARGS[@]}"
+fi
+
 # Calculate and display total number of executions
 # Total de cenários (combinações de configuração)
 TOTAL_SCENARIOS=$((${#SERVERS[@]} * ${#CLIENTS[@]} * ${#MESSAGES[@]} * ITERATIONS))
@@ -46,6 +72,9 @@ echo "Configurações de servidores: ${SERVERS[*]}"
 echo "Configurações de clientes: ${CLIENTS[*]} (soma: $TOTAL_CLIENTS)"
 echo "Configurações de mensagens: ${MESSAGES[*]}"
 echo "Iterações: $ITERATIONS"
+if [ "$ADAPTIVE" = "true" ]; then
+  echo "(no modo adaptativo os totais acima são o máximo)"
+fi
 echo "Cálculo: ${#SERVERS[@]} servidores × $TOTAL_CLIENTS clientes × ${#MESSAGES[@]} mensagens × $ITERATIONS iterações = $TOTAL_EXECUTIONS linhas"
 echo "Tempo estimado: ~$((TOTAL_SCENARIOS * 9 / 60)) minutos (baseado em $TOTAL_SCENARIOS cenários)"
 echo ""
@@ -57,6 +86,13 @@ START_TIME=$(date +%s)
 > "$RESULTS_FILE"
 echo "client_id,message_id,server_id,client_send_time,server_processing_time,client_receive_time,response_time,num_servers,num_clients,num_messages" > "$RESULTS_FILE"
 
+# Client JSON reports (one JSON line per client pod, grouped per scenario)
+rm -rf "$REPORTS_DIR"
+mkdir -p "$REPORTS_DIR"
+
+# Binary result store (same rows as the CSV, indexed by scenario and iteration)
+rm -rf "$RESULT_STORE"
+
 # OPTIMIZATION 2: Parallel-ready function for data collection
 function wait_for_pods_ready() {
   local deployment_name=$1
@@ -134,7 +170,8 @@ function collect_data_from_pods() {
       grep -v '^$' |
       awk -F, 'NF >= 3 {
         printf "%s,%s,%s", $1, $2, $3;
-        for (i=4; i<=10; i++) {
+        # 10 result columns + iteration and run id session tags
+        for (i=4; i<=12; i++) {
           printf ",%s", (i <= NF && length($i) > 0) ? $i : "unknown";
         }
         printf "\n";
@@ -178,12 +215,6 @@ kubectl apply -f "$SERVER_DIR/k8s/service.yaml" > /dev/null
 echo "Aplicando Deployment '$DEPLOYMENT_NAME'..."
 kubectl apply -f "$SERVER_DIR/k8s/deployment.yaml" > /dev/null
 
-# Initialize environment
-kubectl set env deployment/"$DEPLOYMENT_NAME" \
-  NUM_SERVERS="${SERVERS[0]}" \
-  NUM_CLIENTES="${CLIENTS[0]}" \
-  NUM_MENSAGENS="${MESSAGES[0]}" > /dev/null
-
 current_replicas=$(kubectl get deployment "$DEPLOYMENT_NAME" -o jsonpath='{.spec.replicas}')
 wait_for_pods_ready "$DEPLOYMENT_NAME" "$current_replicas" || {
   echo "Erro: Falha ao criar o deployment inicial do servidor."
@@ -208,25 +239,17 @@ for servers in "${SERVERS[@]}"; do
       for iteration in $(seq 1 $ITERATIONS); do
         echo "--- Iteração $iteration/$ITERATIONS ---"
         
-        # Update environment variables efficiently
-        kubectl set env deployment/"$DEPLOYMENT_NAME" \
-          NUM_SERVERS="$servers" \
-          NUM_CLIENTES="$clients" \
-          NUM_MENSAGENS="$msgs" > /dev/null 2>&1
-
-        # OPTIMIZATION 8: Reduced rollout timeout and wait times
-        echo "Aguardando atualização dos pods após mudança de configuração..."
-        kubectl rollout status deployment/"$DEPLOYMENT_NAME" --timeout=20s > /dev/null 2>&1 || echo "Aviso: Rollout pode não ter completado, mas continuando..."
-        
-        # Sleep removido - rollout status já garante que pods estão prontos
+        # The scenario travels in-band: each client sends a session-open frame
+        # with servers/clients/messages/iteration/run id, so the server pods are
+        # never reconfigured (or restarted) between iterations
 
         # Clear previous CSV data for both server types
         pod_names=($(kubectl get pods -l app="$DEPLOYMENT_NAME" --field-selector=status.phase=Running -o jsonpath='{.items[*].metadata.name}' 2>/dev/null))
         for pod in "${pod_names[@]}"; do
           if [[ "$SERVER_TYPE" == "go" ]]; then
-            kubectl exec "$pod" -- sh -c "echo 'client_id,message_id,server_id,client_send_time,server_processing_time,client_receive_time,response_time,num_servers,num_clients,num_messages' > /data/requests.csv" 2>/dev/null || true
+            kubectl exec "$pod" -- sh -c "echo 'client_id,message_id,server_id,client_send_time,server_processing_time,client_receive_time,response_time,num_servers,num_clients,num_messages,iteration,run_id' > /data/requests.csv" 2>/dev/null || true
           else
-            kubectl exec "$pod" -- bash -c "echo 'client_id,message_id,server_id,client_send_time,server_processing_time,client_receive_time,response_time,num_servers,num_clients,num_messages' > /data/requests.csv" 2>/dev/null || true
+            kubectl exec "$pod" -- bash -c "echo 'client_id,message_id,server_id,client_send_time,server_processing_time,client_receive_time,response_time,num_servers,num_clients,num_messages,iteration,run_id' > /data/requests.csv" 2>/dev/null || true
           fi
         done
 
@@ -234,6 +257,10 @@ for servers in "${SERVERS[@]}"; do
         TIMESTAMP=$(date +%s%N)
         export NUM_CLIENTES="$clients"
         export NUM_MENSAGENS="$msgs"
+        export NUM_SERVERS="$servers"
+        export ITERATION="$iteration"
+        export RUN_ID="${SERVER_TYPE}-s${servers}_c${clients}_m${msgs}_i${iteration}-${TIMESTAMP}"
+        export SERVER_TYPE
         export SERVER_SERVICE="${SERVICE_NAME}"
         
         # Remove previous job if exists
@@ -246,6 +273,10 @@ for servers in "${SERVERS[@]}"; do
         max_wait_time=$((20 + msgs * clients / 30))
         if kubectl wait --for=condition=complete --timeout=${max_wait_time}s job/client-load-test > /dev/null 2>&1; then
           echo "Job do cliente concluído com sucesso."
+          # Collect the clients' JSON reports before the job (and its pods) is deleted
+          kubectl logs -l job-name=client-load-test --tail=-1 --max-log-requests="$clients" 2>/dev/null | \
+            grep '^RUN_REPORT_JSON ' | cut -d' ' -f2- \
+            > "$REPORTS_DIR/s${servers}_c${clients}_m${msgs}_i${iteration}.jsonl"
         else
           echo "Aviso: Job do cliente falhou ou expirou para este cenário."
           kubectl delete job client-load-test --ignore-not-found=true > /dev/null 2>&1
@@ -291,18 +322,25 @@ for servers in "${SERVERS[@]}"; do
           # OPTIMIZATION 12: Streamlined validation and append
           temp_validated="${temp_file}.validated"
           grep -v "^$" "$temp_file" | \
-          awk -v s="$servers" -v c="$clients" -v m="$msgs" '
+          awk -v s="$servers" -v c="$clients" -v m="$msgs" -v run="$RUN_ID" '
           BEGIN { FS=OFS="," } 
           NF >= 3 {
+            # Skip sessions tagged with another run id (column 12)
+            if (NF >= 12 && $12 != run && $12 != "unknown") next;
             # Replace unknown values in critical fields
             if ($8 == "unknown") $8 = s;
             if ($9 == "unknown") $9 = c;
             if ($10 == "unknown") $10 = m;
-            print $0
+            # Keep the 10 result columns (the session tags are not stored)
+            print $1, $2, $3, $4, $5, $6, $7, $8, $9, $10
           }' > "$temp_validated"
           
           lines_added=$(wc -l < "$temp_validated")
           cat "$temp_validated" >> "$RESULTS_FILE"
+          # Also append to the binary, scenario-indexed result store
+          python3 result_store.py --store "$RESULT_STORE" import "$temp_validated" \
+            --no-header --implementation "$SERVER_TYPE" --iteration "$iteration" > /dev/null \
+            || echo "Aviso: Falha ao importar o cenário para $RESULT_STORE"
           echo "Adicionadas $lines_added linhas de dados validadas para o cenário: $servers servidores, $clients clientes, $msgs mensagens."
           
           rm -f "$temp_file" "$temp_validated"
@@ -310,6 +348,14 @@ for servers in "${SERVERS[@]}"; do
           echo "Aviso: Nenhum dado coletado para este cenário."
         fi
 
+        # Adaptive stopping: skip the remaining iterations once the mean converged
+        if [ "$ADAPTIVE" = "true" ] && python3 adaptive.py --store "$RESULT_STORE" \
+            --precision "$CI_PRECISION" --confidence "$CI_CONFIDENCE" check \
+            --servers "$servers" --clients "$clients" --messages "$msgs" \
+            --implementation "$SERVER_TYPE" --min "$MIN_ITERATIONS" --max "$ITERATIONS"; then
+          break
+        fi
+
       done  # End iteration loop
     done    # End messages loop
   done      # End clients loop
@@ -352,9 +398,15 @@ echo "Total final de linhas: $((total_lines - 1))"
 # Remove temporary files
 rm -f temp_results_*.csv*
 
+# Merge the client JSON reports into scenario-level percentiles
+echo "Combinando relatórios JSON dos clientes..."
+python3 client/report.py "$REPORTS_DIR"/*.jsonl --output "client_reports/${SERVER_TYPE}_merged.json" > /dev/null \
+  && echo "Relatório combinado dos clientes: client_reports/${SERVER_TYPE}_merged.json" \
+  || echo "Aviso: Nenhum relatório JSON de cliente foi coletado."
+
 # OPTIMIZATION 14: Skip analysis in optimized mode for speed
 echo "Análise pulada no modo otimizado para economizar tempo."
-echo "Para analisar resultados, execute: python3 analyze.py $SERVER_TYPE"
+echo "Para analisar resultados, execute: python3 analyze.py summary"
 echo "Para comparar os resultados, execute: python3 analyze.py compare"
 
 # Calculate and display total execution time
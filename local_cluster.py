@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# Cluster local no lugar do kind: N servidores como processos, cada um na sua
+# porta, atrás de um front end TCP em rodízio que faz o papel do Service
+import argparse
+import itertools
+import signal
+import socket
+import sys
+import threading
+
+BUFFER_SIZE = 64 * 1024
+
+
+def _pump(source, destination):
+    """Copia bytes de source para destination até o fim do fluxo"""
+    try:
+        while True:
+            data = source.recv(BUFFER_SIZE)
+            if not data:
+                break
+            destination.sendall(data)
+    except OSError:
+        pass
+    finally:
+        try:
+            destination.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+class RoundRobinProxy:
+    """
+    Front end TCP: cada conexão aceita vai para o próximo servidor da lista,
+    e os bytes são copiados nos dois sentidos. Como o kube-proxy, balanceia
+    conexões e não mensagens, então cada cliente fica num único servidor.
+    """
+
+    def __init__(self, backends=(), host="127.0.0.1", port=0):
+        self.listener = socket.create_server((host, port), backlog=1024)
+        self.address = self.listener.getsockname()
+        self.set_backends(backends)
+        self.thread = None
+
+    def set_backends(self, backends):
+        """Troca a lista de servidores (ao escalar) e recomeça o rodízio"""
+        self.backends = list(backends)
+        self._next = itertools.count()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                break
+            if not self.backends:
+                client.close()
+                continue
+            backend = self.backends[next(self._next) % len(self.backends)]
+            threading.Thread(
+                target=self._forward, args=(client, backend), daemon=True
+            ).start()
+
+    def _forward(self, client, backend):
+        try:
+            upstream = socket.create_connection(backend)
+        except OSError:
+            client.close()
+            return
+        for sock in (client, upstream):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        replies = threading.Thread(target=_pump, args=(upstream, client), daemon=True)
+        replies.start()
+        _pump(client, upstream)
+        replies.join()
+        client.close()
+        upstream.close()
+
+    def stop(self):
+        # shutdown acorda o accept bloqueado na outra thread
+        try:
+            self.listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.listener.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sobe servidores locais atrás de um front end em rodízio"
+    )
+    parser.add_argument("server_type", choices=["python", "go"])
+    parser.add_argument("--servers", type=int, default=2, help="Réplicas (padrão: 2)")
+    parser.add_argument(
+        "--port", type=int, default=5000, help="Porta do front end (padrão: 5000)"
+    )
+    args = parser.parse_args()
+
+    # Importado aqui: o orchestrator.py usa o RoundRobinProxy deste módulo
+    from orchestrator import LocalBackend
+
+    backend = LocalBackend(args.server_type, frontend_port=args.port)
+    backend.setup()
+    try:
+        backend.scale(args.servers)
+        host, port = backend.proxy.address
+        print(f"🚀 {args.servers} servidor(es) {args.server_type} atrás de {host}:{port}")
+        print(f"📊 CSVs dos servidores em {backend.workdir}")
+        print("   SERVER_HOST/SERVER_PORT dos clientes apontam para o front end;")
+        print("   Ctrl+C encerra")
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.teardown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,826 @@
+#!/usr/bin/env python3
+# Orquestração da varredura de cenários: substitui o laço de kubectl do
+# deploy.sh, com operações por pod em paralelo, progresso, tempos por etapa
+# e retomada a partir de um checkpoint
+import argparse
+import glob
+import io
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+
+from adaptive import (
+    DEFAULT_CONFIDENCE,
+    DEFAULT_MIN_ITERATIONS,
+    DEFAULT_PRECISION,
+    iteration_means,
+    should_stop,
+)
+from collector import fetch_all, reset_all
+from local_cluster import RoundRobinProxy
+from result_store import ResultStore, implementation_name
+from results_csv import COLUMNS, SESSION_TAG_COLUMNS, read_results_csv, standardize
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CSV_HEADER = ",".join(COLUMNS)
+# CSV de cada servidor: as colunas dos resultados mais as tags da sessão
+RUN_ID_FIELD = len(COLUMNS) + SESSION_TAG_COLUMNS.index("run_id")
+CHECKPOINT_VERSION = 1
+
+# Mesmas matrizes do deploy.sh (completa) e do deploy-quick.sh
+FULL_MATRIX = {
+    "servers": [2, 4, 6, 8, 10],
+    "clients": [10, 20, 30, 40, 50, 60, 70, 80, 90, 100],
+    "messages": [1, 10, 100, 500, 1000, 10000],
+    "iterations": 5,
+}
+QUICK_MATRIX = {
+    "servers": [2, 4, 6, 8],
+    "clients": [10, 20, 30, 40, 50, 60, 70, 80, 90, 100],
+    "messages": [1, 10, 100, 500, 1000],
+    "iterations": 2,
+}
+
+# Etapas cronometradas em cada iteração
+STEPS = ["reset", "clients", "collect", "store"]
+# Espera pelas linhas dos servidores depois que os clientes terminam
+COLLECT_TIMEOUT = 5.0
+DEFAULT_PARALLEL = 16
+LOCAL_BASE_PORT = 15000
+# Como os clientes locais chegam aos servidores: front end em rodízio no lugar
+# do Service, ou cada cliente direto numa porta de servidor
+FRONTENDS = ["proxy", "direct"]
+SERVER_PORT = 5000
+
+
+def job_timeout(clients, messages):
+    """Mesmo limite do deploy.sh para o job de clientes"""
+    return 20 + messages * clients / 30
+
+
+def normalize_rows(text, servers, clients, messages, run_id=None):
+    """
+    Linhas de dados de um CSV de servidor, como o awk do deploy.sh: ignora
+    cabeçalhos e linhas curtas, descarta as sessões marcadas com outro
+    run_id, mantém os 10 campos de COLUMNS (completando com "unknown") e
+    preenche as chaves ausentes com os valores do cenário.
+    """
+    scenario = [str(servers), str(clients), str(messages)]
+    rows = []
+    for line in text.splitlines():
+        fields = line.split(",")
+        if len(fields) < 3 or fields[0] == "client_id" or not line.strip():
+            continue
+        if run_id and len(fields) > RUN_ID_FIELD and fields[RUN_ID_FIELD] not in (
+            run_id,
+            "unknown",
+        ):
+            continue
+        fields = (fields + ["unknown"] * len(COLUMNS))[: len(COLUMNS)]
+        fields = [field if field else "unknown" for field in fields]
+        for i, value in enumerate(scenario, start=7):
+            if fields[i] == "unknown":
+                fields[i] = value
+        rows.append(",".join(fields))
+    return rows
+
+
+def sessions_per_client(messages, pipelining=True, spec_path=None):
+    """
+    Sessões que cada cliente registra nos servidores, como o client/app.py
+    divide as mensagens: uma conexão para todas as mensagens com pipelining
+    e uma por mensagem no modo requisição/resposta. Com uma especificação de
+    carga (WORKLOAD_SPEC) legível aqui, soma as fases dela.
+    """
+    if spec_path:
+        sys.path.insert(0, os.path.join(ROOT, "client"))
+        try:
+            from workload import load_workload_spec
+
+            phases = load_workload_spec(spec_path).phases
+        except (OSError, ValueError) as e:
+            print(f"⚠️  WORKLOAD_SPEC ignorada na contagem de sessões: {e}")
+        else:
+            sessions = 0
+            for phase in phases:
+                pipelined = round(phase.messages * phase.pipelined_fraction)
+                sessions += min(pipelined, 1) + phase.messages - pipelined
+            return sessions
+        finally:
+            sys.path.remove(os.path.join(ROOT, "client"))
+    return 1 if pipelining or messages == 1 else messages
+
+
+def _local_workload_spec():
+    """WORKLOAD_SPEC dos clientes, se o arquivo também existir nesta máquina"""
+    path = os.getenv("WORKLOAD_SPEC")
+    return path if path and os.path.exists(path) else None
+
+
+def collect_sessions(endpoints, run_id, expected_rows, timeout, parallel):
+    """
+    Sessões de um run_id em todos os servidores, pelas mensagens
+    administrativas do protocolo. Repete com espera crescente até ter as
+    expected_rows sessões ou esgotar o timeout (no lugar do laço de wc -l
+    com sleep do deploy.sh); cada nova passada só pede o que foi gravado
+    depois do offset da anterior.
+    """
+    deadline = time.perf_counter() + timeout
+    delay = 0.02
+    offsets = [0] * len(endpoints)
+    epochs = [None] * len(endpoints)
+    chunks = [[] for _ in endpoints]
+    while True:
+        results = fetch_all(endpoints, offsets, run_id, parallel, epochs=epochs)
+        for index, (data, summary) in enumerate(results):
+            if summary["truncated"]:
+                # Log reiniciado (epoch diferente): os dados vêm do início
+                chunks[index] = []
+            chunks[index].append(data)
+            offsets[index] = summary["offset"]
+            epochs[index] = summary.get("epoch")
+        text = b"".join(b"".join(parts) for parts in chunks).decode("utf-8")
+        if text.count("\n") >= expected_rows or time.perf_counter() >= deadline:
+            return text
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+
+class KubernetesBackend:
+    """Servidores num Deployment do cluster kind e clientes num Job indexado"""
+
+    name = "k8s"
+
+    def __init__(self, server_type, parallel=DEFAULT_PARALLEL, build=False):
+        self.server_type = server_type
+        self.deployment = f"server-deployment-{server_type}"
+        self.service = f"server-service-{server_type}"
+        self.image = f"meu-servidor-{server_type}"
+        self.pool = ThreadPoolExecutor(max_workers=parallel)
+        self.parallel = parallel
+        self.build = build
+        self.pods = []
+        # pod -> (processo do kubectl port-forward, porta local)
+        self.forwards = {}
+
+    def _kubectl(self, *args, input=None, timeout=None):
+        return subprocess.run(
+            ["kubectl", *args],
+            input=input,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+
+    def _server_dir(self):
+        return os.path.join(ROOT, f"server-{self.server_type}")
+
+    def setup(self):
+        if self.build:
+            print("🐳 Construindo e carregando as imagens no kind...")
+            for image, path in (("meu-cliente", "client"), (self.image, self._server_dir())):
+                subprocess.run(
+                    ["docker", "build", "-t", image, os.path.join(ROOT, path)],
+                    check=True,
+                    capture_output=True,
+                )
+                subprocess.run(
+                    ["kind", "load", "docker-image", image, "--name", "cliente-servidor"],
+                    check=True,
+                    capture_output=True,
+                )
+
+        k8s_dir = os.path.join(self._server_dir(), "k8s")
+        self._kubectl("apply", "-f", os.path.join(k8s_dir, "service.yaml"))
+        # Imagem substituída na entrada do kubectl, sem editar o YAML
+        with open(os.path.join(k8s_dir, "deployment.yaml"), encoding="utf-8") as f:
+            manifest = f.read().replace("${SERVER_IMAGE_NAME}", self.image)
+        result = self._kubectl("apply", "-f", "-", input=manifest)
+        if result.returncode != 0:
+            raise RuntimeError(f"Falha ao aplicar o Deployment: {result.stderr.strip()}")
+
+    def _rollout(self, timeout):
+        self._kubectl(
+            "rollout", "status", f"deployment/{self.deployment}", f"--timeout={timeout}s"
+        )
+        result = self._kubectl(
+            "get",
+            "pods",
+            "-l",
+            f"app={self.deployment}",
+            "--field-selector=status.phase=Running",
+            "-o",
+            "jsonpath={.items[*].metadata.name}",
+        )
+        self.pods = result.stdout.split()
+
+    def scale(self, servers):
+        self._kubectl("scale", f"deployment/{self.deployment}", f"--replicas={servers}")
+        self._rollout(45)
+        if len(self.pods) < servers:
+            raise RuntimeError(f"Só {len(self.pods)} de {servers} pods ficaram prontos")
+        self._update_forwards()
+
+    def _port_forward(self, pod):
+        """kubectl port-forward para uma porta local livre; retorna (processo, porta)"""
+        process = subprocess.Popen(
+            ["kubectl", "port-forward", f"pod/{pod}", f":{SERVER_PORT}"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        # "Forwarding from 127.0.0.1:41235 -> 5000"
+        match = re.search(r"127\.0\.0\.1:(\d+)", process.stdout.readline())
+        if match is None:
+            process.kill()
+            raise RuntimeError(f"Falha no port-forward do pod {pod}")
+        return process, int(match.group(1))
+
+    def _update_forwards(self):
+        """Um port-forward por pod: mantém os dos pods que continuam"""
+        for pod in set(self.forwards) - set(self.pods):
+            self.forwards.pop(pod)[0].terminate()
+        missing = [pod for pod in self.pods if pod not in self.forwards]
+        self.forwards.update(zip(missing, self.pool.map(self._port_forward, missing)))
+
+    def _endpoints(self):
+        return [("127.0.0.1", self.forwards[pod][1]) for pod in self.pods]
+
+    def reset(self):
+        reset_all(self._endpoints(), parallel=self.parallel)
+
+    def run_clients(self, servers, clients, messages, iteration, run_id):
+        """Roda o Job de clientes; retorna as linhas de log ou None"""
+        self._kubectl("delete", "job", "client-load-test", "--ignore-not-found=true")
+        with open(os.path.join(ROOT, "client", "k8s", "job.yaml"), encoding="utf-8") as f:
+            job = Template(f.read()).safe_substitute(
+                NUM_CLIENTES=clients,
+                NUM_MENSAGENS=messages,
+                NUM_SERVERS=servers,
+                ITERATION=iteration,
+                RUN_ID=run_id,
+                SERVER_TYPE=self.server_type,
+                SERVER_SERVICE=self.service,
+                WORKLOAD_SPEC=os.getenv("WORKLOAD_SPEC", ""),
+            )
+        self._kubectl("apply", "-f", "-", input=job)
+        timeout = job_timeout(clients, messages)
+        result = self._kubectl(
+            "wait",
+            "--for=condition=complete",
+            f"--timeout={timeout:.0f}s",
+            "job/client-load-test",
+        )
+        reports = None
+        if result.returncode == 0:
+            logs = self._kubectl(
+                "logs",
+                "-l",
+                "job-name=client-load-test",
+                "--tail=-1",
+                f"--max-log-requests={clients}",
+            )
+            reports = logs.stdout.splitlines()
+        self._kubectl("delete", "job", "client-load-test", "--ignore-not-found=true")
+        return reports
+
+    def sessions_per_client(self, messages):
+        # job.yaml não repassa USE_PIPELINING: os pods usam o padrão (true)
+        return sessions_per_client(messages, True, _local_workload_spec())
+
+    def collect(self, expected_rows, run_id, timeout=COLLECT_TIMEOUT):
+        """Sessões do run_id em todos os pods, pelos port-forwards"""
+        return collect_sessions(
+            self._endpoints(), run_id, expected_rows, timeout, self.parallel
+        )
+
+    def teardown(self):
+        for process, _ in self.forwards.values():
+            process.terminate()
+        self.forwards = {}
+        self._kubectl("delete", "deployment", self.deployment, "--ignore-not-found=true")
+        self._kubectl("delete", "service", self.service, "--ignore-not-found=true")
+        self.pool.shutdown()
+
+
+class LocalBackend:
+    """
+    Servidores e clientes como processos locais, sem Docker nem kind: cada
+    servidor escuta numa porta e grava seu próprio CSV. Os clientes se
+    conectam a um RoundRobinProxy (local_cluster.py), que distribui as
+    conexões como o Service; com frontend="direct" cada cliente recebe uma
+    porta de servidor em rodízio.
+    """
+
+    name = "local"
+
+    def __init__(
+        self, server_type, base_port=LOCAL_BASE_PORT, frontend="proxy", frontend_port=0
+    ):
+        self.server_type = server_type
+        self.base_port = base_port
+        self.frontend = frontend
+        self.frontend_port = frontend_port
+        self.proxy = None
+        self.workdir = None
+        self.servers = []
+
+    def _csv_path(self, index):
+        return os.path.join(self.workdir, f"server-{index}.csv")
+
+    def _endpoints(self):
+        return [("127.0.0.1", self.base_port + i) for i in range(len(self.servers))]
+
+    def setup(self):
+        self.workdir = tempfile.mkdtemp(prefix="orchestrator-")
+        if self.frontend == "proxy":
+            self.proxy = RoundRobinProxy(port=self.frontend_port).start()
+        if self.server_type == "python":
+            self.command = [sys.executable, os.path.join(ROOT, "server-python", "app.py")]
+            return
+        if shutil.which("go") is None:
+            raise RuntimeError("O backend local do servidor Go precisa do compilador go")
+        binary = os.path.join(self.workdir, "server-go")
+        subprocess.run(
+            ["go", "build", "-o", binary, "."],
+            cwd=os.path.join(ROOT, "server-go"),
+            check=True,
+        )
+        self.command = [binary]
+
+    def _wait_listening(self, port, timeout=10.0):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+                return
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError(f"Servidor local não respondeu na porta {port}")
+
+    def _stop_servers(self):
+        for process in self.servers:
+            process.terminate()
+        for process in self.servers:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.servers = []
+
+    def scale(self, servers):
+        self._stop_servers()
+        for index in range(servers):
+            env = dict(
+                os.environ,
+                PORT=str(self.base_port + index),
+                CSV_FILE=self._csv_path(index),
+                SERVER_ID=f"local-{self.server_type}-{index}",
+            )
+            self.servers.append(
+                subprocess.Popen(
+                    self.command,
+                    env=env,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            )
+        for index in range(servers):
+            self._wait_listening(self.base_port + index)
+        if self.proxy:
+            self.proxy.set_backends(self._endpoints())
+
+    def reset(self):
+        reset_all(self._endpoints())
+
+    def _client_port(self, index):
+        if self.proxy:
+            return self.proxy.address[1]
+        return self.base_port + index % len(self.servers)
+
+    def run_clients(self, servers, clients, messages, iteration, run_id):
+        """Um processo por cliente, como os pods do Job; retorna as linhas de log"""
+        outputs = []
+        processes = []
+        for index in range(clients):
+            output = open(os.path.join(self.workdir, f"client-{index}.log"), "w+")
+            env = dict(
+                os.environ,
+                SERVER_HOST="127.0.0.1",
+                SERVER_PORT=str(self._client_port(index)),
+                JOB_COMPLETION_INDEX=str(index),
+                NUM_MENSAGENS=str(messages),
+                NUM_SERVERS=str(servers),
+                NUM_CLIENTES=str(clients),
+                ITERATION=str(iteration),
+                RUN_ID=run_id,
+                IMPLEMENTATION=self.server_type,
+            )
+            processes.append(
+                subprocess.Popen(
+                    [sys.executable, "app.py"],
+                    cwd=os.path.join(ROOT, "client"),
+                    env=env,
+                    stdout=output,
+                    stderr=subprocess.STDOUT,
+                )
+            )
+            outputs.append(output)
+
+        deadline = time.perf_counter() + job_timeout(clients, messages)
+        ok = True
+        for process in processes:
+            try:
+                ok = process.wait(timeout=max(deadline - time.perf_counter(), 0)) == 0 and ok
+            except subprocess.TimeoutExpired:
+                process.kill()
+                ok = False
+        lines = []
+        for output in outputs:
+            output.seek(0)
+            lines.extend(output.read().splitlines())
+            output.close()
+        return lines if ok else None
+
+    def sessions_per_client(self, messages):
+        # Os clientes herdam o ambiente deste processo
+        pipelining = os.getenv("USE_PIPELINING", "true").lower() == "true"
+        return sessions_per_client(messages, pipelining, _local_workload_spec())
+
+    def collect(self, expected_rows, run_id, timeout=COLLECT_TIMEOUT):
+        return collect_sessions(
+            self._endpoints(), run_id, expected_rows, timeout, DEFAULT_PARALLEL
+        )
+
+    def teardown(self):
+        self._stop_servers()
+        if self.proxy:
+            self.proxy.stop()
+        if self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def scenario_matrix(servers, clients, messages, iterations):
+    """(servidores, clientes, mensagens, iteração) na ordem dos laços do deploy.sh"""
+    return [
+        (s, c, m, i)
+        for s in servers
+        for c in clients
+        for m in messages
+        for i in range(1, iterations + 1)
+    ]
+
+
+def _scenario_id(servers, clients, messages, iteration=None):
+    base = f"s{servers}_c{clients}_m{messages}"
+    return base if iteration is None else f"{base}_i{iteration}"
+
+
+class Checkpoint:
+    """
+    Iterações concluídas (com os tempos de cada etapa) e cenários encerrados
+    pela regra adaptativa, gravados atomicamente depois de cada iteração.
+    committed guarda o tamanho do CSV de resultados e as linhas do
+    armazenamento até a última iteração confirmada: o que vier depois foi
+    gravado por uma iteração interrompida antes do checkpoint.
+    """
+
+    def __init__(self, path, server_type):
+        self.path = path
+        self.server_type = server_type
+        self.completed = {}
+        self.stopped = set()
+        self.committed = None
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        expected = (CHECKPOINT_VERSION, self.server_type)
+        if (data.get("version"), data.get("server_type")) != expected:
+            raise ValueError(f"Checkpoint incompatível: {self.path}")
+        self.completed = data["completed"]
+        self.stopped = set(data["stopped"])
+        self.committed = data.get("committed")
+        return True
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": CHECKPOINT_VERSION,
+                    "server_type": self.server_type,
+                    "completed": self.completed,
+                    "stopped": sorted(self.stopped),
+                    "committed": self.committed,
+                },
+                f,
+            )
+        os.replace(tmp, self.path)
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+class Sweep:
+    """Percorre a matriz de cenários gravando CSV, armazenamento e relatórios"""
+
+    def __init__(self, backend, matrix, args):
+        self.backend = backend
+        self.matrix = matrix
+        self.args = args
+        self.implementation = implementation_name(args.server_type)
+        self.results_file = args.output or f"requests_{args.server_type}.csv"
+        self.reports_dir = os.path.join("client_reports", args.server_type)
+        self.store = ResultStore(os.path.join("results_store", args.server_type))
+        self.checkpoint = Checkpoint(
+            args.checkpoint or f".orchestrator_{args.server_type}.json", args.server_type
+        )
+
+    def _start_fresh(self):
+        """Mesma limpeza do início do deploy.sh"""
+        with open(self.results_file, "w", encoding="utf-8") as f:
+            f.write(CSV_HEADER + "\n")
+        shutil.rmtree(self.reports_dir, ignore_errors=True)
+        shutil.rmtree(self.store.path, ignore_errors=True)
+        self.store = ResultStore(self.store.path)
+        self._commit()
+
+    def _commit(self):
+        """Marca o CSV e o armazenamento atuais como confirmados (no próximo save)"""
+        self.checkpoint.committed = {
+            "results_bytes": os.path.getsize(self.results_file),
+            "store_rows": self.store.rows,
+        }
+
+    def _rollback(self):
+        """
+        Descarta as linhas gravadas depois do último checkpoint, para que a
+        iteração interrompida não fique duplicada ao ser executada de novo
+        """
+        committed = self.checkpoint.committed
+        if committed is None:
+            return
+        dropped = 0
+        if os.path.exists(self.results_file):
+            with open(self.results_file, "r+b") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size > committed["results_bytes"]:
+                    f.seek(committed["results_bytes"])
+                    dropped = f.read().count(b"\n")
+                    f.truncate(committed["results_bytes"])
+        self.store.truncate(committed["store_rows"])
+        if dropped:
+            print(f"🧹 {dropped} linhas de uma iteração não confirmada descartadas")
+
+    def _store_rows(self, rows, iteration):
+        """Acrescenta as linhas ao CSV de resultados e ao armazenamento binário"""
+        with open(self.results_file, "a", encoding="utf-8") as f:
+            f.write("\n".join(rows) + "\n")
+        df = standardize(
+            read_results_csv(io.StringIO("\n".join(rows)), header=False),
+            self.implementation,
+        )
+        df["iteration"] = iteration
+        self.store.append(df)
+
+    def _converged(self, servers, clients, messages):
+        records = self.store.select(
+            servers=servers,
+            clients=clients,
+            messages=messages,
+            implementation=self.implementation,
+        )
+        stop, _ = should_stop(
+            iteration_means(records),
+            self.args.min_iterations,
+            self.matrix["iterations"],
+            self.args.precision,
+            self.args.confidence,
+        )
+        return stop
+
+    def _run_iteration(self, servers, clients, messages, iteration):
+        timings = dict.fromkeys(STEPS, 0.0)
+
+        def step(name, function, *args):
+            start = time.perf_counter()
+            value = function(*args)
+            timings[name] += time.perf_counter() - start
+            return value
+
+        # O cenário vai nas tags de sessão dos clientes (os servidores não são
+        # reiniciados); o run_id separa as linhas desta execução
+        scenario_id = _scenario_id(servers, clients, messages, iteration)
+        run_id = f"{self.args.server_type}-{scenario_id}-{time.time_ns()}"
+        step("reset", self.backend.reset)
+        reports = step(
+            "clients",
+            self.backend.run_clients,
+            servers,
+            clients,
+            messages,
+            iteration,
+            run_id,
+        )
+        if reports is None:
+            return None, timings
+        sessions = clients * self.backend.sessions_per_client(messages)
+        text = step("collect", self.backend.collect, sessions, run_id)
+        rows = normalize_rows(text, servers, clients, messages, run_id)
+        if rows:
+            step("store", self._store_rows, rows, iteration)
+
+        os.makedirs(self.reports_dir, exist_ok=True)
+        report_path = os.path.join(self.reports_dir, scenario_id + ".jsonl")
+        with open(report_path, "w", encoding="utf-8") as f:
+            for line in reports:
+                if line.startswith("RUN_REPORT_JSON "):
+                    f.write(line.split(" ", 1)[1] + "\n")
+        return len(rows), timings
+
+    def run(self):
+        scenarios = scenario_matrix(
+            self.matrix["servers"],
+            self.matrix["clients"],
+            self.matrix["messages"],
+            self.matrix["iterations"],
+        )
+        if self.args.resume and self.checkpoint.load():
+            print(
+                f"⏯️  Retomando de {self.checkpoint.path}: "
+                f"{len(self.checkpoint.completed)} iterações já concluídas"
+            )
+            self._rollback()
+        else:
+            self._start_fresh()
+            self.checkpoint.save()
+
+        pending = [
+            scenario
+            for scenario in scenarios
+            if _scenario_id(*scenario) not in self.checkpoint.completed
+        ]
+        print(
+            f"📋 {len(scenarios)} iterações na matriz, {len(pending)} a executar "
+            f"(backend {self.backend.name})"
+        )
+
+        totals = dict.fromkeys(STEPS, 0.0)
+        sweep_start = time.perf_counter()
+        done = 0
+        current_servers = None
+        self.backend.setup()
+        try:
+            for servers, clients, messages, iteration in pending:
+                done += 1
+                if _scenario_id(servers, clients, messages) in self.checkpoint.stopped:
+                    continue
+                if servers != current_servers:
+                    print(f"--- Escalando para {servers} servidores ---")
+                    self.backend.scale(servers)
+                    current_servers = servers
+
+                start = time.perf_counter()
+                rows, timings = self._run_iteration(servers, clients, messages, iteration)
+                elapsed = time.perf_counter() - start
+                for name, seconds in timings.items():
+                    totals[name] += seconds
+
+                label = f"{servers} serv, {clients} cli, {messages} msg, iteração {iteration}"
+                if rows is None:
+                    # Não entra no checkpoint: uma retomada tenta de novo
+                    print(f"[{done}/{len(pending)}] ❌ {label}: clientes falharam ou expiraram")
+                    continue
+
+                key = _scenario_id(servers, clients, messages, iteration)
+                self.checkpoint.completed[key] = {
+                    "rows": rows,
+                    "seconds": round(elapsed, 3),
+                    **{name: round(seconds, 3) for name, seconds in timings.items()},
+                }
+                converged = self.args.adaptive and self._converged(servers, clients, messages)
+                if converged:
+                    self.checkpoint.stopped.add(_scenario_id(servers, clients, messages))
+                self._commit()
+                self.checkpoint.save()
+
+                steps = " | ".join(
+                    f"{name} {seconds:.1f}s" for name, seconds in timings.items() if seconds
+                )
+                rate = (time.perf_counter() - sweep_start) / done
+                eta = _format_duration(rate * (len(pending) - done))
+                print(
+                    f"[{done}/{len(pending)}] ✅ {label}: {rows} linhas em {elapsed:.1f}s "
+                    f"({steps}) | restante ~{eta}"
+                )
+                if converged and iteration < self.matrix["iterations"]:
+                    print("   🎯 Média convergiu; iterações restantes do cenário puladas")
+        except KeyboardInterrupt:
+            print(f"\n⏸️  Interrompido; retome com --resume ({self.checkpoint.path})")
+            return 130
+        finally:
+            self.backend.teardown()
+
+        total = time.perf_counter() - sweep_start
+        print(f"\n⏱️  Tempo total: {_format_duration(total)}")
+        for name in STEPS:
+            share = totals[name] / total * 100 if total else 0
+            print(f"   {name:<10} {totals[name]:8.1f}s ({share:.0f}%)")
+        print(f"📁 Resultados em {self.results_file} e {self.store.path}")
+        self._merge_reports()
+        return 0
+
+    def _merge_reports(self):
+        """Combina os relatórios JSON dos clientes (client/report.py)"""
+        reports = sorted(glob.glob(os.path.join(self.reports_dir, "*.jsonl")))
+        merged = os.path.join("client_reports", f"{self.args.server_type}_merged.json")
+        result = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "client", "report.py"), *reports]
+            + ["--output", merged],
+            capture_output=True,
+        )
+        if reports and result.returncode == 0:
+            print(f"📑 Relatório combinado dos clientes: {merged}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Executa a matriz de cenários no kind ou em processos locais"
+    )
+    parser.add_argument("server_type", choices=["python", "go"])
+    parser.add_argument("--backend", choices=["k8s", "local"], default="k8s")
+    parser.add_argument(
+        "--frontend",
+        choices=FRONTENDS,
+        default="proxy",
+        help="Backend local: front end em rodízio (padrão) ou clientes direto nas portas",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="Matriz reduzida do deploy-quick.sh"
+    )
+    parser.add_argument("--servers", type=int, nargs="+", help="Réplicas de servidor")
+    parser.add_argument("--clients", type=int, nargs="+", help="Clientes simultâneos")
+    parser.add_argument("--messages", type=int, nargs="+", help="Mensagens por cliente")
+    parser.add_argument("--iterations", type=int, help="Iterações (máximo, com --adaptive)")
+    parser.add_argument(
+        "--resume", action="store_true", help="Continua a partir do checkpoint"
+    )
+    parser.add_argument(
+        "--checkpoint", help="Arquivo de checkpoint (padrão: .orchestrator_<tipo>.json)"
+    )
+    parser.add_argument("--output", help="CSV de resultados (padrão: requests_<tipo>.csv)")
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=DEFAULT_PARALLEL,
+        help="Operações kubectl simultâneas por etapa (padrão: 16)",
+    )
+    parser.add_argument(
+        "--build", action="store_true", help="Constrói e carrega as imagens no kind"
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Para cada cenário quando o IC da média converge (ver adaptive.py)",
+    )
+    parser.add_argument("--min-iterations", type=int, default=DEFAULT_MIN_ITERATIONS)
+    parser.add_argument("--precision", type=float, default=DEFAULT_PRECISION)
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    matrix = dict(QUICK_MATRIX if args.quick else FULL_MATRIX)
+    for key in ("servers", "clients", "messages", "iterations"):
+        if getattr(args, key) is not None:
+            matrix[key] = getattr(args, key)
+
+    if args.backend == "k8s":
+        backend = KubernetesBackend(args.server_type, args.parallel, args.build)
+    else:
+        backend = LocalBackend(args.server_type, frontend=args.frontend)
+    try:
+        return Sweep(backend, matrix, args).run()
+    except (RuntimeError, ValueError, subprocess.CalledProcessError) as e:
+        print(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
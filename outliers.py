@@ -0,0 +1,66 @@
+# Filtragem vetorizada de outliers por cenário (z-score, MAD e IQR)
+import numpy as np
+
+METHOD_ZSCORE = "zscore"
+METHOD_MAD = "mad"
+METHOD_IQR = "iqr"
+METHODS = (METHOD_ZSCORE, METHOD_MAD, METHOD_IQR)
+
+# Limiares usuais de cada método
+DEFAULT_THRESHOLDS = {
+    METHOD_ZSCORE: 3.0,  # |x - média| / desvio padrão
+    METHOD_MAD: 3.5,  # z-score modificado de Iglewicz e Hoaglin
+    METHOD_IQR: 1.5,  # distância fora de [Q1, Q3] em múltiplos do IQR
+}
+
+# Fator que torna o MAD um estimador consistente do desvio padrão
+MAD_SCALE = 0.6745
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator, com 0 onde o denominador é 0 ou NaN"""
+    numerator = numerator.to_numpy(dtype="float64")
+    denominator = denominator.to_numpy(dtype="float64")
+    valid = denominator > 0  # NaN > 0 também é False
+    scores = np.zeros(len(numerator))
+    np.divide(numerator, denominator, out=scores, where=valid)
+    return scores
+
+
+def outlier_scores(df, by, column="response_time", method=METHOD_ZSCORE):
+    """
+    Calcula o score de outlier de cada linha dentro do seu grupo.
+    Usa apenas reduções nativas do groupby (transform("mean"), ("std"),
+    ("median"), ("quantile")), sem chamar funções Python por grupo.
+    Grupos sem dispersão (desvio, MAD ou IQR zero) recebem score 0, como
+    na implementação original com lambda.
+    """
+    grouped = df.groupby(by, sort=False, observed=True)[column]
+    values = df[column]
+
+    if method == METHOD_ZSCORE:
+        deviation = (values - grouped.transform("mean")).abs()
+        return _ratio(deviation, grouped.transform("std"))
+
+    if method == METHOD_MAD:
+        deviation = (values - grouped.transform("median")).abs()
+        mad = deviation.groupby(
+            [df[key] for key in by], sort=False, observed=True
+        ).transform("median")
+        return MAD_SCALE * _ratio(deviation, mad)
+
+    if method == METHOD_IQR:
+        q1 = grouped.transform("quantile", 0.25)
+        q3 = grouped.transform("quantile", 0.75)
+        distance = np.maximum(np.maximum(q1 - values, values - q3), 0)
+        return _ratio(distance, q3 - q1)
+
+    raise ValueError(f"Método de outlier desconhecido: {method} (use {', '.join(METHODS)})")
+
+
+def filter_outliers(df, by, column="response_time", method=METHOD_ZSCORE, threshold=None):
+    """Remove as linhas cujo score de outlier no seu grupo passa do limiar"""
+    if threshold is None:
+        threshold = DEFAULT_THRESHOLDS[method]
+    scores = outlier_scores(df, by, column, method)
+    return df[scores <= threshold]
@@ -0,0 +1,303 @@
+# Detecção de regressões: linhas de base dos resultados e testes por cenário
+import json
+import os
+import shutil
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy.stats import mannwhitneyu, ttest_ind
+
+from analysis_data import SCENARIO_KEYS, load_results, load_store_results
+from outliers import METHOD_ZSCORE
+from result_store import ResultStore, import_csv
+from timeline import RUN_KEYS
+
+BASELINE_DIR = os.getenv("BASELINE_DIR", "baselines")
+BASELINE_META = "baseline.json"
+
+DEFAULT_ALPHA = 0.05
+# Variação relativa mínima da mediana para contar como regressão/melhoria
+DEFAULT_THRESHOLD = 0.05
+CORRECTION_HOLM = "holm"
+CORRECTION_BH = "bh"
+CORRECTIONS = [CORRECTION_HOLM, CORRECTION_BH]
+
+STATUS_REGRESSED = "regressao"
+STATUS_IMPROVED = "melhoria"
+STATUS_UNCHANGED = "inalterado"
+
+
+def _store_dirs(path):
+    """Um armazenamento (result_store.py) por implementação, como no deploy.sh"""
+    return [os.path.join(path, "python"), os.path.join(path, "go")]
+
+
+def baseline_path(name, baseline_dir=BASELINE_DIR):
+    """
+    Diretório de uma linha de base. O nome vira um único componente do
+    caminho (save_baseline apaga esse diretório ao substituir), então não
+    pode ser vazio, "."/".." nem conter separadores.
+    """
+    separators = {os.sep, os.altsep} - {None}
+    if not name or name in (".", "..") or any(sep in name for sep in separators):
+        raise ValueError(f"Nome de linha de base inválido: {name!r}")
+    return os.path.join(baseline_dir, name)
+
+
+def save_baseline(name, file_py, file_go, baseline_dir=BASELINE_DIR, overwrite=False):
+    """
+    Copia os CSVs atuais para baseline_dir/<name>, em armazenamentos binários
+    (com a iteração de cada linha) e um baseline.json com a origem e a data.
+    Retorna o caminho da linha de base. Lança ValueError para um nome
+    inválido (ver baseline_path).
+    """
+    path = baseline_path(name, baseline_dir)
+    if os.path.exists(path) and not overwrite:
+        raise FileExistsError(17, "Linha de base já existe", path)
+
+    # Monta num diretório temporário: uma importação interrompida não deixa
+    # uma linha de base pela metade
+    tmp = f"{path}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    rows = {}
+    for (implementation, source), store_dir in zip(
+        (("Python", file_py), ("Go", file_go)), _store_dirs(tmp)
+    ):
+        rows[implementation] = import_csv(ResultStore(store_dir), source, implementation)
+    meta = {
+        "name": name,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "sources": {"Python": file_py, "Go": file_go},
+        "rows": rows,
+    }
+    with open(os.path.join(tmp, BASELINE_META), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return path
+
+
+def list_baselines(baseline_dir=BASELINE_DIR):
+    """Metadados das linhas de base salvas, da mais recente para a mais antiga"""
+    rows = []
+    if os.path.isdir(baseline_dir):
+        for name in os.listdir(baseline_dir):
+            meta_path = os.path.join(baseline_dir, name, BASELINE_META)
+            if not os.path.exists(meta_path):
+                continue
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            rows.append(
+                {
+                    "name": meta["name"],
+                    "created": meta["created"],
+                    "python_rows": meta["rows"]["Python"],
+                    "go_rows": meta["rows"]["Go"],
+                }
+            )
+    columns = ["name", "created", "python_rows", "go_rows"]
+    return pd.DataFrame(rows, columns=columns).sort_values("created", ascending=False)
+
+
+def load_baseline(
+    name, baseline_dir=BASELINE_DIR, outlier_method=METHOD_ZSCORE, exclude_unsteady=False
+):
+    """ResultsData de uma linha de base salva (ver save_baseline)"""
+    path = baseline_path(name, baseline_dir)
+    if not os.path.exists(os.path.join(path, BASELINE_META)):
+        raise FileNotFoundError(2, "Linha de base não encontrada", path)
+    return load_store_results(_store_dirs(path), outlier_method, exclude_unsteady)
+
+
+def adjust_pvalues(p_values, method=CORRECTION_HOLM):
+    """
+    p-valores corrigidos para comparações múltiplas: Holm (controla a taxa de
+    erro por família) ou Benjamini-Hochberg (controla a taxa de falsas
+    descobertas). NaN (cenários sem teste) ficam fora da família.
+    """
+    if method not in CORRECTIONS:
+        raise ValueError(f"Correção deve ser uma de: {', '.join(CORRECTIONS)}")
+    p_values = np.asarray(p_values, dtype="float64")
+    adjusted = np.full(len(p_values), np.nan)
+    tested = np.flatnonzero(~np.isnan(p_values))
+    m = len(tested)
+    if m == 0:
+        return adjusted
+
+    order = tested[np.argsort(p_values[tested], kind="stable")]
+    ranked = p_values[order]
+    rank = np.arange(1, m + 1)
+    if method == CORRECTION_HOLM:
+        values = np.maximum.accumulate((m - rank + 1) * ranked)
+    else:
+        values = np.minimum.accumulate((ranked * m / rank)[::-1])[::-1]
+    adjusted[order] = np.minimum(values, 1.0)
+    return adjusted
+
+
+def iteration_medians(results):
+    """
+    Mediana do tempo de resposta de cada (cenário, iteração). As iterações
+    são as replicações independentes; as sessões de uma mesma iteração
+    disputam os mesmos servidores e não são amostras independentes (como
+    no IC de adaptive.py).
+    """
+    return (
+        results.cleaned.groupby(RUN_KEYS, observed=True)["response_time"]
+        .median()
+        .reset_index()
+    )
+
+
+def compare_results(
+    baseline,
+    candidate,
+    alpha=DEFAULT_ALPHA,
+    threshold=DEFAULT_THRESHOLD,
+    correction=CORRECTION_HOLM,
+):
+    """
+    Compara cada cenário presente nos dois ResultsData pelas medianas por
+    iteração (iteration_medians): teste t de Welch bilateral, com os
+    p-valores corrigidos por adjust_pvalues. Cenários com menos de 2
+    iterações em algum dos lados ficam sem teste (p-valor NaN). change é a
+    variação relativa da mediana das medianas por iteração (candidata vs.
+    linha de base) e rank_biserial o tamanho do efeito entre as iterações
+    (> 0: candidata mais lenta). status é regressao/melhoria quando o
+    p-valor corrigido fica abaixo de alpha e |change| passa de threshold;
+    inalterado caso contrário.
+    """
+    base = iteration_medians(baseline)
+    cand = iteration_medians(candidate)
+    base_rows = base.groupby(SCENARIO_KEYS, observed=True).indices
+    cand_rows = cand.groupby(SCENARIO_KEYS, observed=True).indices
+    base_times = base["response_time"].to_numpy(dtype="float64")
+    cand_times = cand["response_time"].to_numpy(dtype="float64")
+
+    rows = []
+    for keys in sorted(base_rows.keys() & cand_rows.keys()):
+        x = cand_times[cand_rows[keys]]
+        y = base_times[base_rows[keys]]
+        p_value = np.nan
+        if len(x) >= 2 and len(y) >= 2:
+            with warnings.catch_warnings():
+                # Iterações quase idênticas: aviso de perda de precisão do scipy
+                warnings.simplefilter("ignore", RuntimeWarning)
+                p_value = ttest_ind(x, y, equal_var=False).pvalue
+        statistic, _ = mannwhitneyu(x, y, alternative="two-sided")
+        base_median = np.median(y)
+        cand_median = np.median(x)
+        rows.append(
+            (
+                *keys,
+                len(y),
+                len(x),
+                base_median,
+                cand_median,
+                cand_median / base_median - 1 if base_median > 0 else np.nan,
+                2 * statistic / (len(x) * len(y)) - 1,
+                p_value,
+            )
+        )
+    comparison = pd.DataFrame(
+        rows,
+        columns=[
+            *SCENARIO_KEYS,
+            "baseline_iterations",
+            "candidate_iterations",
+            "baseline_median",
+            "candidate_median",
+            "change",
+            "rank_biserial",
+            "p_value",
+        ],
+    )
+    comparison["p_adjusted"] = adjust_pvalues(comparison["p_value"], correction)
+
+    significant = comparison["p_adjusted"] < alpha
+    comparison["status"] = np.select(
+        [
+            significant & (comparison["change"] > threshold),
+            significant & (comparison["change"] < -threshold),
+        ],
+        [STATUS_REGRESSED, STATUS_IMPROVED],
+        default=STATUS_UNCHANGED,
+    )
+    comparison.attrs["baseline_only"] = len(base_rows.keys() - cand_rows.keys())
+    comparison.attrs["candidate_only"] = len(cand_rows.keys() - base_rows.keys())
+    comparison.attrs["untested"] = int(comparison["p_value"].isna().sum())
+    return comparison
+
+
+def _scenario_lines(changes, icon):
+    """Uma linha de texto por cenário, do maior para o menor |change|"""
+    changes = changes.reindex(changes["change"].abs().sort_values(ascending=False).index)
+    return [
+        f"   {icon} {row.implementation} | {row.servers} serv, {row.clients} cli, "
+        f"{row.messages} msg | mediana {row.baseline_median:.4f}s → "
+        f"{row.candidate_median:.4f}s ({row.change:+.1%}) | p={row.p_adjusted:.2g}"
+        for row in changes.itertuples()
+    ]
+
+
+def check_regressions(
+    file_py,
+    file_go,
+    baseline,
+    candidate=None,
+    alpha=DEFAULT_ALPHA,
+    threshold=DEFAULT_THRESHOLD,
+    correction=CORRECTION_HOLM,
+    baseline_dir=BASELINE_DIR,
+    exclude_unsteady=False,
+    output_csv=None,
+):
+    """
+    Compara os CSVs atuais (ou a linha de base `candidate`) com a linha de
+    base `baseline` e lista os cenários que pioraram ou melhoraram.
+    Retorna a tabela de compare_results.
+    """
+    print(f"📂 Carregando linha de base '{baseline}'...")
+    base_results = load_baseline(baseline, baseline_dir, exclude_unsteady=exclude_unsteady)
+    if candidate is None:
+        print(f"📂 Carregando resultados atuais ({file_py}, {file_go})...")
+        cand_results = load_results(file_py, file_go, exclude_unsteady=exclude_unsteady)
+    else:
+        print(f"📂 Carregando linha de base '{candidate}' como candidata...")
+        cand_results = load_baseline(
+            candidate, baseline_dir, exclude_unsteady=exclude_unsteady
+        )
+
+    comparison = compare_results(base_results, cand_results, alpha, threshold, correction)
+    counts = comparison["status"].value_counts()
+    print(
+        f"\n🔬 {len(comparison)} cenários comparados (t de Welch nas medianas por "
+        f"iteração, correção {correction}, α={alpha}, limiar ±{threshold:.0%} na mediana)"
+    )
+    if comparison.attrs["untested"]:
+        print(
+            f"⚠️  {comparison.attrs['untested']} cenário(s) com menos de 2 iterações "
+            "num dos lados, sem teste"
+        )
+    unmatched = (("baseline_only", "só na linha de base"), ("candidate_only", "só na candidata"))
+    for key, label in unmatched:
+        if comparison.attrs[key]:
+            print(f"⚠️  {comparison.attrs[key]} cenário(s) {label}, não comparados")
+
+    regressed = comparison[comparison["status"] == STATUS_REGRESSED]
+    improved = comparison[comparison["status"] == STATUS_IMPROVED]
+    print(f"\n🔺 Regressões: {counts.get(STATUS_REGRESSED, 0)}")
+    for line in _scenario_lines(regressed, "🔺"):
+        print(line)
+    print(f"\n🟢 Melhorias: {counts.get(STATUS_IMPROVED, 0)}")
+    for line in _scenario_lines(improved, "🟢"):
+        print(line)
+    print(f"\n⚪ Sem mudança significativa: {counts.get(STATUS_UNCHANGED, 0)}")
+
+    if output_csv:
+        comparison.to_csv(output_csv, index=False)
+        print(f"\n💾 Comparação completa salva em {output_csv}")
+    return comparison
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# Armazenamento colunar/binário dos resultados, indexado por cenário
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from results_csv import read_results_csv, standardize
+
+STORE_DIR = os.getenv("RESULT_STORE_DIR", "results_store")
+STORE_VERSION = 1
+
+# Uma linha por sessão de cliente. IDs de cliente/servidor são índices na
+# tabela de strings (strings.json); a implementação, em IMPLEMENTATION_NAMES.
+RECORD_DTYPE = np.dtype(
+    [
+        ("client_id", "<u4"),
+        ("message_id", "<i4"),
+        ("server_id", "<u4"),
+        ("client_send_time", "<f8"),
+        ("server_processing_time", "<f4"),
+        ("client_receive_time", "<f8"),
+        ("response_time", "<f8"),
+        ("servers", "<i2"),
+        ("clients", "<i2"),
+        ("messages", "<i4"),
+        ("implementation", "<u1"),
+        ("iteration", "<i2"),
+    ]
+)
+
+INDEX_KEYS = ["servers", "clients", "messages", "implementation", "iteration"]
+STRING_COLUMNS = ["client_id", "server_id"]
+IMPLEMENTATION_NAMES = ["Python", "Go"]
+
+
+class ResultStore:
+    """
+    Diretório com:
+      data.bin     registros RECORD_DTYPE concatenados (apenas append)
+      index.json   segmentos contíguos de cada (servers, clients, messages,
+                   implementation, iteration) -> [start, stop) em data.bin
+      strings.json tabela de strings (IDs de cliente/servidor)
+    Os dados são lidos via np.memmap, copiando só os segmentos selecionados.
+    """
+
+    def __init__(self, path=STORE_DIR):
+        self.path = path
+        self.data_path = os.path.join(path, "data.bin")
+        self.index_path = os.path.join(path, "index.json")
+        self.strings_path = os.path.join(path, "strings.json")
+
+        index = self._read_json(self.index_path, {})
+        if index and index.get("version") != STORE_VERSION:
+            raise ValueError(f"Versão do armazenamento não suportada em {path}")
+        self.rows = index.get("rows", 0)
+        self.segments = index.get("segments", [])
+        self.strings = self._read_json(self.strings_path, [])
+        self._string_ids = {value: i for i, value in enumerate(self.strings)}
+
+    @staticmethod
+    def _read_json(path, default):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+
+    @staticmethod
+    def _write_json(path, data):
+        # Escrita atômica: um append interrompido não corrompe o índice
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def _intern(self, values):
+        """Códigos da tabela de strings para uma coluna (acrescenta as novas)"""
+        categorical = pd.Categorical(values)
+        codes = np.empty(len(categorical.categories), dtype="<u4")
+        for i, value in enumerate(categorical.categories):
+            code = self._string_ids.get(value)
+            if code is None:
+                code = self._string_ids[value] = len(self.strings)
+                self.strings.append(value)
+            codes[i] = code
+        result = codes[categorical.codes]
+        missing = categorical.codes < 0
+        if missing.any():
+            # ID ausente ("unknown") aponta para a string vazia
+            result[missing] = self._intern([""])[0]
+        return result
+
+    def append(self, df):
+        """
+        Acrescenta um DataFrame padronizado (ver results_csv.standardize) com a
+        coluna "iteration". As linhas são agrupadas por cenário/iteração, e
+        cada grupo vira um segmento contíguo no índice.
+        """
+        if df.empty:
+            return 0
+        df = df.sort_values(INDEX_KEYS, kind="stable")
+
+        records = np.zeros(len(df), dtype=RECORD_DTYPE)
+        for column in STRING_COLUMNS:
+            records[column] = self._intern(df[column])
+        implementation = pd.Categorical(df["implementation"], categories=IMPLEMENTATION_NAMES)
+        if (implementation.codes < 0).any():
+            raise ValueError(f"Implementação deve ser uma de: {', '.join(IMPLEMENTATION_NAMES)}")
+        records["implementation"] = implementation.codes
+        for column in RECORD_DTYPE.names:
+            if column in STRING_COLUMNS or column == "implementation":
+                continue
+            values = df[column].to_numpy(dtype="float64", na_value=np.nan)
+            if np.issubdtype(RECORD_DTYPE[column], np.integer):
+                values = np.nan_to_num(values, nan=-1)
+            records[column] = values
+
+        # Limites de cada grupo (linhas já ordenadas pelas chaves)
+        keys = df[INDEX_KEYS].reset_index(drop=True)
+        changed = (keys != keys.shift()).any(axis=1).to_numpy()
+        starts = np.flatnonzero(changed)
+        stops = np.append(starts[1:], len(df))
+
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.data_path, "ab") as f:
+            # Descarta restos de um append anterior que não chegou ao índice
+            f.truncate(self.rows * RECORD_DTYPE.itemsize)
+            f.seek(self.rows * RECORD_DTYPE.itemsize)
+            records.tofile(f)
+
+        for start, stop in zip(starts, stops):
+            segment = {key: keys.at[start, key] for key in INDEX_KEYS}
+            segment = {
+                key: value if key == "implementation" else int(value)
+                for key, value in segment.items()
+            }
+            segment.update(start=self.rows + int(start), stop=self.rows + int(stop))
+            self.segments.append(segment)
+        self.rows += len(records)
+
+        self._write_json(self.strings_path, self.strings)
+        self._write_json(
+            self.index_path,
+            {"version": STORE_VERSION, "rows": self.rows, "segments": self.segments},
+        )
+        return len(records)
+
+    def truncate(self, rows):
+        """
+        Descarta os registros a partir de rows, desfazendo appends que quem
+        chamou não chegou a confirmar. rows precisa cair entre segmentos.
+        Retorna as linhas descartadas.
+        """
+        if rows >= self.rows:
+            return 0
+        if any(segment["start"] < rows < segment["stop"] for segment in self.segments):
+            raise ValueError(f"{rows} cai no meio de um segmento de {self.path}")
+        dropped = self.rows - rows
+        self.segments = [segment for segment in self.segments if segment["stop"] <= rows]
+        self.rows = rows
+        self._write_json(
+            self.index_path,
+            {"version": STORE_VERSION, "rows": self.rows, "segments": self.segments},
+        )
+        with open(self.data_path, "r+b") as f:
+            f.truncate(self.rows * RECORD_DTYPE.itemsize)
+        return dropped
+
+    def scenarios(self):
+        """Índice como DataFrame: uma linha por segmento, com o número de linhas"""
+        index = pd.DataFrame(self.segments, columns=INDEX_KEYS + ["start", "stop"])
+        index["rows"] = index["stop"] - index["start"]
+        return index
+
+    def select(self, **filters):
+        """
+        Registros (array estruturado) dos segmentos cujas chaves batem com os
+        filtros, ex.: select(messages=100, implementation="Go").
+        Um filtro pode ser um valor ou uma lista de valores.
+        """
+        unknown = set(filters) - set(INDEX_KEYS)
+        if unknown:
+            raise ValueError(f"Filtros desconhecidos: {', '.join(sorted(unknown))}")
+        if not self.rows:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+
+        wanted = {
+            key: set(value) if isinstance(value, (list, tuple, set)) else {value}
+            for key, value in filters.items()
+            if value is not None
+        }
+        data = np.memmap(self.data_path, dtype=RECORD_DTYPE, mode="r", shape=(self.rows,))
+        slices = [
+            data[segment["start"] : segment["stop"]]
+            for segment in self.segments
+            if all(segment[key] in values for key, values in wanted.items())
+        ]
+        if not slices:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.concatenate(slices)
+
+    def to_frame(self, records):
+        """Converte registros em DataFrame com as colunas de results_csv.standardize"""
+        df = pd.DataFrame({name: records[name] for name in RECORD_DTYPE.names})
+        categories = pd.Index(self.strings)
+        for column in STRING_COLUMNS:
+            df[column] = pd.Categorical.from_codes(
+                records[column].astype("int64"), categories=categories
+            ).remove_unused_categories()
+        df["implementation"] = np.asarray(IMPLEMENTATION_NAMES)[records["implementation"]]
+        return df
+
+    def load(self, **filters):
+        """DataFrame só com os cenários selecionados (ver select)"""
+        return self.to_frame(self.select(**filters))
+
+
+def implementation_name(value):
+    """"python"/"go" (como no deploy.sh) -> "Python"/"Go" (como nas análises)"""
+    for name in IMPLEMENTATION_NAMES:
+        if name.lower() == value.lower():
+            return name
+    raise ValueError(f"Implementação desconhecida: {value}")
+
+
+def derive_iterations(df):
+    """
+    Iteração de cada linha de um CSV completo, que não registra a iteração:
+    o deploy.sh acrescenta as iterações de um cenário em sequência, com uma
+    linha por cliente, então iteração = posição no cenário // clientes + 1.
+    """
+    keys = ["servers", "clients", "messages", "implementation"]
+    rank = df.groupby(keys, sort=False, observed=True).cumcount().to_numpy()
+    return rank // df["clients"].to_numpy() + 1
+
+
+def import_csv(store, path, implementation, iteration=None, header=True):
+    """Importa um CSV de resultados para o armazenamento; retorna as linhas gravadas"""
+    df = standardize(read_results_csv(path, header=header), implementation)
+    df["iteration"] = derive_iterations(df) if iteration is None else iteration
+    return store.append(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Armazenamento binário dos resultados, indexado por cenário"
+    )
+    parser.add_argument("--store", default=STORE_DIR, help="Diretório do armazenamento")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Importa CSVs de resultados")
+    import_parser.add_argument("csv", nargs="+", help="Arquivos CSV (requests_<tipo>.csv)")
+    import_parser.add_argument(
+        "--implementation",
+        help="python ou go (padrão: deduzido do nome do arquivo, requests_<tipo>.csv)",
+    )
+    import_parser.add_argument(
+        "--iteration",
+        type=int,
+        help="Iteração de todas as linhas (padrão: deduzida da ordem das linhas)",
+    )
+    import_parser.add_argument(
+        "--no-header", action="store_true", help="Linhas sem cabeçalho (arquivos do deploy.sh)"
+    )
+
+    subparsers.add_parser("list", help="Lista os cenários armazenados")
+    args = parser.parse_args()
+
+    store = ResultStore(args.store)
+
+    if args.command == "import":
+        for path in args.csv:
+            implementation = args.implementation
+            if implementation is None:
+                name = os.path.splitext(os.path.basename(path))[0]
+                implementation = name.rsplit("_", 1)[-1]
+            try:
+                implementation = implementation_name(implementation)
+            except ValueError as e:
+                print(f"❌ {path}: {e}")
+                sys.exit(1)
+            rows = import_csv(
+                store,
+                path,
+                implementation,
+                iteration=args.iteration,
+                header=not args.no_header,
+            )
+            print(f"💾 {path}: {rows:,} linhas importadas para {args.store}")
+        return
+
+    index = store.scenarios()
+    if index.empty:
+        print(f"📭 Nenhum resultado em {args.store}")
+        return
+    summary = index.groupby(INDEX_KEYS[:-1]).agg(
+        iterations=("iteration", "nunique"), rows=("rows", "sum")
+    )
+    print(summary.to_string())
+    print(f"\n📊 {store.rows:,} linhas, {len(summary)} cenários")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Leitura tipada dos CSVs de resultados gerados pelos servidores
+import pandas as pd
+
+COLUMNS = [
+    "client_id",
+    "message_id",
+    "server_id",
+    "client_send_time",
+    "server_processing_time",
+    "client_receive_time",
+    "response_time",
+    "num_servers",
+    "num_clients",
+    "num_messages",
+]
+
+# Colunas que os servidores acrescentam a cada sessão a partir das tags do
+# cliente (MSG_SESSION_OPEN). Servem para separar as linhas de cada execução
+# na coleta; os CSVs de resultados consolidados mantêm só COLUMNS.
+SESSION_TAG_COLUMNS = ["iteration", "run_id"]
+
+# Tipos explícitos: evita a inferência do pandas e as strings repetidas dos
+# IDs (client_1_NNNN e nomes de pod se repetem muito -> category).
+# Os inteiros são lidos como float32 (exato até 2^24, aceita o NaN de
+# "unknown" e é bem mais rápido de parsear que os inteiros anuláveis do
+# pandas); standardize() converte as chaves para inteiros pequenos.
+# Tempos de época e response_time ficam em float64 (float32 perderia os
+# microssegundos); o tempo de processamento (alguns ms) cabe em float32.
+DTYPES = {
+    "client_id": "category",
+    "message_id": "float32",
+    "server_id": "category",
+    "client_send_time": "float64",
+    "server_processing_time": "float32",
+    "client_receive_time": "float64",
+    "response_time": "float64",
+    "num_servers": "float32",
+    "num_clients": "float32",
+    "num_messages": "float32",
+}
+
+# Tipos finais das chaves do cenário, depois de descartar as linhas sem valor
+KEY_DTYPES = {"servers": "int16", "clients": "int16", "messages": "int32"}
+
+# Valor inserido pelo awk do deploy.sh em campos vazios ou ausentes
+NA_VALUES = ["unknown"]
+
+KEY_COLUMNS = {
+    "num_servers": "servers",
+    "num_clients": "clients",
+    "num_messages": "messages",
+}
+
+
+def _coerce(df):
+    """Converte um DataFrame lido como texto para DTYPES, com NaN onde não for numérico"""
+    for column, dtype in DTYPES.items():
+        if column not in df.columns or dtype == "category":
+            continue
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype(dtype)
+    for column in ("client_id", "server_id"):
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def read_results_csv(path, usecols=None, chunksize=None, header=True):
+    """
+    Lê um CSV de resultados (caminho ou buffer) com tipos compactos (DTYPES).
+    "unknown" vira NA já no parser. Se alguma célula não for numérica por
+    outro motivo, o arquivo (ou bloco) é relido como texto e convertido
+    com NaN nas células inválidas, como o pd.to_numeric(errors="coerce")
+    das análises.
+    Com chunksize, retorna um iterador de blocos.
+    header=False lê linhas sem cabeçalho (como os arquivos temporários do
+    deploy.sh), assumindo a ordem de COLUMNS.
+    """
+    dtypes = {c: t for c, t in DTYPES.items() if usecols is None or c in usecols}
+    options = {"usecols": usecols, "na_values": NA_VALUES}
+    if not header:
+        options.update(header=None, names=COLUMNS)
+
+    if chunksize is None:
+        try:
+            return pd.read_csv(path, dtype=dtypes, **options)
+        except (ValueError, TypeError):
+            if hasattr(path, "seek"):
+                path.seek(0)  # Buffer já consumido pela primeira leitura
+            return _coerce(pd.read_csv(path, dtype=str, **options))
+
+    return _read_chunks(path, dtypes, options, chunksize)
+
+
+def _read_chunks(path, dtypes, options, chunksize):
+    rows = 0
+    try:
+        for chunk in pd.read_csv(path, dtype=dtypes, chunksize=chunksize, **options):
+            rows += len(chunk)
+            yield chunk
+        return
+    except (ValueError, TypeError):
+        pass
+    # Um bloco falhou: continua como texto a partir da primeira linha não entregue
+    first = 0 if options.get("header", "infer") is None else 1
+    for chunk in pd.read_csv(
+        path,
+        dtype=str,
+        chunksize=chunksize,
+        skiprows=range(first, first + rows),
+        **options,
+    ):
+        yield _coerce(chunk)
+
+
+def standardize(df, implementation):
+    """
+    Renomeia num_* para servers/clients/messages, marca a implementação e
+    descarta linhas sem response_time ou sem as chaves do cenário.
+    As chaves viram inteiros pequenos (KEY_DTYPES).
+    """
+    df = df.rename(columns=KEY_COLUMNS)
+    df["implementation"] = implementation
+    keys = [key for key in KEY_COLUMNS.values() if key in df.columns]
+    df = df.dropna(subset=["response_time"] + keys)
+    return df.astype({key: KEY_DTYPES[key] for key in keys})
@@ -0,0 +1,136 @@
+# Escalabilidade com o número de réplicas: Amdahl e Universal Scalability Law
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import OptimizeWarning, curve_fit
+
+# Uma curva por implementação e tamanho de sessão (mensagens por cliente)
+FIT_KEYS = ["implementation", "messages"]
+# κ abaixo disso não altera a curva na faixa de réplicas medida: sem pico
+KAPPA_EPSILON = 1e-6
+FIT_COLUMNS = [
+    "lambda",
+    "sigma",
+    "kappa",
+    "usl_r2",
+    "amdahl_lambda",
+    "amdahl_sigma",
+    "amdahl_r2",
+    "efficiency",
+    "observed_efficiency",
+    "peak_servers",
+    "peak_throughput",
+]
+
+
+def usl(n, lam, sigma, kappa):
+    """Vazão prevista pela USL: λN / (1 + σ(N-1) + κN(N-1))"""
+    n = np.asarray(n, dtype="float64")
+    return lam * n / (1 + sigma * (n - 1) + kappa * n * (n - 1))
+
+
+def amdahl(n, lam, sigma):
+    """Lei de Amdahl: USL sem o termo de coerência (κ = 0)"""
+    return usl(n, lam, sigma, 0.0)
+
+
+def scenario_throughput(stats):
+    """
+    Vazão (mensagens/s) de cada cenário a partir das estatísticas por
+    cenário: com os clientes em paralelo, clientes × mensagens / tempo médio
+    de sessão.
+    """
+    return stats.assign(throughput=stats["clients"] * stats["messages"] / stats["mean"])
+
+
+def peak_throughput(stats):
+    """Maior vazão entre as cargas de clientes, por implementação, mensagens e réplicas"""
+    throughput = scenario_throughput(stats)
+    return (
+        throughput.groupby(FIT_KEYS + ["servers"], observed=True)["throughput"]
+        .max()
+        .reset_index()
+    )
+
+
+def _r_squared(observed, predicted):
+    residual = np.sum((observed - predicted) ** 2)
+    total = np.sum((observed - observed.mean()) ** 2)
+    return 1 - residual / total if total > 0 else np.nan
+
+
+def _fit(model, n, x, initial, upper):
+    """curve_fit com parâmetros não negativos; None se não convergir"""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", OptimizeWarning)
+            params, _ = curve_fit(
+                model, n, x, p0=initial, bounds=(0, upper), maxfev=10_000
+            )
+    except (RuntimeError, ValueError):
+        return None
+    return params
+
+
+def fit_curve(n, x):
+    """
+    Ajusta Amdahl e USL a uma curva vazão × réplicas.
+    Retorna λ (vazão de uma réplica), σ (contenção), κ (coerência), os σ e
+    λ de Amdahl, R² de cada ajuste, a eficiência paralela prevista no maior
+    N observado, a eficiência observada relativa ao menor N e o número de
+    réplicas de pico N* = √((1-σ)/κ) com a vazão prevista nele.
+    """
+    n = np.asarray(n, dtype="float64")
+    x = np.asarray(x, dtype="float64")
+    result = dict.fromkeys(FIT_COLUMNS, np.nan)
+    if len(n) < 3:
+        return result  # USL tem três parâmetros
+
+    order = np.argsort(n)
+    n, x = n[order], x[order]
+    # Eficiência observada: ganho de vazão / ganho de réplicas desde o menor N
+    result["observed_efficiency"] = (x[-1] / x[0]) / (n[-1] / n[0])
+
+    initial_lambda = x[0] / n[0]
+    upper_lambda = x.max() * 10
+    params = _fit(usl, n, x, [initial_lambda, 0.1, 0.001], [upper_lambda, 1.0, np.inf])
+    if params is not None:
+        lam, sigma, kappa = params
+        result.update(
+            {
+                "lambda": lam,
+                "sigma": sigma,
+                "kappa": kappa,
+                "usl_r2": _r_squared(x, usl(n, *params)),
+                # X(N) / (N·λ): fração da vazão ideal com N réplicas
+                "efficiency": usl(n[-1], *params) / (n[-1] * lam),
+            }
+        )
+        if kappa > KAPPA_EPSILON:
+            # σ ≈ 1 (vazão constante): nenhuma réplica extra ajuda, N* = 1
+            peak = max(np.sqrt(max(1 - sigma, 0) / kappa), 1.0)
+            result["peak_servers"] = peak
+            result["peak_throughput"] = usl(peak, *params)
+        else:
+            result["peak_servers"] = np.inf  # Sem coerência a vazão só cresce
+            result["peak_throughput"] = lam / sigma if sigma > 0 else np.inf
+
+    params = _fit(amdahl, n, x, [initial_lambda, 0.1], [upper_lambda, 1.0])
+    if params is not None:
+        result["amdahl_lambda"], result["amdahl_sigma"] = params
+        result["amdahl_r2"] = _r_squared(x, amdahl(n, *params))
+    return result
+
+
+def fit_scalability(stats):
+    """
+    Ajustes de Amdahl e USL por implementação e número de mensagens, sobre
+    a vazão de pico de cada número de réplicas (ver fit_curve).
+    """
+    peaks = peak_throughput(stats)
+    rows = []
+    for keys, group in peaks.groupby(FIT_KEYS, observed=True):
+        fit = fit_curve(group["servers"], group["throughput"])
+        rows.append({**dict(zip(FIT_KEYS, keys)), **fit})
+    return pd.DataFrame(rows)
@@ -1,6 +1,8 @@
 package main
 
 import (
+	"bufio"
+	"bytes"
 	"encoding/binary"
 	"encoding/csv"
 	"encoding/json"
@@ -9,12 +11,16 @@ import (
 	"log"
 	"net"
 	"os"
+	"strings"
 	"sync"
 	"time"
 )
 
 var (
 	csvLock sync.Mutex
+	// Changes whenever the log is replaced (start, reset): a fetch from an
+	// offset of another epoch is an offset into a different file
+	logEpoch = time.Now().UnixNano()
 )
 
 // Helper function to convert interface{} to string
@@ -39,8 +45,23 @@ const (
 	MSG_CLIENT_REQUEST   = 1
 	MSG_SERVER_RESPONSE  = 2
 	MSG_CLOSE_CONNECTION = 4
+	MSG_SESSION_OPEN     = 5
+
+	// Admin messages (collector.py): reset the session log and fetch it in bulk
+	MSG_ADMIN_RESET  = 6
+	MSG_ADMIN_FETCH  = 7
+	MSG_ADMIN_DATA   = 8
+	MSG_ADMIN_DONE   = 9
+	ADMIN_CHUNK_SIZE = 1024 * 1024
 )
 
+var csvHeader = []string{
+	"client_id", "message_id", "server_id", "client_send_time",
+	"server_processing_time", "client_receive_time", "response_time",
+	"num_servers", "num_clients", "num_messages",
+	"iteration", "run_id",
+}
+
 // Message structure
 type Message struct {
 	MagicNumber uint32          `json:"magic_number"`
@@ -56,6 +77,33 @@ type MessagePayload struct {
 	Data      string      `json:"data"`
 }
 
+// Payload for MSG_SESSION_OPEN: scenario tags of the session
+type SessionTags struct {
+	Servers   *int   `json:"servers"`
+	Clients   *int   `json:"clients"`
+	Messages  *int   `json:"messages"`
+	Iteration *int   `json:"iteration"`
+	RunID     string `json:"run_id"`
+}
+
+// Tag value, falling back to the environment variable (clients without tags)
+func tagOrEnv(value *int, variable string) string {
+	if value != nil {
+		return fmt.Sprintf("%d", *value)
+	}
+	if env := os.Getenv(variable); env != "" {
+		return env
+	}
+	return "unknown"
+}
+
+func tagOrUnknown(value *int) string {
+	if value != nil {
+		return fmt.Sprintf("%d", *value)
+	}
+	return "unknown"
+}
+
 // Response structure
 type ResponsePayload struct {
 	Status           string  `json:"status"`
@@ -65,6 +113,10 @@ type ResponsePayload struct {
 }
 
 func getCSVPath() string {
+	// CSV_FILE lets several servers share one machine (orchestrator.py --backend local)
+	if csvFile := os.Getenv("CSV_FILE"); csvFile != "" {
+		return csvFile
+	}
 	timestampSuffix := os.Getenv("TIMESTAMP_SUFFIX")
 	if timestampSuffix != "" {
 		return "/data/requests" + timestampSuffix + ".csv"
@@ -72,7 +124,7 @@ func getCSVPath() string {
 	return "/data/requests.csv"
 }
 
-func logRequest(clientID, messageID string, clientSendTime, serverProcessingTime float64) {
+func logRequest(clientID, messageID string, clientSendTime, serverProcessingTime float64, tags SessionTags) {
 	csvLock.Lock()
 	defer csvLock.Unlock()
 
@@ -91,22 +143,15 @@ func logRequest(clientID, messageID string, clientSendTime, serverProcessingTime
 	clientReceiveTime := float64(time.Now().UnixNano()) / 1e9
 	responseTime := clientReceiveTime - clientSendTime
 
-	// Get scenario parameters from environment variables
-	numServers := os.Getenv("NUM_SERVERS")
-	if numServers == "" {
-		numServers = "unknown"
-	}
-	
-	numClients := os.Getenv("NUM_CLIENTES")
-	if numClients == "" {
-		numClients = "unknown"
+	// Scenario parameters from the session tags (environment as fallback)
+	numServers := tagOrEnv(tags.Servers, "NUM_SERVERS")
+	numClients := tagOrEnv(tags.Clients, "NUM_CLIENTES")
+	numMessages := tagOrEnv(tags.Messages, "NUM_MENSAGENS")
+	runID := tags.RunID
+	if runID == "" {
+		runID = "unknown"
 	}
-	
-	numMessages := os.Getenv("NUM_MENSAGENS")
-	if numMessages == "" {
-		numMessages = "unknown"
-	}
-	
+
 	// Write data row in the expected format with all required columns
 	writer.Write([]string{
 		clientID,
@@ -119,17 +164,33 @@ func logRequest(clientID, messageID string, clientSendTime, serverProcessingTime
 		numServers,                               // num_servers
 		numClients,                               // num_clients
 		numMessages,                              // num_messages
+		tagOrUnknown(tags.Iteration),             // iteration
+		runID,                                    // run_id
 	})
 }
 
-// Initialize CSV with proper header
+// Initialize CSV with proper header. A log written with another header (e.g.
+// the 10 columns from before the session tags) is rotated out, so a file never
+// mixes rows of different widths.
 func initCSV() {
 	csvLock.Lock()
 	defer csvLock.Unlock()
 
 	csvPath := getCSVPath()
+	if file, err := os.Open(csvPath); err == nil {
+		header, err := csv.NewReader(file).Read()
+		file.Close()
+		if err != io.EOF && strings.Join(header, ",") != strings.Join(csvHeader, ",") {
+			rotated := fmt.Sprintf("%s.%d", csvPath, time.Now().UnixNano())
+			if err := os.Rename(csvPath, rotated); err != nil {
+				log.Fatalf("Failed to rotate CSV: %v", err)
+			}
+			log.Printf("Log de sessões com outro cabeçalho movido para %s", rotated)
+		}
+	}
+
 	// Check if file exists
-	if _, err := os.Stat(csvPath); os.IsNotExist(err) {
+	if info, err := os.Stat(csvPath); os.IsNotExist(err) || (err == nil && info.Size() == 0) {
 		file, err := os.Create(csvPath)
 		if err != nil {
 			log.Fatalf("Failed to create CSV: %v", err)
@@ -140,15 +201,166 @@ func initCSV() {
 		defer writer.Flush()
 
 		// Write header in the expected format (matching the Python server)
-		writer.Write([]string{
-			"client_id", "message_id", "server_id", "client_send_time",
-			"server_processing_time", "client_receive_time", "response_time",
-			"num_servers", "num_clients", "num_messages",
+		writer.Write(csvHeader)
+	}
+}
+
+// Payload for MSG_ADMIN_RESET / MSG_ADMIN_FETCH
+type AdminRequest struct {
+	Rotate bool    `json:"rotate"`
+	Offset int64   `json:"offset"`
+	RunID  *string `json:"run_id"`
+	Epoch  *int64  `json:"epoch"`
+}
+
+// Payload for MSG_ADMIN_DONE
+type AdminSummary struct {
+	Status    string  `json:"status"`
+	Rotated   *string `json:"rotated,omitempty"`
+	Offset    int64   `json:"offset"`
+	Rows      int     `json:"rows"`
+	Truncated bool    `json:"truncated"`
+	Epoch     int64   `json:"epoch"`
+}
+
+// Atomically replace the session log with a header-only file
+func resetLog(rotate bool) (AdminSummary, error) {
+	csvLock.Lock()
+	defer csvLock.Unlock()
+
+	csvPath := getCSVPath()
+	summary := AdminSummary{Status: "ok"}
+	if _, err := os.Stat(csvPath); rotate && err == nil {
+		rotated := fmt.Sprintf("%s.%d", csvPath, time.Now().UnixNano())
+		if err := os.Rename(csvPath, rotated); err != nil {
+			return summary, err
+		}
+		summary.Rotated = &rotated
+	}
+
+	var buffer bytes.Buffer
+	writer := csv.NewWriter(&buffer)
+	writer.Write(csvHeader)
+	writer.Flush()
+	temporary := csvPath + ".tmp"
+	if err := os.WriteFile(temporary, buffer.Bytes(), 0644); err != nil {
+		return summary, err
+	}
+	if err := os.Rename(temporary, csvPath); err != nil {
+		return summary, err
+	}
+	logEpoch = time.Now().UnixNano()
+	summary.Epoch = logEpoch
+	return summary, nil
+}
+
+// Last CSV field of a log line (the run_id)
+func lastField(line []byte) string {
+	line = bytes.TrimRight(line, "\r\n")
+	return string(line[bytes.LastIndexByte(line, ',')+1:])
+}
+
+// Session log from offset, optionally only the rows of a run_id, passed to
+// emit in chunks of up to ADMIN_CHUNK_SIZE. Only the end offset is taken under
+// the lock; appends land after it and a reset replaces the file, so the bytes
+// before it are read without blocking writers.
+func readLog(request AdminRequest, emit func([]byte) error) (AdminSummary, error) {
+	csvLock.Lock()
+	summary := AdminSummary{Status: "ok", Epoch: logEpoch}
+	file, err := os.Open(getCSVPath())
+	if err == nil {
+		summary.Offset, err = file.Seek(0, io.SeekEnd)
+		defer file.Close()
+	}
+	csvLock.Unlock()
+	if err != nil {
+		return summary, err
+	}
+
+	// The log was reset since the collector's offset was taken: start over
+	offset := request.Offset
+	if offset < 0 || offset > summary.Offset ||
+		(request.Epoch != nil && *request.Epoch != summary.Epoch) {
+		offset = 0
+		summary.Truncated = true
+	}
+	reader := bufio.NewReader(io.NewSectionReader(file, offset, summary.Offset-offset))
+	if offset == 0 {
+		reader.ReadBytes('\n') // header
+	}
+
+	var data bytes.Buffer
+	for {
+		line, err := reader.ReadBytes('\n')
+		if len(line) > 0 && (request.RunID == nil || lastField(line) == *request.RunID) {
+			if data.Len() > 0 && data.Len()+len(line) > ADMIN_CHUNK_SIZE {
+				if err := emit(data.Bytes()); err != nil {
+					return summary, err
+				}
+				data.Reset()
+			}
+			data.Write(line)
+			summary.Rows++
+		}
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			return summary, err
+		}
+	}
+	if data.Len() > 0 {
+		return summary, emit(data.Bytes())
+	}
+	return summary, nil
+}
+
+func writeFrame(conn net.Conn, msgType uint32, payload []byte) error {
+	header := make([]byte, 12)
+	binary.BigEndian.PutUint32(header[0:4], MAGIC_NUMBER)
+	binary.BigEndian.PutUint32(header[4:8], msgType)
+	binary.BigEndian.PutUint32(header[8:12], uint32(len(payload)))
+	if _, err := conn.Write(header); err != nil {
+		return err
+	}
+	_, err := conn.Write(payload)
+	return err
+}
+
+// Answer an admin message: data chunks, then a JSON summary
+func handleAdmin(conn net.Conn, msgType uint32, payloadBuf []byte) error {
+	// An empty payload means {} (as in the Python server)
+	var request AdminRequest
+	if len(payloadBuf) > 0 {
+		if err := json.Unmarshal(payloadBuf, &request); err != nil {
+			return err
+		}
+	}
+
+	var summary AdminSummary
+	var err error
+	if msgType == MSG_ADMIN_RESET {
+		summary, err = resetLog(request.Rotate)
+	} else {
+		summary, err = readLog(request, func(chunk []byte) error {
+			return writeFrame(conn, MSG_ADMIN_DATA, chunk)
 		})
 	}
+	if err != nil {
+		summary.Status = err.Error()
+	}
+
+	summaryBytes, err := json.Marshal(summary)
+	if err != nil {
+		return err
+	}
+	return writeFrame(conn, MSG_ADMIN_DONE, summaryBytes)
 }
 
 func hostname() string {
+	if serverID := os.Getenv("SERVER_ID"); serverID != "" {
+		return serverID
+	}
 	name, err := os.Hostname()
 	if err != nil {
 		return "unknown"
@@ -167,6 +379,7 @@ func handleClient(conn net.Conn) {
 	messagesProcessed := 0
 	totalProcessingTime := 0.0
 	var firstMessageTime float64
+	var sessionTags SessionTags
 
 	for {
 		// Read protocol header (12 bytes: magic + type + length)
@@ -195,7 +408,9 @@ func handleClient(conn net.Conn) {
 			break
 		}
 
-		if payloadLength == 0 || payloadLength > 1024*1024 { // Limite de 1MB
+		// Admin messages may have an empty payload ({})
+		isAdmin := msgType == MSG_ADMIN_RESET || msgType == MSG_ADMIN_FETCH
+		if (payloadLength == 0 && !isAdmin) || payloadLength > 1024*1024 { // Limite de 1MB
 			log.Printf("❌ Tamanho de payload inválido: %d", payloadLength)
 			break
 		}
@@ -266,6 +481,18 @@ func handleClient(conn net.Conn) {
 				break
 			}
 
+		} else if msgType == MSG_SESSION_OPEN {
+			// Scenario tags for this session; no response is sent
+			if err := json.Unmarshal(payloadBuf, &sessionTags); err != nil {
+				log.Printf("Erro parsing tags da sessão: %v", err)
+			}
+
+		} else if isAdmin {
+			if err := handleAdmin(conn, msgType, payloadBuf); err != nil {
+				log.Printf("Erro na mensagem administrativa: %v", err)
+				break
+			}
+
 		} else if msgType == MSG_CLOSE_CONNECTION {
 			log.Printf("Cliente %s solicitou fechamento da conexão", clientAddr)
 			break
@@ -275,7 +502,7 @@ func handleClient(conn net.Conn) {
 	// Log consolidated session data only once
 	if clientID != "" && messagesProcessed > 0 {
 		avgProcessingTime := totalProcessingTime / float64(messagesProcessed)
-		logRequest(clientID, fmt.Sprintf("%d", messagesProcessed), firstMessageTime, avgProcessingTime)
+		logRequest(clientID, fmt.Sprintf("%d", messagesProcessed), firstMessageTime, avgProcessingTime, sessionTags)
 	}
 
 	log.Printf("Cliente %s desconectado", clientAddr)
@@ -286,13 +513,17 @@ func main() {
 	initCSV()
 
 	// Start TCP server
-	listener, err := net.Listen("tcp", ":5000")
+	port := os.Getenv("PORT")
+	if port == "" {
+		port = "5000"
+	}
+	listener, err := net.Listen("tcp", ":"+port)
 	if err != nil {
 		log.Fatalf("Erro iniciando servidor TCP: %v", err)
 	}
 	defer listener.Close()
 
-	log.Println("🚀 Servidor de protocolo customizado iniciado em :5000")
+	log.Printf("🚀 Servidor de protocolo customizado iniciado em :%s", port)
 	log.Printf("📊 Logs serão salvos em: %s", getCSVPath())
 	log.Printf("🔧 Server ID: %s", hostname())
 
@@ -3,6 +3,7 @@ import threading
 import time
 import os
 import csv
+import json
 import signal
 import sys
 import struct
@@ -12,6 +13,36 @@ MAGIC_NUMBER = 0x12345678
 MSG_CLIENT_REQUEST = 1
 MSG_SERVER_RESPONSE = 2
 MSG_CLOSE_CONNECTION = 4
+MSG_SESSION_OPEN = 5
+# Admin messages (collector.py): reset the session log and fetch it in bulk
+MSG_ADMIN_RESET = 6
+MSG_ADMIN_FETCH = 7
+MSG_ADMIN_DATA = 8
+MSG_ADMIN_DONE = 9
+ADMIN_CHUNK_SIZE = 1024 * 1024
+
+CSV_HEADER = [
+    "client_id",
+    "messages_processed",
+    "server_id",
+    "session_start_time",
+    "avg_processing_time",
+    "session_end_time",
+    "session_duration",
+    "num_servers",
+    "num_clients",
+    "num_messages",
+    "iteration",
+    "run_id",
+]
+
+# Scenario tags of a session (MSG_SESSION_OPEN) and the environment variable
+# used when a client does not send them
+SESSION_TAG_ENV = {
+    "servers": "NUM_SERVERS",
+    "clients": "NUM_CLIENTES",
+    "messages": "NUM_MENSAGENS",
+}
 
 
 class ProtocolMessage:
@@ -107,41 +138,122 @@ def receive_message(sock):
 
 
 class CustomProtocolServer:
-    def __init__(self, host="0.0.0.0", port=5000):
+    def __init__(self, host="0.0.0.0", port=None):
         self.host = host
-        self.port = port
-        self.server_id = socket.gethostname()
+        # PORT, CSV_FILE and SERVER_ID let several servers share one machine
+        # (orchestrator.py --backend local); the pod defaults are unchanged
+        self.port = port if port is not None else int(os.getenv("PORT", "5000"))
+        self.server_id = os.getenv("SERVER_ID") or socket.gethostname()
         self.running = False
         self.socket = None
-        self.csv_file = "/data/requests.csv"
+        self.csv_file = os.getenv("CSV_FILE", "/data/requests.csv")
         self.csv_lock = threading.Lock()
+        # Changes whenever the log is replaced (start, reset): a fetch from
+        # an offset of another epoch is an offset into a different file
+        self.log_epoch = time.time_ns()
 
         # Ensure data directory exists
-        os.makedirs(os.path.dirname(self.csv_file), exist_ok=True)
+        os.makedirs(os.path.dirname(os.path.abspath(self.csv_file)), exist_ok=True)
 
         # Initialize CSV file
         self.init_csv()
 
     def init_csv(self):
-        """Initialize CSV file with headers"""
+        """
+        Initialize CSV file with headers. A log written with another header
+        (e.g. the 10 columns from before the session tags) is rotated out, so
+        a file never mixes rows of different widths.
+        """
         with self.csv_lock:
-            if not os.path.exists(self.csv_file) or os.path.getsize(self.csv_file) == 0:
-                with open(self.csv_file, "w", newline="") as f:
-                    writer = csv.writer(f)
-                    writer.writerow(
-                        [
-                            "client_id",
-                            "messages_processed",
-                            "server_id",
-                            "session_start_time",
-                            "avg_processing_time",
-                            "session_end_time",
-                            "session_duration",
-                            "num_servers",
-                            "num_clients",
-                            "num_messages",
-                        ]
-                    )
+            if os.path.exists(self.csv_file) and os.path.getsize(self.csv_file) > 0:
+                with open(self.csv_file, newline="") as f:
+                    header = next(csv.reader(f), [])
+                if header == CSV_HEADER:
+                    return
+                rotated = f"{self.csv_file}.{time.time_ns()}"
+                os.replace(self.csv_file, rotated)
+                print(f"Session log had another header, moved to {rotated}")
+            with open(self.csv_file, "w", newline="") as f:
+                csv.writer(f).writerow(CSV_HEADER)
+
+    def reset_log(self, rotate=False):
+        """Atomically replace the session log with a header-only file"""
+        with self.csv_lock:
+            rotated = None
+            if rotate and os.path.exists(self.csv_file):
+                rotated = f"{self.csv_file}.{time.time_ns()}"
+                os.replace(self.csv_file, rotated)
+            temporary = f"{self.csv_file}.tmp"
+            with open(temporary, "w", newline="") as f:
+                csv.writer(f).writerow(CSV_HEADER)
+            os.replace(temporary, self.csv_file)
+            self.log_epoch = time.time_ns()
+        return {"status": "ok", "rotated": rotated, "epoch": self.log_epoch}
+
+    def read_log(self, offset=0, run_id=None, epoch=None):
+        """
+        Session log from offset, optionally only the rows of a run_id.
+        Returns (chunks, summary): chunks yields at most ADMIN_CHUNK_SIZE
+        bytes at a time and fills in summary["rows"]. Only the end offset is
+        taken under the lock; appends land after it and a reset replaces the
+        file, so the bytes before it are read without blocking writers.
+        """
+        with self.csv_lock:
+            f = open(self.csv_file, "rb")
+            end = f.seek(0, os.SEEK_END)
+            summary = {
+                "status": "ok",
+                "offset": end,
+                "rows": 0,
+                "truncated": False,
+                "epoch": self.log_epoch,
+            }
+        # The log was reset since the collector's offset was taken: start over
+        if offset < 0 or offset > end or epoch not in (None, summary["epoch"]):
+            offset = 0
+            summary["truncated"] = True
+        return self._log_chunks(f, offset, end, run_id, summary), summary
+
+    def _log_chunks(self, f, offset, end, run_id, summary):
+        tag = None if run_id is None else run_id.encode("utf-8")
+        with f:
+            f.seek(offset)
+            if offset == 0:
+                f.readline()  # header
+            remaining = end - f.tell()
+            lines, size = [], 0
+            while remaining > 0:
+                line = f.readline(remaining)
+                if not line:
+                    break
+                remaining -= len(line)
+                if tag is not None and line.rstrip(b"\r\n").rsplit(b",", 1)[-1] != tag:
+                    continue
+                # A line longer than a chunk goes out alone, never as an empty frame
+                if size and size + len(line) > ADMIN_CHUNK_SIZE:
+                    yield b"".join(lines)
+                    lines, size = [], 0
+                lines.append(line)
+                size += len(line)
+                summary["rows"] += 1
+            if lines:
+                yield b"".join(lines)
+
+    def handle_admin(self, client_socket, message):
+        """Answer an admin message: data chunks, then a JSON summary"""
+        request = json.loads(message.payload.decode("utf-8") or "{}")
+        if message.msg_type == MSG_ADMIN_RESET:
+            chunks, summary = (), self.reset_log(bool(request.get("rotate")))
+        else:
+            chunks, summary = self.read_log(
+                int(request.get("offset", 0)),
+                request.get("run_id"),
+                request.get("epoch"),
+            )
+        for chunk in chunks:
+            send_message(client_socket, ProtocolMessage(MSG_ADMIN_DATA, chunk))
+        summary = json.dumps(summary).encode("utf-8")
+        send_message(client_socket, ProtocolMessage(MSG_ADMIN_DONE, summary))
 
     def log_client_session(
         self,
@@ -150,6 +262,7 @@ class CustomProtocolServer:
         total_processing_time,
         first_message_time,
         last_message_time,
+        tags=None,
     ):
         """Log consolidated client session to CSV file"""
         with self.csv_lock:
@@ -165,10 +278,13 @@ class CustomProtocolServer:
                         else 0
                     )
 
-                    # Get environment variables for scenario parameters
-                    num_servers = os.getenv("NUM_SERVERS", "unknown")
-                    num_clients = os.getenv("NUM_CLIENTES", "unknown")
-                    num_messages = os.getenv("NUM_MENSAGENS", "unknown")
+                    # Scenario parameters from the session tags, falling back
+                    # to the environment for clients that do not send them
+                    tags = tags or {}
+                    num_servers, num_clients, num_messages = (
+                        tags.get(name, os.getenv(variable, "unknown"))
+                        for name, variable in SESSION_TAG_ENV.items()
+                    )
 
                     # Log one row per client with consolidated data
                     writer.writerow(
@@ -183,6 +299,8 @@ class CustomProtocolServer:
                             num_servers,
                             num_clients,
                             num_messages,
+                            tags.get("iteration", "unknown"),
+                            tags.get("run_id", "unknown"),
                         ]
                     )
             except Exception as e:
@@ -198,6 +316,7 @@ class CustomProtocolServer:
         total_processing_time = 0
         first_message_time = None
         last_message_time = None
+        session_tags = None
 
         try:
             while self.running:
@@ -240,6 +359,13 @@ class CustomProtocolServer:
                         f"Processed: Client {client_request.client_id}, Message {client_request.message_id}"
                     )
 
+                elif message.msg_type == MSG_SESSION_OPEN:
+                    # Scenario tags for this session; no response is sent
+                    session_tags = json.loads(message.payload.decode("utf-8"))
+
+                elif message.msg_type in (MSG_ADMIN_RESET, MSG_ADMIN_FETCH):
+                    self.handle_admin(client_socket, message)
+
                 elif message.msg_type == MSG_CLOSE_CONNECTION:
                     print(f"Cliente {client_address} solicitou fechamento da conexão")
                     break
@@ -255,6 +381,7 @@ class CustomProtocolServer:
                     total_processing_time,
                     first_message_time,
                     last_message_time,
+                    session_tags,
                 )
 
             client_socket.close()
@@ -302,10 +429,7 @@ class CustomProtocolServer:
         """Stop the server"""
         print("🛑 Parando servidor...")
 
-        # Write consolidated statistics before stopping
-        print("📊 Escrevendo estatísticas consolidadas...")
-        self.write_consolidated_stats()
-
+        # Sessions are logged to the CSV as they end, nothing left to flush
         self.running = False
         if self.socket:
             self.socket.close()
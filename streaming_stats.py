@@ -0,0 +1,258 @@
+# Agregação em streaming (out-of-core) dos resultados por cenário
+import math
+
+import numpy as np
+import pandas as pd
+
+from bootstrap import PERCENTILES
+from outliers import DEFAULT_THRESHOLDS, MAD_SCALE, METHOD_IQR, METHOD_MAD, METHOD_ZSCORE
+from results_csv import KEY_COLUMNS, read_results_csv, standardize
+
+DEFAULT_CHUNKSIZE = 500_000
+
+# Parâmetros do sketch de quantis: baldes logarítmicos com erro relativo de 1%
+SKETCH_GROWTH = 1.01
+SKETCH_MIN_VALUE = 1e-6
+_LOG_GROWTH = math.log(SKETCH_GROWTH)
+
+# Só as colunas necessárias para as estatísticas por cenário
+USECOLS = ["response_time", *KEY_COLUMNS]
+
+
+def sketch_buckets(values):
+    """Índice do balde logarítmico de cada valor (vetorizado)"""
+    values = np.maximum(np.asarray(values, dtype="float64"), SKETCH_MIN_VALUE)
+    return np.ceil(np.log(values / SKETCH_MIN_VALUE) / _LOG_GROWTH).astype("int32")
+
+
+def bucket_values(buckets):
+    """Valor representativo (média geométrica) de cada balde"""
+    return SKETCH_MIN_VALUE * SKETCH_GROWTH ** (np.asarray(buckets, dtype="float64") - 0.5)
+
+
+class RunningStats:
+    """
+    Estatísticas correntes por grupo: contagem, média e M2 (Welford/Chan),
+    mínimo, máximo e um sketch de quantis mergeável.
+    O estado tem tamanho proporcional ao número de cenários, não de linhas.
+    """
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.moments = None
+        self.sketch = None
+
+    def update(self, keys_frame, values):
+        """Incorpora um bloco de valores (alinhado com as chaves em keys_frame)"""
+        if len(values) == 0:
+            return
+        frame = keys_frame.assign(value=values, bucket=sketch_buckets(values))
+        grouped = frame.groupby(self.keys, sort=False)["value"]
+        chunk = grouped.agg(["count", "mean", "var", "min", "max"])
+        chunk["m2"] = chunk["var"].fillna(0.0) * (chunk["count"] - 1)
+        chunk = chunk.drop(columns="var")
+        self.moments = chunk if self.moments is None else _merge_moments(self.moments, chunk)
+
+        buckets = frame.groupby(self.keys + ["bucket"], sort=False).size().rename("count")
+        if self.sketch is None:
+            self.sketch = buckets
+        else:
+            levels = list(range(len(self.keys) + 1))
+            self.sketch = pd.concat([self.sketch, buckets]).groupby(level=levels).sum()
+
+    def quantile(self, q):
+        """Quantil q (0-1) de cada grupo, a partir do sketch"""
+        return sketch_quantile(self.sketch, self.keys, q, self.moments)
+
+    def table(self):
+        """Tabela por grupo: mean, std, count, median, min, max e percentis de cauda"""
+        moments = self.moments
+        table = pd.DataFrame(
+            {
+                "mean": moments["mean"],
+                "std": np.sqrt(moments["m2"] / (moments["count"] - 1)).where(
+                    moments["count"] > 1
+                ),
+                "count": moments["count"],
+                "median": self.quantile(0.5),
+                "min": moments["min"],
+                "max": moments["max"],
+            }
+        )
+        for name, q in PERCENTILES.items():
+            table[name] = self.quantile(q)
+        return table.sort_index().reset_index()
+
+
+def _merge_moments(left, right):
+    """Combina contagem/média/M2/min/max de dois conjuntos (Chan et al.)"""
+    left, right = left.align(right, join="outer")
+    n_a = left["count"].fillna(0).astype("int64")
+    n_b = right["count"].fillna(0).astype("int64")
+    n = n_a + n_b
+    mean_a = left["mean"].fillna(0.0)
+    mean_b = right["mean"].fillna(0.0)
+    delta = mean_b - mean_a
+    return pd.DataFrame(
+        {
+            "count": n,
+            "mean": mean_a + delta * n_b / n,
+            "min": np.fmin(left["min"], right["min"]),
+            "max": np.fmax(left["max"], right["max"]),
+            "m2": left["m2"].fillna(0.0)
+            + right["m2"].fillna(0.0)
+            + delta**2 * n_a * n_b / n,
+        }
+    )
+
+
+def sketch_quantile(sketch, keys, q, moments=None):
+    """
+    Quantil q (0-1) por grupo de um sketch no formato (chaves, balde) -> contagem.
+    Mesma definição do quantile do pandas/NumPy usado em memória: interpolação
+    linear entre os valores de posto floor(h) + 1 e floor(h) + 2, h = q (n - 1),
+    cada um estimado pelo seu balde (erro relativo de até 1%). Com moments, os
+    postos 1 e n são o mínimo e o máximo exatos.
+    """
+    frame = sketch.rename("count").reset_index()
+    frame = frame.groupby(keys + ["bucket"])["count"].sum().reset_index()
+    frame = frame.sort_values(keys + ["bucket"])
+    grouped = frame.groupby(keys, sort=False)["count"]
+    cumulative = grouped.cumsum()
+    total = grouped.transform("sum")
+
+    def value_at(rank):
+        first = frame[cumulative >= rank].groupby(keys, sort=False)["bucket"].first()
+        return pd.Series(bucket_values(first.to_numpy()), index=first.index)
+
+    position = q * (total - 1)
+    lower_rank = np.floor(position) + 1
+    upper_rank = np.minimum(lower_rank + 1, total)
+    lower = value_at(lower_rank)
+    upper = value_at(upper_rank).reindex(lower.index)
+
+    n = grouped.sum().reindex(lower.index)
+    position = q * (n - 1)
+    fraction = position - np.floor(position)
+    if moments is not None:
+        low = moments["min"].reindex(lower.index)
+        high = moments["max"].reindex(lower.index)
+        lower = lower.mask(np.floor(position) == 0, low)
+        upper = upper.mask(np.floor(position) + 2 >= n, high)
+        # O valor do balde nunca sai do intervalo observado
+        lower = lower.clip(lower=low, upper=high)
+        upper = upper.clip(lower=low, upper=high)
+    return lower + fraction * (upper - lower)
+
+
+def rollup(stats, sketch, scenario_keys, by):
+    """
+    Reagrupa estatísticas por cenário (mean, std, count, min, max) e o sketch
+    em níveis mais grossos (ex.: por implementação), sem reler as linhas.
+    Mediana e percentis vêm do sketch reagrupado.
+    """
+    by = list(by)
+    frame = stats.copy()
+    frame["weighted"] = frame["mean"] * frame["count"]
+    grouped = frame.groupby(by)
+    overall = grouped["weighted"].transform("sum") / grouped["count"].transform("sum")
+    # M2 total = soma dos M2 de cada cenário + n_i * (média_i - média geral)^2
+    frame["m2"] = (frame["std"].fillna(0.0) ** 2) * (frame["count"] - 1) + frame[
+        "count"
+    ] * (frame["mean"] - overall) ** 2
+    grouped = frame.groupby(by)
+    count = grouped["count"].sum()
+
+    table = pd.DataFrame(
+        {
+            "count": count,
+            "mean": grouped["weighted"].sum() / count,
+            "std": np.sqrt(grouped["m2"].sum() / (count - 1)).where(count > 1),
+            "min": grouped["min"].min(),
+            "max": grouped["max"].max(),
+        }
+    )
+    levels = [scenario_keys.index(key) for key in by]
+    coarse = sketch.groupby(level=levels + [len(scenario_keys)]).sum()
+    table["median"] = sketch_quantile(coarse, by, 0.5, table)
+    for name, q in PERCENTILES.items():
+        table[name] = sketch_quantile(coarse, by, q, table)
+    return table[["count", "mean", "median", "std", "min", "max", *PERCENTILES]]
+
+
+def _iter_chunks(paths, chunksize):
+    """Blocos (implementação, linhas lidas, DataFrame padronizado e já sem linhas inválidas)"""
+    for implementation, path in paths:
+        for chunk in read_results_csv(path, usecols=USECOLS, chunksize=chunksize):
+            yield implementation, len(chunk), standardize(chunk, implementation)
+
+
+def stream_results(
+    file_py,
+    file_go,
+    scenario_keys,
+    outlier_method=METHOD_ZSCORE,
+    chunksize=DEFAULT_CHUNKSIZE,
+):
+    """
+    Calcula as estatísticas por cenário lendo os CSVs em blocos.
+    Passo 1: média/desvio (e quantis) por cenário; passo 2 (só MAD):
+    sketch dos desvios absolutos; passo final: filtra outliers com os
+    parâmetros dos passos anteriores e agrega as linhas limpas.
+    Com z-score o resultado é igual ao da filtragem em memória; MAD e IQR
+    usam quantis do sketch (erro relativo de até 1%).
+    Memória limitada pelo tamanho do bloco e pelo número de cenários.
+    Retorna (raw_counts, combined_count, stats, sketch).
+    """
+    paths = [("Python", file_py), ("Go", file_go)]
+    raw_counts = {"Python": 0, "Go": 0}
+
+    # Passo 1: estatísticas brutas por cenário
+    first_pass = RunningStats(scenario_keys)
+    for implementation, rows, chunk in _iter_chunks(paths, chunksize):
+        raw_counts[implementation] += rows
+        first_pass.update(chunk[scenario_keys], chunk["response_time"].to_numpy())
+    moments = first_pass.moments
+    combined_count = int(moments["count"].sum())
+
+    # Parâmetros de centro/escala de cada cenário para o método escolhido
+    if outlier_method == METHOD_ZSCORE:
+        center = moments["mean"]
+        scale = np.sqrt(moments["m2"] / (moments["count"] - 1))
+    elif outlier_method == METHOD_IQR:
+        q1 = first_pass.quantile(0.25)
+        q3 = first_pass.quantile(0.75)
+    elif outlier_method == METHOD_MAD:
+        center = first_pass.quantile(0.5)
+        deviations = RunningStats(scenario_keys)
+        for _, _, chunk in _iter_chunks(paths, chunksize):
+            keys = pd.MultiIndex.from_frame(chunk[scenario_keys])
+            deviation = np.abs(
+                chunk["response_time"].to_numpy() - center.reindex(keys).to_numpy()
+            )
+            deviations.update(chunk[scenario_keys], deviation)
+        scale = deviations.quantile(0.5) / MAD_SCALE
+    else:
+        raise ValueError(f"Método de outlier desconhecido: {outlier_method}")
+
+    threshold = DEFAULT_THRESHOLDS[outlier_method]
+
+    # Passo final: filtrar e agregar as linhas limpas
+    cleaned = RunningStats(scenario_keys)
+    for _, _, chunk in _iter_chunks(paths, chunksize):
+        keys = pd.MultiIndex.from_frame(chunk[scenario_keys])
+        values = chunk["response_time"].to_numpy()
+        if outlier_method == METHOD_IQR:
+            low = q1.reindex(keys).to_numpy()
+            high = q3.reindex(keys).to_numpy()
+            distance = np.maximum(np.maximum(low - values, values - high), 0)
+            spread = high - low
+        else:
+            distance = np.abs(values - center.reindex(keys).to_numpy())
+            spread = scale.reindex(keys).to_numpy()
+        scores = np.zeros(len(values))
+        np.divide(distance, spread, out=scores, where=spread > 0)
+        keep = scores <= threshold
+        cleaned.update(chunk.loc[keep, scenario_keys], values[keep])
+
+    return raw_counts, combined_count, cleaned.table(), cleaned.sketch
@@ -1,17 +1,104 @@
 #!/usr/bin/env python3
 # Análise Textual dos Resultados - Cliente-Servidor Python vs Go
-import pandas as pd
+import argparse
 import numpy as np
 from datetime import datetime
 
+from analysis_data import load_results
+from balance import imbalance_metrics, latency_correlation
+from scalability import fit_scalability
 
-def analyze_performance():
+
+def compare_implementations(table):
+    """
+    Vencedor e melhoria (%) de cada linha de uma tabela com colunas
+    "Python" e "Go" (menor é melhor). A melhoria é relativa ao mais lento.
     """
-    Gera análise textual detalhada dos resultados de performance e salva em arquivo Markdown
+    py_time = table["Python"]
+    go_time = table["Go"]
+    winner = np.select([py_time < go_time, go_time < py_time], ["Python", "Go"], "Empate")
+    improvement = (py_time - go_time).abs() / np.maximum(py_time, go_time) * 100
+    return table.assign(
+        winner=winner, improvement=improvement.where(winner != "Empate", 0.0)
+    )
+
+
+def scenario_comparison(scenarios):
     """
-    # Configurar arquivo de saída
-    output_file = "performance_analysis_report.md"
+    Tempo total (média × clientes) de Python e Go em cada cenário
+    (servers, clients, messages) presente nas duas implementações,
+    com vencedor e melhoria percentual.
+    """
+    pivot = (
+        scenarios.pivot_table(
+            index=["servers", "clients", "messages"],
+            columns="implementation",
+            values="mean",
+            observed=True,
+        )
+        .reindex(columns=["Python", "Go"])
+        .dropna()
+        .reset_index()
+    )
+    totals = pivot[["Python", "Go"]].mul(pivot["clients"], axis=0)
+    compared = compare_implementations(totals)
+    # Sem empate na comparação original: tempos iguais contam para Python
+    compared["winner"] = compared["winner"].replace("Empate", "Python")
+    return pivot[["servers", "clients", "messages"]].assign(
+        python_time=compared["Python"],
+        go_time=compared["Go"],
+        winner=compared["winner"],
+        improvement=compared["improvement"],
+    )
+
+
+def _scale_rows(table):
+    """Linhas das tabelas de escalabilidade (clientes/servidores)"""
+    table = compare_implementations(table)
+    return markdown_rows(
+        table.index.astype(str),
+        table["Python"].map("{:.4f}".format),
+        table["Go"].map("{:.4f}".format),
+        np.where(table["winner"] == "Empate", "⚖️ Empate", "**" + table["winner"] + "**"),
+        table["improvement"].map("{:.1f}".format),
+    )
+
+
+def format_ci(table, name, fmt="{:.4f}"):
+    """Estatística com seu intervalo de confiança, ex.: "0.8262 [0.8123, 0.8387]"
+    ("-" no intervalo quando não há IC, como no modo streaming)"""
+    low = table[f"{name}_ci_low"]
+    high = table[f"{name}_ci_high"]
+    interval = np.where(
+        low.notna() & high.notna(),
+        " [" + low.map(fmt.format) + ", " + high.map(fmt.format) + "]",
+        " [-]",
+    )
+    return table[name].map(fmt.format) + interval
+
 
+def _format_fit(values, fmt):
+    """Coeficientes de ajuste como texto: "-" sem ajuste, "∞" para pico ilimitado"""
+    return values.map(
+        lambda value: "-" if np.isnan(value) else "∞" if np.isinf(value) else fmt.format(value)
+    )
+
+
+def markdown_rows(*columns):
+    """Linhas de tabela Markdown a partir de colunas já formatadas como texto"""
+    return "\n".join("| " + " | ".join(cells) + " |" for cells in zip(*columns))
+
+
+def analyze_performance(
+    file_py="requests_python.csv",
+    file_go="requests_go.csv",
+    output_file="performance_analysis_report.md",
+    exclude_unsteady=False,
+):
+    """
+    Gera análise textual detalhada dos resultados de performance e salva em arquivo Markdown.
+    exclude_unsteady: descarta as execuções que não atingiram regime estacionário
+    """
     # Criar buffer para capturar toda a saída
     output_lines = []
 
@@ -43,10 +130,9 @@ def analyze_performance():
     write_output("")
     write_output("---")
 
-    # Carregar dados
+    # Carregar dados (lidos, limpos e agregados uma única vez, com cache em disco)
     try:
-        df_py = pd.read_csv("requests_python.csv")
-        df_go = pd.read_csv("requests_go.csv")
+        results = load_results(file_py, file_go, exclude_unsteady=exclude_unsteady)
     except FileNotFoundError as e:
         error_msg = f"❌ Erro: Arquivo não encontrado: {e.filename}"
         write_output(error_msg)
@@ -55,50 +141,77 @@ def analyze_performance():
             f.write("\n".join(output_lines))
         return
 
-    # Preparar dados
-    df_py["implementation"] = "Python"
-    df_go["implementation"] = "Go"
-    df_combined = pd.concat([df_py, df_go], ignore_index=True)
-
-    # Limpeza de dados
-    df_combined["response_time"] = pd.to_numeric(
-        df_combined["response_time"], errors="coerce"
-    )
-    df_combined.dropna(subset=["response_time"], inplace=True)
-
-    # Remover outliers (Z-score > 3)
-    grouped = df_combined.groupby(
-        ["num_servers", "num_clients", "num_messages", "implementation"]
-    )
-    df_combined["z_score"] = grouped["response_time"].transform(
-        lambda x: np.abs((x - x.mean()) / x.std()) if x.std() > 0 else 0
-    )
-    df_cleaned = df_combined[df_combined["z_score"] <= 3]
+    cleaned_counts = results.cleaned_counts
+    py_count = results.raw_counts["Python"]
+    go_count = results.raw_counts["Go"]
 
     write_output("## � Resumo dos Dados")
     write_output("")
     write_output("| Métrica | Python | Go | Total |")
     write_output("|---------|--------|----|----|")
     write_output(
-        f"| Requisições originais | {len(df_py):,} | {len(df_go):,} | {len(df_py) + len(df_go):,} |"
+        f"| Requisições originais | {py_count:,} | {go_count:,} | {py_count + go_count:,} |"
     )
     write_output(
-        f"| Requisições após limpeza | {len(df_cleaned[df_cleaned['implementation'] == 'Python']):,} | {len(df_cleaned[df_cleaned['implementation'] == 'Go']):,} | {len(df_cleaned):,} |"
+        f"| Requisições após limpeza | {cleaned_counts['Python']:,} | {cleaned_counts['Go']:,} | {cleaned_counts.sum():,} |"
     )
+    if results.exclude_unsteady:
+        write_output(
+            f"| Linhas de execuções sem regime estacionário (descartadas) | - | - | {results.excluded_rows:,} |"
+        )
     write_output(
-        f"| Outliers removidos | - | - | {len(df_combined) - len(df_cleaned):,} |"
+        f"| Outliers removidos | - | - | {results.outliers_removed:,} |"
     )
     write_output("")
 
+    # Fases das execuções (aquecimento, regime estacionário, drenagem)
+    runs = results.runs
+    if runs is not None:
+        phases = runs.groupby("implementation").agg(
+            runs=("reached_steady", "size"),
+            steady=("reached_steady", "sum"),
+            warmup=("warmup_seconds", "mean"),
+            steady_seconds=("steady_seconds", "mean"),
+            drain=("drain_seconds", "mean"),
+            share=("steady_share", "mean"),
+        )
+        phases = phases.reindex(["Python", "Go"])
+
+        write_output("### ⏱️ Fases das Execuções")
+        write_output("")
+        write_output(
+            "| Implementação | Execuções | Sem regime estacionário | Aquecimento médio (s) | Regime médio (s) | Drenagem média (s) | Tempo em regime |"
+        )
+        write_output(
+            "|---------------|-----------|-------------------------|-----------------------|------------------|--------------------|-----------------|"
+        )
+        write_output(
+            markdown_rows(
+                "**" + phases.index + "**",
+                phases["runs"].map("{:,}".format),
+                (phases["runs"] - phases["steady"]).map("{:,}".format),
+                phases["warmup"].map("{:.2f}".format),
+                phases["steady_seconds"].map("{:.2f}".format),
+                phases["drain"].map("{:.2f}".format),
+                (phases["share"] * 100).map("{:.1f}%".format),
+            )
+        )
+        write_output("")
+        if results.exclude_unsteady:
+            write_output(
+                "As execuções sem regime estacionário foram descartadas das estatísticas abaixo."
+            )
+        else:
+            write_output(
+                "💡 As execuções sem regime estacionário entram nas médias; use `--exclude-unsteady` para descartá-las."
+            )
+        write_output("")
+
     # Estatísticas gerais
     write_output("## 1️⃣ Estatísticas Gerais")
     write_output("")
 
-    stats_general = (
-        df_cleaned.groupby("implementation")["response_time"]
-        .agg(["count", "mean", "median", "std", "min", "max"])
-        .round(6)
-    )
+    stats_general = results.rollup(["implementation"]).round(6)
 
     write_output("### � Estatísticas Detalhadas")
     write_output("")
@@ -117,6 +230,29 @@ def analyze_performance():
 
     write_output("")
 
+    # Percentis de cauda e intervalos de confiança (bootstrap, 95%)
+    tail_general = results.rollup(["implementation"], ci=True).reindex(["Python", "Go"])
+
+    write_output("### 📈 Latência de Cauda (IC 95% por bootstrap)")
+    write_output("")
+    write_output(
+        "| Implementação | Tempo Médio (s) | p90 (s) | p95 (s) | p99 (s) | p99.9 (s) |"
+    )
+    write_output(
+        "|---------------|-----------------|---------|---------|---------|-----------|"
+    )
+    write_output(
+        markdown_rows(
+            "**" + tail_general.index + "**",
+            format_ci(tail_general, "mean"),
+            tail_general["p90"].map("{:.4f}".format),
+            format_ci(tail_general, "p95"),
+            format_ci(tail_general, "p99"),
+            tail_general["p99_9"].map("{:.4f}".format),
+        )
+    )
+    write_output("")
+
     # Comparação direta
     py_mean = stats_general.loc["Python", "mean"]
     go_mean = stats_general.loc["Go", "mean"]
@@ -151,55 +287,17 @@ def analyze_performance():
     write_output("## 2️⃣ Análise por Cenários")
     write_output("")
 
-    scenarios = (
-        df_cleaned.groupby(
-            ["num_servers", "num_clients", "num_messages", "implementation"]
-        )["response_time"]
-        .agg(["mean", "std", "count"])
-        .reset_index()
-    )
-
-    # Melhor performance por cenário
-    best_scenarios = []
-
-    for (servers, clients, messages), group in scenarios.groupby(
-        ["num_servers", "num_clients", "num_messages"]
-    ):
-        if len(group) == 2:  # Ambas implementações presentes
-            py_time_avg = group[group["implementation"] == "Python"]["mean"].iloc[0]
-            go_time_avg = group[group["implementation"] == "Go"]["mean"].iloc[0]
-
-            # Calcular tempo total do cenário (tempo médio × número de clientes)
-            py_time_total = py_time_avg * clients
-            go_time_total = go_time_avg * clients
-
-            winner = "Go" if go_time_total < py_time_total else "Python"
-            improvement = (
-                abs(py_time_total - go_time_total)
-                / max(py_time_total, go_time_total)
-                * 100
-            )
-
-            best_scenarios.append(
-                {
-                    "servers": servers,
-                    "clients": clients,
-                    "messages": messages,
-                    "python_time": py_time_total,
-                    "go_time": go_time_total,
-                    "winner": winner,
-                    "improvement": improvement,
-                }
-            )
+    scenarios = results.stats
 
-    best_df = pd.DataFrame(best_scenarios)
+    # Melhor performance por cenário (pivot Python/Go + aritmética vetorizada)
+    best_df = scenario_comparison(scenarios)
 
     write_output(f"**Total de cenários analisados:** {len(best_df)}")
     write_output("")
 
     # Estatísticas dos vencedores
-    go_wins = len(best_df[best_df["winner"] == "Go"])
-    py_wins = len(best_df[best_df["winner"] == "Python"])
+    go_wins = int((best_df["winner"] == "Go").sum())
+    py_wins = int((best_df["winner"] == "Python").sum())
 
     write_output("### 🏆 Vencedores por Cenário")
     write_output("")
@@ -221,11 +319,45 @@ def analyze_performance():
         "|---------|----------|----------|---------|------------------|--------------|"
     )
 
-    for idx, (i, row) in enumerate(top_improvements.iterrows(), 1):
-        scenario = f"{int(row['servers'])} serv, {int(row['clients'])} cli, {int(row['messages'])} msg"
-        write_output(
-            f"| {idx} | **{row['winner']}** | **{row['improvement']:.1f}%** | {scenario} | {row['python_time']:.2f} | {row['go_time']:.2f} |"
+    write_output(
+        markdown_rows(
+            [str(rank) for rank in range(1, len(top_improvements) + 1)],
+            "**" + top_improvements["winner"] + "**",
+            top_improvements["improvement"].map("**{:.1f}%**".format),
+            top_improvements["servers"].astype(str)
+            + " serv, "
+            + top_improvements["clients"].astype(str)
+            + " cli, "
+            + top_improvements["messages"].astype(str)
+            + " msg",
+            top_improvements["python_time"].map("{:.2f}".format),
+            top_improvements["go_time"].map("{:.2f}".format),
         )
+    )
+
+    write_output("")
+
+    # Cenários com maior latência de cauda (p99 por cliente, com IC)
+    top_tail = scenarios.nlargest(5, "p99")
+
+    write_output("### 🐢 Top 5 Cenários com Maior p99")
+    write_output("")
+    write_output("| Implementação | Cenário | p95 (s) | p99 (s) | p99.9 (s) |")
+    write_output("|---------------|---------|---------|---------|-----------|")
+    write_output(
+        markdown_rows(
+            "**" + top_tail["implementation"].astype(str) + "**",
+            top_tail["servers"].astype(str)
+            + " serv, "
+            + top_tail["clients"].astype(str)
+            + " cli, "
+            + top_tail["messages"].astype(str)
+            + " msg",
+            format_ci(top_tail, "p95"),
+            format_ci(top_tail, "p99"),
+            top_tail["p99_9"].map("{:.4f}".format),
+        )
+    )
 
     write_output("")
 
@@ -233,36 +365,49 @@ def analyze_performance():
     write_output("## 3️⃣ Análise por Número de Mensagens")
     write_output("")
 
-    msg_analysis = (
-        df_cleaned.groupby(["num_messages", "implementation"])["response_time"]
-        .mean()
-        .unstack()
-    )
+    msg_analysis = results.rollup(["messages", "implementation"])["mean"].unstack()
 
     write_output("### 📨 Performance Média por Número de Mensagens")
     write_output("")
     write_output("| Mensagens | Python (s) | Go (s) | Vencedor | Melhoria |")
     write_output("|-----------|------------|--------|----------|----------|")
 
-    for messages in sorted(df_cleaned["num_messages"].unique()):
-        py_time = msg_analysis.loc[messages, "Python"]
-        go_time = msg_analysis.loc[messages, "Go"]
-
-        if py_time < go_time:
-            improvement = (go_time - py_time) / go_time * 100
-            winner = f"✅ **Python**"
-            improvement_text = f"{improvement:.1f}% mais rápido"
-        elif go_time < py_time:
-            improvement = (py_time - go_time) / py_time * 100
-            winner = f"✅ **Go**"
-            improvement_text = f"{improvement:.1f}% mais rápido"
-        else:
-            winner = f"⚖️ Empate"
-            improvement_text = "0.0%"
+    msg_analysis = compare_implementations(msg_analysis)
+    tie = msg_analysis["winner"] == "Empate"
+    write_output(
+        markdown_rows(
+            msg_analysis.index.map("{:,}".format),
+            msg_analysis["Python"].map("{:.4f}".format),
+            msg_analysis["Go"].map("{:.4f}".format),
+            np.where(tie, "⚖️ Empate", "✅ **" + msg_analysis["winner"] + "**"),
+            np.where(
+                tie,
+                "0.0%",
+                msg_analysis["improvement"].map("{:.1f}% mais rápido".format),
+            ),
+        )
+    )
 
-        write_output(
-            f"| {int(messages):,} | {py_time:.4f} | {go_time:.4f} | {winner} | {improvement_text} |"
+    write_output("")
+
+    # p99 por número de mensagens, com IC por bootstrap
+    msg_tail = results.rollup(["messages", "implementation"], ci=True)
+    msg_tail_py = msg_tail.xs("Python", level="implementation")
+    msg_tail_go = msg_tail.xs("Go", level="implementation").reindex(msg_tail_py.index)
+
+    write_output("### 🐢 p99 por Número de Mensagens (IC 95%)")
+    write_output("")
+    write_output("| Mensagens | Python p99 (s) | Go p99 (s) | Python p99.9 (s) | Go p99.9 (s) |")
+    write_output("|-----------|----------------|------------|------------------|--------------|")
+    write_output(
+        markdown_rows(
+            msg_tail_py.index.map("{:,}".format),
+            format_ci(msg_tail_py, "p99"),
+            format_ci(msg_tail_go, "p99"),
+            msg_tail_py["p99_9"].map("{:.4f}".format),
+            msg_tail_go["p99_9"].map("{:.4f}".format),
         )
+    )
 
     write_output("")
 
@@ -271,68 +416,99 @@ def analyze_performance():
     write_output("")
 
     # Performance vs número de clientes
-    client_scale = (
-        df_cleaned.groupby(["num_clients", "implementation"])["response_time"]
-        .mean()
-        .unstack()
-    )
+    client_scale = results.rollup(["clients", "implementation"])["mean"].unstack()
 
     write_output("### 👥 Escalabilidade por Número de Clientes")
     write_output("")
     write_output("| Clientes | Python (s) | Go (s) | Vencedor | Melhoria (%) |")
     write_output("|----------|------------|--------|----------|--------------|")
 
-    for clients in sorted(df_cleaned["num_clients"].unique()):
-        py_time = client_scale.loc[clients, "Python"]
-        go_time = client_scale.loc[clients, "Go"]
-
-        if py_time < go_time:
-            winner = "**Python**"
-            improvement = (go_time - py_time) / go_time * 100
-        elif go_time < py_time:
-            winner = "**Go**"
-            improvement = (py_time - go_time) / py_time * 100
-        else:
-            winner = "⚖️ Empate"
-            improvement = 0.0
-
-        write_output(
-            f"| {int(clients)} | {py_time:.4f} | {go_time:.4f} | {winner} | {improvement:.1f} |"
-        )
+    write_output(_scale_rows(client_scale))
 
     write_output("")
 
     # Performance vs número de servidores
-    server_scale = (
-        df_cleaned.groupby(["num_servers", "implementation"])["response_time"]
-        .mean()
-        .unstack()
-    )
+    server_scale = results.rollup(["servers", "implementation"])["mean"].unstack()
 
     write_output("### 🖥️ Escalabilidade por Número de Servidores")
     write_output("")
     write_output("| Servidores | Python (s) | Go (s) | Vencedor | Melhoria (%) |")
     write_output("|------------|------------|--------|----------|--------------|")
 
-    for servers in sorted(df_cleaned["num_servers"].unique()):
-        py_time = server_scale.loc[servers, "Python"]
-        go_time = server_scale.loc[servers, "Go"]
+    write_output(_scale_rows(server_scale))
 
-        if py_time < go_time:
-            winner = "**Python**"
-            improvement = (go_time - py_time) / go_time * 100
-        elif go_time < py_time:
-            winner = "**Go**"
-            improvement = (py_time - go_time) / py_time * 100
-        else:
-            winner = "⚖️ Empate"
-            improvement = 0.0
+    write_output("")
 
-        write_output(
-            f"| {int(servers)} | {py_time:.4f} | {go_time:.4f} | {winner} | {improvement:.1f} |"
-        )
+    # Ajustes de Amdahl e USL da vazão de pico em função das réplicas
+    fits = fit_scalability(scenarios)
+    max_servers = int(scenarios["servers"].max())
 
+    write_output("### 📐 Escalabilidade com Réplicas (USL e Amdahl)")
     write_output("")
+    write_output(
+        "Vazão de pico (mensagens/s, a maior entre as cargas de clientes) em função do número"
+    )
+    write_output(
+        "de servidores. σ = contenção, κ = coerência, N* = réplicas de pico previstas pela USL."
+    )
+    write_output("")
+    write_output(
+        f"| Implementação | Mensagens | λ (msg/s) | σ | κ | R² USL | σ Amdahl | R² Amdahl | Eficiência (N={max_servers}) | N* |"
+    )
+    write_output(
+        "|---------------|-----------|-----------|---|---|--------|----------|-----------|------------------|----|"
+    )
+    write_output(
+        markdown_rows(
+            "**" + fits["implementation"].astype(str) + "**",
+            fits["messages"].map("{:,}".format),
+            _format_fit(fits["lambda"], "{:,.0f}"),
+            _format_fit(fits["sigma"], "{:.3f}"),
+            _format_fit(fits["kappa"], "{:.4f}"),
+            _format_fit(fits["usl_r2"], "{:.2f}"),
+            _format_fit(fits["amdahl_sigma"], "{:.3f}"),
+            _format_fit(fits["amdahl_r2"], "{:.2f}"),
+            _format_fit(fits["efficiency"] * 100, "{:.1f}%"),
+            _format_fit(fits["peak_servers"], "{:.1f}"),
+        )
+    )
+    write_output("")
+
+    # Distribuição das sessões entre as réplicas de cada execução
+    if results.cleaned is not None:
+        balance = latency_correlation(imbalance_metrics(results.cleaned))
+        balance["implementation"] = balance["implementation"].astype(str)
+        balance = balance.sort_values(["implementation", "servers"], ascending=[False, True])
+
+        write_output("### ⚖️ Balanceamento de Carga entre Servidores")
+        write_output("")
+        write_output(
+            "Sessões por servidor em cada execução. max/média = 1 e Gini = 0 indicam carga"
+        )
+        write_output(
+            "perfeitamente distribuída; ρ é a correlação de Spearman entre max/média e a latência"
+        )
+        write_output("da execução relativa à média do seu cenário.")
+        write_output("")
+        write_output(
+            "| Implementação | Servidores | Execuções | max/média | Gini | CV | Servidores ociosos | ρ (latência) |"
+        )
+        write_output(
+            "|---------------|------------|-----------|-----------|------|----|--------------------|--------------|"
+        )
+        write_output(
+            markdown_rows(
+                "**" + balance["implementation"] + "**",
+                balance["servers"].astype(str),
+                balance["runs"].map("{:,}".format),
+                balance["max_mean"].map("{:.2f}".format),
+                balance["gini"].map("{:.3f}".format),
+                balance["cv"].map("{:.2f}".format),
+                balance["idle_servers"].map("{:.2f}".format),
+                _format_fit(balance["spearman"], "{:+.2f}"),
+            )
+        )
+        write_output("")
 
     # Conclusões
     write_output("## 5️⃣ Conclusões e Recomendações")
@@ -407,7 +583,7 @@ def analyze_performance():
     write_output("|---------|-----------|")
     write_output(f"| `{output_file}` | Este relatório completo em Markdown |")
     write_output(
-        "| `analysis_results_interactive/` | Gráficos 3D de tempo total por cenário |"
+        "| `analysis_results_interactive/` | Gráficos 3D de tempo total por cenário e ajustes USL/Amdahl |"
     )
     write_output("| `requests_python.csv` | Dados brutos Python |")
     write_output("| `requests_go.csv` | Dados brutos Go |")
@@ -436,6 +612,20 @@ def analyze_performance():
 
 
 if __name__ == "__main__":
-    report_file = analyze_performance()
+    parser = argparse.ArgumentParser(description="Relatório textual Python vs Go")
+    parser.add_argument("--python", default="requests_python.csv", help="CSV do servidor Python")
+    parser.add_argument("--go", default="requests_go.csv", help="CSV do servidor Go")
+    parser.add_argument(
+        "--output", default="performance_analysis_report.md", help="Arquivo do relatório"
+    )
+    parser.add_argument(
+        "--exclude-unsteady",
+        action="store_true",
+        help="Descarta as execuções que não atingiram regime estacionário",
+    )
+    args = parser.parse_args()
+    report_file = analyze_performance(
+        args.python, args.go, args.output, args.exclude_unsteady
+    )
     if report_file:
         print(f"\n🎉 Análise concluída! Relatório disponível em: {report_file}")
@@ -0,0 +1,34 @@
+# Critério de parada do número adaptativo de iterações (adaptive.should_stop)
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adaptive import relative_halfwidth, should_stop
+
+
+def test_stops_when_interval_is_narrow():
+    stop, width = should_stop([1.00, 1.01, 0.99], precision=0.05)
+    assert stop and width < 0.05
+
+
+def test_continues_when_interval_is_wide():
+    stop, width = should_stop([1.0, 2.0, 0.5], precision=0.05)
+    assert not stop and width > 0.05
+
+
+def test_respects_min_iterations():
+    stop, _ = should_stop([1.0, 1.0], min_iterations=3)
+    assert not stop
+
+
+def test_stops_at_max_iterations():
+    stop, _ = should_stop([1.0, 3.0, 0.2], max_iterations=3)
+    assert stop
+
+
+def test_single_iteration_has_no_interval():
+    assert relative_halfwidth([1.0]) == np.inf
+    assert not should_stop([1.0], min_iterations=1)[0]
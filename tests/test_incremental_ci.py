@@ -0,0 +1,59 @@
+# Atualização incremental (load_results com cache) vs. recálculo completo
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_data import load_results
+from bootstrap import CI_STATISTICS
+from results_csv import COLUMNS
+
+SCENARIOS = [(s, c, m) for s in (2, 4) for c in (5, 10) for m in (1, 10)]
+
+
+def _rows(rng, servers, clients, messages, start):
+    """Uma iteração de um cenário: uma linha por cliente, como o deploy.sh"""
+    send = start + np.sort(rng.uniform(0, 2, clients))
+    response = 0.002 * messages * rng.lognormal(0.0, 0.3, clients)
+    return pd.DataFrame(
+        {
+            "client_id": [f"client_1_{n}" for n in rng.integers(1000, 10000, clients)],
+            "message_id": messages,
+            "server_id": [f"server-{i % servers}" for i in range(clients)],
+            "client_send_time": send,
+            "server_processing_time": 0.001,
+            "client_receive_time": send + response,
+            "response_time": response,
+            "num_servers": servers,
+            "num_clients": clients,
+            "num_messages": messages,
+        }
+    )[COLUMNS]
+
+
+def _write(path, frames, header):
+    pd.concat(frames).to_csv(path, mode="w" if header else "a", header=header, index=False)
+
+
+def test_incremental_ci_matches_rebuild(tmp_path):
+    rng = np.random.default_rng(1)
+    paths = [tmp_path / "requests_python.csv", tmp_path / "requests_go.csv"]
+    for path in paths:
+        _write(path, [_rows(rng, *scenario, 1e9) for scenario in SCENARIOS], header=True)
+
+    cache_dir = tmp_path / "cache"
+    load_results(*paths, cache_dir=cache_dir)
+
+    # Segunda iteração de um único cenário: só ele é recalculado
+    _write(paths[0], [_rows(rng, *SCENARIOS[0], 2e9)], header=False)
+    incremental = load_results(*paths, cache_dir=cache_dir).stats
+    rebuilt = load_results(*paths, use_cache=False).stats
+
+    columns = [f"{name}_ci_{side}" for name in CI_STATISTICS for side in ("low", "high")]
+    pd.testing.assert_frame_equal(
+        incremental[columns].reset_index(drop=True),
+        rebuilt[columns].reset_index(drop=True),
+    )
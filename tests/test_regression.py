@@ -0,0 +1,35 @@
+# Correção de p-valores para comparações múltiplas (regression.adjust_pvalues)
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regression import CORRECTION_BH, CORRECTION_HOLM, adjust_pvalues
+
+# Família de 4 testes; NaN é um cenário sem teste e fica fora dela
+P_VALUES = [0.01, 0.04, np.nan, 0.03, 0.005]
+
+
+def test_holm():
+    # Ordenados: 0.005·4, 0.01·3, 0.03·2, 0.04·1 -> máximo acumulado
+    expected = [0.03, 0.06, np.nan, 0.06, 0.02]
+    np.testing.assert_allclose(adjust_pvalues(P_VALUES, CORRECTION_HOLM), expected)
+
+
+def test_benjamini_hochberg():
+    # p·m/posto: 0.02, 0.02, 0.04, 0.04 -> mínimo acumulado a partir do fim
+    expected = [0.02, 0.04, np.nan, 0.04, 0.02]
+    np.testing.assert_allclose(adjust_pvalues(P_VALUES, CORRECTION_BH), expected)
+
+
+def test_adjusted_values_are_capped_at_one():
+    adjusted = adjust_pvalues([0.5, 0.6, 0.7], CORRECTION_HOLM)
+    assert np.all(adjusted <= 1.0)
+
+
+def test_unknown_correction():
+    with pytest.raises(ValueError):
+        adjust_pvalues([0.01], "bonferroni")
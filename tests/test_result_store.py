@@ -0,0 +1,81 @@
+# Armazenamento binário dos resultados (result_store.ResultStore)
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_store import INDEX_KEYS, ResultStore
+
+
+def _frame(servers, implementation, iteration, rows):
+    return pd.DataFrame(
+        {
+            "client_id": [f"client_{i}" for i in range(rows)],
+            "message_id": 10,
+            "server_id": "server-0",
+            "client_send_time": 1.0,
+            "server_processing_time": 0.001,
+            "client_receive_time": 1.5,
+            "response_time": [0.1 * (i + 1) for i in range(rows)],
+            "servers": servers,
+            "clients": rows,
+            "messages": 10,
+            "implementation": implementation,
+            "iteration": iteration,
+        }
+    )
+
+
+def test_append_select_and_reopen(tmp_path):
+    store = ResultStore(str(tmp_path))
+    frames = [_frame(2, "Go", 1, 3), _frame(4, "Python", 1, 2), _frame(2, "Go", 2, 4)]
+    store.append(pd.concat(frames))
+    assert store.rows == 9
+    assert len(store.segments) == 3
+
+    # Reaberto do disco: mesmo índice e mesmas linhas
+    store = ResultStore(str(tmp_path))
+    go = store.load(servers=2, implementation="Go")
+    assert len(go) == 7
+    assert set(go["iteration"]) == {1, 2}
+    assert list(go.loc[go["iteration"] == 1, "client_id"]) == [
+        "client_0",
+        "client_1",
+        "client_2",
+    ]
+    assert len(store.select(iteration=[1, 2], implementation="Python")) == 2
+    assert len(store.select(servers=8)) == 0
+    assert list(store.scenarios().columns[: len(INDEX_KEYS)]) == INDEX_KEYS
+
+
+def test_truncate_drops_unconfirmed_appends(tmp_path):
+    store = ResultStore(str(tmp_path))
+    store.append(_frame(2, "Go", 1, 3))
+    committed = store.rows
+    store.append(_frame(2, "Go", 2, 4))
+
+    assert store.truncate(committed) == 4
+    store = ResultStore(str(tmp_path))
+    assert store.rows == committed
+    assert set(store.load()["iteration"]) == {1}
+    assert os.path.getsize(store.data_path) == committed * store.select().itemsize
+
+    # Um append depois do truncate continua do ponto certo
+    store.append(_frame(2, "Go", 2, 2))
+    assert len(store.load(iteration=2)) == 2
+
+
+def test_truncate_inside_a_segment(tmp_path):
+    store = ResultStore(str(tmp_path))
+    store.append(_frame(2, "Go", 1, 3))
+    with pytest.raises(ValueError):
+        store.truncate(1)
+
+
+def test_rejects_unknown_filters(tmp_path):
+    store = ResultStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.select(region="eu")
@@ -0,0 +1,40 @@
+# Ajuste de Amdahl e USL (scalability.fit_curve) em dados sintéticos
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scalability import fit_curve, usl
+
+SERVERS = np.array([1, 2, 4, 6, 8, 10, 16, 24, 32])
+
+
+def test_recovers_usl_parameters():
+    lam, sigma, kappa = 1000.0, 0.05, 0.002
+    result = fit_curve(SERVERS, usl(SERVERS, lam, sigma, kappa))
+
+    np.testing.assert_allclose(
+        [result["lambda"], result["sigma"], result["kappa"]],
+        [lam, sigma, kappa],
+        rtol=1e-3,
+    )
+    assert result["usl_r2"] > 0.9999
+    # N* = √((1-σ)/κ)
+    np.testing.assert_allclose(
+        result["peak_servers"], np.sqrt((1 - sigma) / kappa), rtol=1e-3
+    )
+    # Amdahl não tem o termo de coerência: ajusta pior a curva com pico
+    assert result["amdahl_r2"] < result["usl_r2"]
+
+
+def test_amdahl_curve_has_no_peak():
+    result = fit_curve(SERVERS, usl(SERVERS, 500.0, 0.1, 0.0))
+    assert result["peak_servers"] == np.inf
+    np.testing.assert_allclose(result["peak_throughput"], 500.0 / 0.1, rtol=1e-2)
+
+
+def test_too_few_points():
+    result = fit_curve([2, 4], [100.0, 180.0])
+    assert all(np.isnan(value) for value in result.values())
@@ -0,0 +1,33 @@
+# Quantis do sketch (modo streaming) vs. quantile do pandas (modo em memória)
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bootstrap import PERCENTILES
+from streaming_stats import SKETCH_GROWTH, RunningStats
+
+
+def test_sketch_quantiles_match_in_memory_definition():
+    rng = np.random.default_rng(0)
+    # Grupos pequenos, onde postos mais próximos e interpolação mais divergem
+    sizes = [1, 2, 5, 10, 37, 100, 1000]
+    frame = pd.DataFrame(
+        {
+            "group": np.repeat(np.arange(len(sizes)), sizes),
+            "value": rng.lognormal(-4.0, 1.0, sum(sizes)),
+        }
+    )
+    stats = RunningStats(["group"])
+    stats.update(frame[["group"]], frame["value"].to_numpy())
+
+    grouped = frame.groupby("group")["value"]
+    for q in [0.5, *PERCENTILES.values()]:
+        np.testing.assert_allclose(
+            stats.quantile(q).sort_index().to_numpy(),
+            grouped.quantile(q).to_numpy(),
+            rtol=SKETCH_GROWTH - 1,
+        )
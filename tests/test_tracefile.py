@@ -0,0 +1,55 @@
+# Gravação e leitura de traces do cliente (client/tracefile.py)
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "client"))
+
+from tracefile import CLIENT_FORMAT, SEND_FORMAT, TraceRecorder, read_trace
+
+
+def _record(path):
+    recorder = TraceRecorder(str(path))
+    first = recorder.new_connection()
+    second = recorder.new_connection()
+    recorder.record("client_a", 16, first)
+    recorder.record("client_b", 0, second)
+    recorder.record("client_a", 1024, first)
+    recorder.close()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "trace.bin"
+    _record(path)
+    events = read_trace(str(path))
+
+    assert [event.client_id for event in events] == ["client_a", "client_b", "client_a"]
+    assert [event.payload_size for event in events] == [16, 0, 1024]
+    assert [event.connection for event in events] == [0, 1, 0]
+    times = [event.send_time for event in events]
+    assert times == sorted(times) and times[0] >= 0
+
+
+@pytest.mark.parametrize(
+    "tail",
+    [
+        SEND_FORMAT.pack(1, 1.0, 0, 8, 0)[:-3],  # envio pela metade
+        CLIENT_FORMAT.pack(0, 9, 20)[:-1],  # cabeçalho de cliente pela metade
+        CLIENT_FORMAT.pack(0, 9, 20) + b"client",  # nome pela metade
+    ],
+)
+def test_truncated_record_is_dropped(tmp_path, tail):
+    path = tmp_path / "trace.bin"
+    _record(path)
+    with open(path, "ab") as f:
+        f.write(tail)
+    assert len(read_trace(str(path))) == 3
+
+
+def test_invalid_header(tmp_path):
+    path = tmp_path / "trace.bin"
+    path.write_bytes(b"XXXX" + bytes(10))
+    with pytest.raises(ValueError):
+        read_trace(str(path))
@@ -0,0 +1,87 @@
+# Especificações de carga do cliente (client/workload.py)
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "client"))
+
+from workload import WorkloadError, WorkloadSpec, load_workload_spec
+
+SPEC = {
+    "seed": 7,
+    "warmup": {"messages": 2},
+    "phases": [
+        {"name": "ramp", "messages": 4, "pipelined_fraction": 0.5},
+        {
+            "messages": 3,
+            "payload_size": {"distribution": "uniform", "min": 8, "max": 16},
+            "think_time_ms": 5,
+            "max_workers": 2,
+        },
+    ],
+}
+
+
+def test_from_dict():
+    spec = WorkloadSpec.from_dict(SPEC).prepare()
+
+    assert spec.total_messages == 7
+    assert [phase.name for phase in spec.phases] == ["ramp", "phase_2"]
+    assert spec.window.warmup_messages == 2
+
+    ramp, second = spec.phases
+    assert ramp.message_ids == [1, 2, 3, 4]
+    assert second.message_ids == [5, 6, 7]
+    pipelined, request_response = ramp.split()
+    assert len(pipelined) == 2 and len(request_response) == 2
+    assert all(8 <= len(payload) <= 16 for payload in second.payloads)
+    assert second.think_times == [0.005] * 3
+    assert second.max_workers == 2
+
+
+def test_same_seed_same_payloads():
+    first = WorkloadSpec.from_dict(SPEC).prepare()
+    second = WorkloadSpec.from_dict(SPEC).prepare()
+    assert first.phases[1].payloads == second.phases[1].payloads
+    assert first.phases[0].pipelined == second.phases[0].pipelined
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"phases": [{"name": "sem mensagens"}]},
+        {"phases": [{"messages": 1, "pipelined_fraction": 2}]},
+        {"phases": [{"messages": -1}]},
+        {"phases": 3},
+        {"phases": [3]},
+    ],
+)
+def test_invalid_specs(data):
+    with pytest.raises(WorkloadError):
+        WorkloadSpec.from_dict(data)
+
+
+@pytest.mark.parametrize("content", ["[1, 2]", "5", '"phases"'])
+def test_load_rejects_non_object(tmp_path, content):
+    path = tmp_path / "spec.json"
+    path.write_text(content)
+    with pytest.raises(WorkloadError):
+        load_workload_spec(str(path))
+
+
+def test_load_yaml_syntax_error(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "spec.yaml"
+    path.write_text("phases: [\n")
+    with pytest.raises(WorkloadError):
+        load_workload_spec(str(path))
+
+
+def test_load_json(tmp_path):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(SPEC))
+    assert load_workload_spec(str(path)).total_messages == 7
@@ -0,0 +1,182 @@
+# Linha do tempo de cada execução: sessões simultâneas, vazão e fases
+import numpy as np
+import pandas as pd
+
+from result_store import INDEX_KEYS, derive_iterations
+
+# Uma execução = um cenário numa iteração do deploy.sh
+RUN_KEYS = INDEX_KEYS
+
+# Largura dos bins; as séries são sempre expressas por segundo. As execuções
+# duram de décimos de segundo a poucos segundos, então bins de 1s não têm
+# resolução para separar as fases.
+DEFAULT_BIN_SECONDS = 0.1
+# Nível de platô: quantil das sessões simultâneas entre os bins da execução
+PLATEAU_QUANTILE = 0.9
+# Regime estacionário: bins com pelo menos esta fração do platô
+STEADY_FRACTION = 0.8
+# Abaixo disto (em bins ou em fração da duração) a execução não estabilizou
+MIN_STEADY_BINS = 3
+MIN_STEADY_SHARE = 0.25
+
+PHASE_WARMUP = "aquecimento"
+PHASE_STEADY = "estacionario"
+PHASE_DRAIN = "drenagem"
+
+
+def _cumulative(starts, ends, rates, edges):
+    """
+    ∫ Σ rate_i · [start_i ≤ t < end_i] dt de 0 até cada borda, vetorizado:
+    Σ_{s_i ≤ t} rate_i (t - s_i) - Σ_{e_i ≤ t} rate_i (t - e_i), com somas
+    prefixadas sobre inícios e fins ordenados.
+    """
+    result = np.zeros(len(edges))
+    for times, sign in ((starts, 1.0), (ends, -1.0)):
+        order = np.argsort(times)
+        times = times[order]
+        weights = rates[order]
+        weight_sum = np.concatenate([[0.0], np.cumsum(weights)])
+        weighted_times = np.concatenate([[0.0], np.cumsum(weights * times)])
+        index = np.searchsorted(times, edges, side="right")
+        result += sign * (edges * weight_sum[index] - weighted_times[index])
+    return result
+
+
+def detect_phases(sessions):
+    """
+    (fim do aquecimento, início da drenagem, platô) de uma série de sessões
+    simultâneas por bin: o regime estacionário vai do primeiro ao último bin
+    com pelo menos STEADY_FRACTION do platô.
+    """
+    level = np.quantile(sessions, PLATEAU_QUANTILE)
+    steady = np.flatnonzero(sessions >= STEADY_FRACTION * level)
+    if level <= 0 or len(steady) == 0:
+        return 0, 0, level
+    return int(steady[0]), int(steady[-1]) + 1, level
+
+
+def _run_series(send, receive, messages, bin_seconds):
+    """Bordas dos bins, sessões simultâneas médias e mensagens/s de uma execução"""
+    start = send.min()
+    send = send - start
+    receive = np.maximum(receive - start, send)
+    bins = max(int(np.ceil(receive.max() / bin_seconds)), 1)
+    edges = np.arange(bins + 1) * bin_seconds
+    # Cada sessão conclui suas mensagens a uma taxa constante ao longo da duração
+    duration = receive - send
+    rate = np.divide(messages, duration, out=np.zeros(len(duration)), where=duration > 0)
+    concurrency = _cumulative(send, receive, np.ones(len(send)), edges)
+    sessions = np.diff(concurrency) / bin_seconds
+    throughput = np.diff(_cumulative(send, receive, rate, edges)) / bin_seconds
+    return edges, sessions, throughput
+
+
+def with_iterations(df):
+    """df com a coluna iteration (deduzida da ordem das linhas se não existir)"""
+    if "iteration" in df:
+        return df
+    return df.assign(iteration=derive_iterations(df))
+
+
+def _runs(df):
+    """(chaves, índices das linhas) de cada execução"""
+    df = with_iterations(df)
+    return df, df.groupby(RUN_KEYS, sort=True, observed=True).indices
+
+
+def run_timeline(df, bin_seconds=DEFAULT_BIN_SECONDS):
+    """
+    Série temporal de cada execução: RUN_KEYS, time (início do bin, em s
+    desde o início da execução), sessions (sessões simultâneas médias no
+    bin), messages_per_second e phase (aquecimento, estacionario ou
+    drenagem).
+    Usa client_send_time/client_receive_time de cada sessão.
+    """
+    df, runs = _runs(df)
+    send = df["client_send_time"].to_numpy(dtype="float64")
+    receive = df["client_receive_time"].to_numpy(dtype="float64")
+    messages = df["messages"].to_numpy(dtype="float64")
+
+    frames = []
+    for keys, rows in runs.items():
+        edges, sessions, throughput = _run_series(
+            send[rows], receive[rows], messages[rows], bin_seconds
+        )
+        warmup_end, drain_start, _ = detect_phases(sessions)
+        phase = np.full(len(sessions), PHASE_STEADY, dtype=object)
+        phase[:warmup_end] = PHASE_WARMUP
+        phase[drain_start:] = PHASE_DRAIN
+        frames.append(
+            pd.DataFrame(
+                {
+                    **dict(zip(RUN_KEYS, keys)),
+                    "time": edges[:-1],
+                    "sessions": sessions,
+                    "messages_per_second": throughput,
+                    "phase": phase,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def run_phases(df, bin_seconds=DEFAULT_BIN_SECONDS):
+    """
+    Uma linha por execução: RUN_KEYS, sessions (linhas), duration,
+    plateau_sessions, warmup_seconds, steady_seconds, drain_seconds,
+    steady_share (fração da duração em regime), steady_throughput
+    (mensagens/s médias no regime) e reached_steady (False quando o regime
+    estacionário dura menos de MIN_STEADY_BINS bins ou MIN_STEADY_SHARE).
+    """
+    df, runs = _runs(df)
+    send = df["client_send_time"].to_numpy(dtype="float64")
+    receive = df["client_receive_time"].to_numpy(dtype="float64")
+    messages = df["messages"].to_numpy(dtype="float64")
+
+    rows = []
+    for keys, index in runs.items():
+        edges, sessions, throughput = _run_series(
+            send[index], receive[index], messages[index], bin_seconds
+        )
+        warmup_end, drain_start, level = detect_phases(sessions)
+        steady_bins = drain_start - warmup_end
+        rows.append(
+            (
+                *keys,
+                len(index),
+                receive[index].max() - send[index].min(),
+                level,
+                warmup_end * bin_seconds,
+                steady_bins * bin_seconds,
+                (len(sessions) - drain_start) * bin_seconds,
+                steady_bins / len(sessions),
+                throughput[warmup_end:drain_start].mean() if steady_bins else np.nan,
+                steady_bins >= MIN_STEADY_BINS
+                and steady_bins / len(sessions) >= MIN_STEADY_SHARE,
+            )
+        )
+    return pd.DataFrame(
+        rows,
+        columns=[
+            *RUN_KEYS,
+            "sessions",
+            "duration",
+            "plateau_sessions",
+            "warmup_seconds",
+            "steady_seconds",
+            "drain_seconds",
+            "steady_share",
+            "steady_throughput",
+            "reached_steady",
+        ],
+    )
+
+
+def drop_unsteady_runs(df, phases):
+    """Remove de df as linhas das execuções que não atingiram regime estacionário"""
+    unsteady = phases.loc[~phases["reached_steady"], RUN_KEYS]
+    if unsteady.empty:
+        return df
+    df = with_iterations(df)
+    runs = pd.MultiIndex.from_frame(df[RUN_KEYS])
+    return df[~runs.isin(pd.MultiIndex.from_frame(unsteady))]